@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+bench_emoji.py - Compare the compiled emoji scanner to the per-character scan.
+
+"Facts are stubborn things, but statistics are pliable." — Mark Twain
+
+Runs both scanners over every markdown file in the repository root,
+checks that they produce identical EmojiInfo output, and reports timings.
+
+    uv run python benchmarks/bench_emoji.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PACKAGE_ROOT / "src"))
+
+from samuel_clemens.processing.emoji import (  # noqa: E402
+    EMOJI_CATEGORIES,
+    EmojiInfo,
+    _is_emoji,
+    extract_emojis,
+)
+
+
+def reference_extract_emojis(text: str) -> list[EmojiInfo]:
+    """The original per-character scanner, kept as the parity baseline."""
+    emoji_dict: dict[str, EmojiInfo] = {}
+    i = 0
+    while i < len(text):
+        emoji_found = None
+        for length in range(4, 0, -1):
+            if i + length <= len(text):
+                candidate = text[i:i+length]
+                if candidate in EMOJI_CATEGORIES or (length == 1 and _is_emoji(candidate)):
+                    emoji_found = candidate
+                    break
+        if emoji_found:
+            if emoji_found in emoji_dict:
+                emoji_dict[emoji_found].count += 1
+                emoji_dict[emoji_found].positions.append(i)
+            else:
+                name_parts = EMOJI_CATEGORIES.get(emoji_found, (None, None))
+                if name_parts[0]:
+                    name, category = name_parts
+                else:
+                    try:
+                        name = unicodedata.name(emoji_found[0], "unknown").lower()
+                    except ValueError:
+                        name = "unknown"
+                    category = "other"
+                emoji_dict[emoji_found] = EmojiInfo(
+                    char=emoji_found, name=name, category=category, count=1, positions=[i],
+                )
+            i += len(emoji_found)
+        else:
+            i += 1
+    return list(emoji_dict.values())
+
+
+def _time(func, texts: list[str], repeat: int) -> float:
+    """Best-of-N wall time for scanning every text once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    files = sorted(PACKAGE_ROOT.parent.glob("*.md"))
+    texts = [f.read_text(encoding="utf-8") for f in files]
+    chars = sum(len(t) for t in texts)
+
+    for path, text in zip(files, texts):
+        if extract_emojis(text) != reference_extract_emojis(text):
+            raise SystemExit(f"Mismatch in {path.name}")
+
+    reference = _time(reference_extract_emojis, texts, repeat=3)
+    compiled = _time(extract_emojis, texts, repeat=3)
+
+    print(f"Files: {len(files)}  Characters: {chars:,}  (outputs identical)")
+    print(f"Per-character scan: {reference * 1000:8.1f} ms")
+    print(f"Compiled scanner:   {compiled * 1000:8.1f} ms")
+    print(f"Speedup:            {reference / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
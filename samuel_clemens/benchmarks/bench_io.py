@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+bench_io.py - Write many small files serially and with the BulkWriter.
+
+"Action speaks louder than words but not nearly as often." — Mark Twain
+
+Writes FILES small files (about 1 KB, spread over 20 folders) the way
+the exporters used to, mkdir + write_text one file at a time, then with
+one BulkWriter batch, and prints the slowest single writes.
+
+    uv run python benchmarks/bench_io.py [FILES]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic  # noqa: E402,F401  (puts src/ on the path)
+from samuel_clemens.utils.io import DEFAULT_WORKERS, BulkWriter  # noqa: E402
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    files = [(f"part_{i % 20}/file_{i:06d}.md", f"# File {i}\n\n" + "frontier " * 120) for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "serial"
+        start = time.perf_counter()
+        for name, text in files:
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        serial = time.perf_counter() - start
+
+        root = Path(tmpdir) / "bulk"
+        writer = BulkWriter()
+        for name, text in files:
+            writer.add(root / name, text)
+        report = writer.write()
+
+    print(f"Files: {count:,}  Workers: {DEFAULT_WORKERS}  ({report.total_bytes / 1e6:.1f} MB)")
+    print(f"Serial mkdir + write_text: {serial * 1000:8.1f} ms")
+    print(f"BulkWriter (atomic):       {report.seconds * 1000:8.1f} ms")
+    print(f"Speedup:                   {serial / report.seconds:8.1f}x")
+    for result in report.slowest(3):
+        print(f"  slowest: {result.path.name}  {result.seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+bench_ndjson.py - Corpus JSON export: reflective walk vs compiled encoders.
+
+"Write without pay until somebody offers pay." — Mark Twain
+
+Parses a 10k-document synthetic corpus, then times:
+
+- per-document export_to_json files (the previous corpus export path)
+- the previous reflective ``__dict__`` walk, dumped one record per line
+- export_corpus_ndjson (compiled encoders), plain and gzip
+- iter_corpus_ndjson, decoding the export back into documents
+
+    uv run python benchmarks/bench_ndjson.py [DOCUMENTS]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import parsed_synthetic_documents  # noqa: E402
+from samuel_clemens.processing.codec import iter_corpus_ndjson  # noqa: E402
+from samuel_clemens.processing.export import export_corpus_ndjson, export_to_json  # noqa: E402
+
+
+def reflective(obj: Any) -> Any:
+    """The previous _serialize_for_json: isinstance checks on every value."""
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return {k: reflective(v) for k, v in obj.__dict__.items()}
+    if isinstance(obj, list):
+        return [reflective(i) for i in obj]
+    if isinstance(obj, dict):
+        return {k: reflective(v) for k, v in obj.items()}
+    return obj
+
+
+def timed(label: str, func, output: Path) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    size = sum(f.stat().st_size for f in output.rglob("*")) if output.is_dir() else output.stat().st_size
+    print(f"{label:34} {elapsed * 1000:9.1f} ms  {size / 1e6:8.1f} MB")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+
+        start = time.perf_counter()
+        documents = parsed_synthetic_documents(tmp / "corpus", count)
+        print(f"Parsed {len(documents):,} documents in {time.perf_counter() - start:.1f} s\n")
+
+        per_file = tmp / "json"
+        timed(
+            "export_to_json (one file each)",
+            lambda: [export_to_json(doc, per_file / f"{doc.filepath.stem}.json") for doc in documents],
+            per_file,
+        )
+
+        def reflective_ndjson() -> None:
+            with open(tmp / "reflective.ndjson", "w", encoding="utf-8") as handle:
+                for doc in documents:
+                    handle.write(json.dumps(reflective(doc), ensure_ascii=False, default=str))
+                    handle.write("\n")
+
+        timed("reflective __dict__ walk (NDJSON)", reflective_ndjson, tmp / "reflective.ndjson")
+        timed(
+            "export_corpus_ndjson",
+            lambda: export_corpus_ndjson(documents, tmp / "corpus.ndjson"),
+            tmp / "corpus.ndjson",
+        )
+        timed(
+            "export_corpus_ndjson (gzip)",
+            lambda: export_corpus_ndjson(documents, tmp / "corpus.ndjson.gz"),
+            tmp / "corpus.ndjson.gz",
+        )
+
+        start = time.perf_counter()
+        loaded = sum(1 for _ in iter_corpus_ndjson(tmp / "corpus.ndjson.gz"))
+        elapsed = time.perf_counter() - start
+        print(f"{'iter_corpus_ndjson (gzip)':34} {elapsed * 1000:9.1f} ms  {loaded:,} documents")
+
+
+if __name__ == "__main__":
+    main()
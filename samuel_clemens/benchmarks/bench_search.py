@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+bench_search.py - Build and query the search index on a synthetic corpus.
+
+"The secret of getting ahead is getting started." — Mark Twain
+
+Indexes a 10k-document synthetic corpus, reports build time and query
+latency for term, multi-term and phrase queries, then times an
+incremental single-document update and a save/load round trip.
+
+    uv run python benchmarks/bench_search.py [DOCUMENTS]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_documents  # noqa: E402
+from samuel_clemens.processing.search import SearchIndex  # noqa: E402
+
+QUERIES = [
+    "protocol",
+    "hero host",
+    "frontier syntheverse expedition",
+    '"black hole"',
+    '"hero host" goldilocks',
+    "nonexistentterm",
+]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    documents = synthetic_documents(count)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = SearchIndex(Path(tmpdir) / "search_index.bin")
+
+        start = time.perf_counter()
+        index.update(documents)
+        build = time.perf_counter() - start
+        print(f"Documents: {len(index):,}  Terms: {len(index.postings):,}")
+        print(f"Build:            {build * 1000:8.1f} ms")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                hits = index.search(query)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"Query {query!r:34} {statistics.median(timings) * 1000:7.2f} ms "
+                f"(max {max(timings) * 1000:.2f}, {len(hits)} hits)"
+            )
+
+        changed = replace(documents[count // 2], content=documents[count // 2].content + "\nfresh words")
+        start = time.perf_counter()
+        index.add(changed)
+        print(f"Update one doc:   {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        start = time.perf_counter()
+        index.save()
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        SearchIndex(index.path)
+        loaded = time.perf_counter() - start
+        size = index.path.stat().st_size
+        print(f"Save: {saved * 1000:.1f} ms  Load: {loaded * 1000:.1f} ms  Size: {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+bench_snapshot.py - Open a 50k-document corpus from a columnar snapshot.
+
+"Do the thing you fear most and the death of fear is certain." — Mark Twain
+
+Writes a snapshot of an in-memory synthetic corpus, then times opening
+it, a column aggregate, a protocol lookup and one row, next to
+unpickling the same documents (the parse cache's storage format).
+
+    uv run python benchmarks/bench_snapshot.py [DOCUMENTS]
+"""
+
+from __future__ import annotations
+
+import pickle
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_documents  # noqa: E402
+from samuel_clemens.processing.snapshot import CorpusSnapshot, write_corpus_snapshot  # noqa: E402
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    documents = synthetic_documents(count, words=200)
+    for doc in documents:
+        doc.word_count = len(doc.content.split())
+        doc.line_count = doc.content.count("\n") + 1
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+
+        start = time.perf_counter()
+        path = write_corpus_snapshot(documents, tmp)
+        print(f"Documents: {count:,}")
+        print(f"Write snapshot:   {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"({path.stat().st_size / 1e6:.1f} MB)")
+
+        start = time.perf_counter()
+        snapshot = CorpusSnapshot(path)
+        print(f"Open snapshot:    {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        start = time.perf_counter()
+        words = sum(snapshot.word_count)
+        print(f"Sum word_count:   {(time.perf_counter() - start) * 1000:8.2f} ms  ({words:,} words)")
+
+        start = time.perf_counter()
+        row = snapshot.record(snapshot.find(count // 2))
+        print(f"Find + one row:   {(time.perf_counter() - start) * 1000:8.2f} ms  ({row.protocol_id})")
+        snapshot.close()
+
+        pickled = tmp / "documents.bin"
+        pickled.write_bytes(zlib.compress(pickle.dumps(documents, protocol=pickle.HIGHEST_PROTOCOL), 1))
+        start = time.perf_counter()
+        pickle.loads(zlib.decompress(pickled.read_bytes()))
+        print(f"Unpickle docs:    {(time.perf_counter() - start) * 1000:8.1f} ms  (for comparison)")
+
+
+if __name__ == "__main__":
+    main()
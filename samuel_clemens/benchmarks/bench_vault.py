@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+bench_vault.py - Re-export an unchanged Obsidian vault.
+
+"Never put off till tomorrow what may be done day after tomorrow just as
+well." — Mark Twain
+
+Exports a synthetic corpus as a vault, then times exporting the same
+pages again (nothing should be written) and after changing one page,
+next to rewriting every page as the export did before its manifest.
+
+    uv run python benchmarks/bench_vault.py [DOCUMENTS]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_documents  # noqa: E402
+from samuel_clemens.processing.obsidian import export_obsidian_vault  # noqa: E402
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    documents = synthetic_documents(count, words=200)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "vault"
+
+        start = time.perf_counter()
+        vault = export_obsidian_vault(documents, root, entity_pages=True)
+        print(f"Documents: {count:,}  Pages: {len(vault.pages):,}")
+        print(f"Build + first export: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        start = time.perf_counter()
+        written = vault.export()
+        print(f"Unchanged re-export:  {(time.perf_counter() - start) * 1000:8.1f} ms  ({written} written)")
+
+        page = next(iter(vault.pages.values()))
+        page.content += "\nEdited."
+        start = time.perf_counter()
+        written = vault.export()
+        print(f"One page changed:     {(time.perf_counter() - start) * 1000:8.1f} ms  ({written} written)")
+
+        start = time.perf_counter()
+        for page_path, page in vault.pages.items():
+            (root / page_path).write_text(page.render(), encoding="utf-8")
+        print(f"Rewrite every page:   {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+bench_wikilinks.py - Compare the compiled entity linker to per-entity regexes.
+
+"It's no wonder that truth is stranger than fiction. Fiction has to make
+sense." — Mark Twain
+
+Checks that the linker finds and links the same entities as the original
+per-entity implementation for KNOWN_ENTITIES, then times both over every
+markdown file in the repository root with the known entities plus
+ENTITIES two-word names drawn from the corpus vocabulary.
+
+    uv run python benchmarks/bench_wikilinks.py [ENTITIES]
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import PACKAGE_ROOT, corpus_vocabulary  # noqa: E402
+from samuel_clemens.processing.obsidian import (  # noqa: E402
+    KNOWN_ENTITIES,
+    EntityLinker,
+    WikiLink,
+)
+
+
+def reference_extract_entities(text: str, known_entities) -> list[str]:
+    """The original scan: one lowercase copy and substring test per entity."""
+    entities = [f"Protocol_{int(m.group(1))}" for m in re.finditer(r"\bProtocol\s+(\d+)\b", text, re.I)]
+    for entity in known_entities:
+        if entity.lower() in text.lower():
+            entities.append(entity.replace(" ", "_"))
+    return list(set(entities))
+
+
+def reference_add_wikilinks(text: str, entities: list[str]) -> tuple[str, list[WikiLink]]:
+    """The original linker: two searches and a string rebuild per entity."""
+    result = text
+    links = []
+    for entity in entities:
+        readable = entity.replace("_", " ")
+        pattern = rf"(?<!\[\[)\b{re.escape(readable)}\b(?!\]\])"
+        if re.search(pattern, result, re.IGNORECASE):
+            match = re.search(pattern, result, re.IGNORECASE)
+            if match:
+                original = match.group(0)
+                result = result[:match.start()] + f"[[{entity}|{original}]]" + result[match.end():]
+                links.append(WikiLink(target=entity, display=original))
+    return result, links
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    texts = [p.read_text(encoding="utf-8") for p in sorted(PACKAGE_ROOT.parent.glob("*.md"))]
+
+    linker = EntityLinker()
+    for text in texts:
+        entities = sorted(linker.find(text))
+        if entities != sorted(reference_extract_entities(text, KNOWN_ENTITIES)):
+            raise SystemExit("Entity mismatch")
+        linked, links = linker.link(text, entities)
+        expected, expected_links = reference_add_wikilinks(text, entities)
+        if linked != expected or sorted(map(str, links)) != sorted(map(str, expected_links)):
+            raise SystemExit("Link mismatch")
+
+    rng = random.Random(0)
+    vocabulary = corpus_vocabulary()
+    names = list(KNOWN_ENTITIES)
+    while len(names) < len(KNOWN_ENTITIES) + count:
+        name = f"{rng.choice(vocabulary).title()} {rng.choice(vocabulary).title()}"
+        if name not in names:
+            names.append(name)
+
+    start = time.perf_counter()
+    linker = EntityLinker(names)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = 0
+    for text in texts:
+        entities = linker.find(text)
+        linker.link(text, entities)
+        found += len(entities)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        reference_add_wikilinks(text, reference_extract_entities(text, names))
+    reference = time.perf_counter() - start
+
+    print(f"Files: {len(texts)}  Entities: {len(names):,}  Found: {found:,}  (known entities identical)")
+    print(f"Compile linker:     {compile_time * 1000:8.1f} ms")
+    print(f"Per-entity regexes: {reference * 1000:8.1f} ms")
+    print(f"Compiled linker:    {compiled * 1000:8.1f} ms")
+    print(f"Speedup:            {reference / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
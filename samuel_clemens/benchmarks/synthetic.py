@@ -0,0 +1,94 @@
+"""
+synthetic.py - Deterministic synthetic protocol corpus for benchmarks.
+
+"There are three kinds of lies: lies, damned lies, and statistics."
+— Mark Twain (attributed)
+
+Documents are assembled from the vocabulary of the real protocol files,
+so term frequencies look like the corpus the package actually processes.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PACKAGE_ROOT / "src"))
+
+from samuel_clemens.processing.parser import (  # noqa: E402
+    ProtocolDocument,
+    parse_protocols_by_prefix,
+)
+
+_SECTION_TITLES = [
+    "🎯 EMERGENT OBSERVATION", "📋 CORE PRINCIPLES", "🔗 INTEGRATION",
+    "📊 METRICS", "🌟 CONCLUSION", "⚙️ IMPLEMENTATION",
+]
+
+
+def corpus_vocabulary() -> list[str]:
+    """Words of the repository's markdown files (with repetition)."""
+    words: list[str] = []
+    for path in sorted(PACKAGE_ROOT.parent.glob("*.md")):
+        words.extend(re.findall(r"[A-Za-z][A-Za-z'-]+", path.read_text(encoding="utf-8")))
+    return words or ["frontier", "river", "protocol", "twain"]
+
+
+def synthetic_text(number: int, rng: random.Random, vocabulary: list[str], words: int = 400) -> str:
+    """Build one protocol-shaped markdown document."""
+    lines = [
+        f"# PROTOCOL {number}: {' '.join(rng.choices(vocabulary, k=4)).upper()}",
+        "",
+        f"**Protocol Number:** P{number}  ",
+        f"**Category:** {rng.choice(['Core', 'Expedition', 'Media', 'Network'])}  ",
+        f"**Status:** {rng.choice(['✅ OPERATIONAL', '🌟 EMERGENT'])}",
+        "",
+    ]
+    per_section = words // len(_SECTION_TITLES)
+    for title in _SECTION_TITLES:
+        lines.append(f"## {title}")
+        lines.append("")
+        body = rng.choices(vocabulary, k=per_section)
+        lines.append(" ".join(body))
+        lines.append(f"- ✅ See Protocol {rng.randrange(1, number + 2)} and P{rng.randrange(1, 200)}")
+        lines.append("")
+    lines.append("💎✨")
+    return "\n".join(lines)
+
+
+def synthetic_documents(count: int, seed: int = 0, words: int = 400) -> list[ProtocolDocument]:
+    """Build in-memory ProtocolDocuments without touching the filesystem."""
+    rng = random.Random(seed)
+    vocabulary = corpus_vocabulary()
+    documents = []
+    for number in range(1, count + 1):
+        content = synthetic_text(number, rng, vocabulary, words)
+        documents.append(ProtocolDocument(
+            filepath=Path(f"/synthetic/PROTOCOL_{number}.md"),
+            filename=f"PROTOCOL_{number}.md",
+            content=content,
+            title=content.split("\n", 1)[0][2:],
+            protocol_number=number,
+            protocol_id=f"P{number}",
+        ))
+    return documents
+
+
+def write_synthetic_corpus(folder: Path, count: int, seed: int = 0, words: int = 400) -> Path:
+    """Write a synthetic corpus as PROTOCOL_n.md files."""
+    rng = random.Random(seed)
+    vocabulary = corpus_vocabulary()
+    folder.mkdir(parents=True, exist_ok=True)
+    for number in range(1, count + 1):
+        text = synthetic_text(number, rng, vocabulary, words)
+        (folder / f"PROTOCOL_{number}.md").write_text(text, encoding="utf-8")
+    return folder
+
+
+def parsed_synthetic_documents(folder: Path, count: int, seed: int = 0) -> list[ProtocolDocument]:
+    """Write a synthetic corpus and fully parse it (sections, tables, emojis)."""
+    write_synthetic_corpus(folder, count, seed)
+    return parse_protocols_by_prefix(folder, workers=0)
@@ -11,6 +11,7 @@ visualizations, and exports to the output/ directory.
 
 from __future__ import annotations
 
+import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -52,6 +53,7 @@ def ensure_output_dirs() -> dict[str, Path]:
         "images": OUTPUT_DIR / "exports" / "images",
         "pdfs": OUTPUT_DIR / "exports" / "pdfs",
         "logs": OUTPUT_DIR / "logs",
+        "cache": OUTPUT_DIR / "cache",
     }
     
     for name, path in dirs.items():
@@ -270,13 +272,21 @@ def run_protocol_exports(dirs: dict[str, Path]) -> None:
 def run_protocol_processing(dirs: dict[str, Path]) -> None:
     """Process and analyze protocol files."""
     from samuel_clemens.processing import (
+        CorpusStats,
+        DuplicateIndex,
+        ParseCache,
+        ProtocolCatalog,
+        RelatedIndex,
+        SearchIndex,
+        write_corpus_snapshot,
+        load_reference_graph,
+        parse_folder,
         parse_protocols_by_prefix,
         export_folder_summary,
         export_emoji_report,
         export_structure_analysis,
         export_protocol_index,
         export_obsidian_vault,
-        create_entity_pages,
         export_protocols_to_pdf,
         export_summary_pdf,
     )
@@ -286,31 +296,94 @@ def run_protocol_processing(dirs: dict[str, Path]) -> None:
     # Find project root (parent of samuel_clemens)
     project_root = PACKAGE_ROOT.parent
     
-    # Parse all protocol files
+    # Parse all protocol files (fanned out across every CPU)
     try:
-        protocols = parse_protocols_by_prefix(project_root)
-        console.print(f"  ✓ Parsed {len(protocols)} protocol files")
+        parse_errors = []
+        cache = ParseCache(dirs["cache"])
+        protocols = parse_protocols_by_prefix(
+            project_root, workers=0, errors=parse_errors, cache=cache
+        )
+        console.print(
+            f"  ✓ Parsed {len(protocols)} protocol files "
+            f"[dim]({cache.hits} cached, {cache.misses} parsed)[/dim]"
+        )
+        for error in parse_errors:
+            console.print(f"  [yellow]⚠ Failed to parse {error}[/yellow]")
+        
+        # Keep the `twain search` index current (only changed files are re-indexed)
+        search_index = SearchIndex(dirs["cache"])
+        reindexed = search_index.update(protocols)
+        search_index.save()
+        console.print(
+            f"  ✓ Search index: {len(search_index)} documents "
+            f"[dim]({reindexed} updated)[/dim]"
+        )
+        
+        # Columnar snapshot for instant reloads (`twain corpus`)
+        write_corpus_snapshot(protocols, dirs["cache"])
+        console.print("  ✓ Corpus snapshot")
+        
+        # SQLite catalog for faceted queries (only changed files are rewritten)
+        try:
+            with ProtocolCatalog(dirs["cache"]) as catalog:
+                recatalogued = catalog.update(protocols)
+                console.print(
+                    f"  ✓ Protocol catalog: {len(catalog)} documents "
+                    f"[dim]({recatalogued} updated)[/dim]"
+                )
+        except sqlite3.OperationalError as e:
+            # e.g. a SQLite build without FTS5
+            console.print(f"  [yellow]⚠ Protocol catalog skipped: {e}[/yellow]")
+        
+        # TF-IDF vectors for "similar protocols" (only changed files are recounted)
+        related = RelatedIndex(dirs["cache"])
+        revectorized = related.update(protocols)
+        related.save()
+        console.print(
+            f"  ✓ Related index: {len(related)} documents "
+            f"[dim]({revectorized} updated)[/dim]"
+        )
         
         if protocols:
-            # Export reports
-            export_folder_summary(protocols, dirs["processing"] / "protocol_summary.md")
+            # Export reports (all four share one pass over the corpus)
+            stats = CorpusStats.from_documents(protocols)
+            export_folder_summary(protocols, dirs["processing"] / "protocol_summary.md", stats=stats)
             console.print("  ✓ protocol_summary.md")
             
-            export_emoji_report(protocols, dirs["processing"] / "emoji_report.md")
+            export_emoji_report(protocols, dirs["processing"] / "emoji_report.md", stats=stats)
             console.print("  ✓ emoji_report.md")
             
-            export_structure_analysis(protocols, dirs["processing"] / "structure_analysis.md")
+            # Near-duplicates across the protocols and the other write-ups
+            # (snapshots, status pages, expeditions); protocols come first, so
+            # they are the copies kept. Protocol files were parsed (or reported)
+            # above, so only the other write-ups are parsed here
+            other_errors = []
+            others = parse_folder(
+                project_root, errors=other_errors, fields=["sections", "minhash"],
+                exclude=[p.filepath for p in protocols] + [e.filepath for e in parse_errors],
+            )
+            for error in other_errors:
+                console.print(f"  [yellow]⚠ Failed to parse {error}[/yellow]")
+            duplicates = DuplicateIndex.from_documents([*protocols, *others])
+            
+            # Reference graph is rebuilt only when some document's references change
+            graph = load_reference_graph(protocols, dirs["cache"])
+            export_structure_analysis(
+                protocols, dirs["processing"] / "structure_analysis.md",
+                graph=graph, stats=stats, duplicates=duplicates,
+            )
             console.print("  ✓ structure_analysis.md")
             
-            export_protocol_index(protocols, dirs["processing"] / "protocol_index.md")
+            export_protocol_index(protocols, dirs["processing"] / "protocol_index.md", stats=stats)
             console.print("  ✓ protocol_index.md")
             
             # Obsidian vault export
             console.print("\n  [bold]Exporting Obsidian vault...[/bold]")
             vault_path = dirs["exports"] / "obsidian_vault"
-            vault = export_obsidian_vault(protocols, vault_path)
-            create_entity_pages(vault, protocols)
-            vault.export()
+            vault = export_obsidian_vault(
+                protocols, vault_path, related=related, duplicates=duplicates,
+                entity_pages=True,
+            )
             console.print(f"  ✓ Obsidian vault: {len(vault.pages)} pages")
             
             # Export Protocol Cards (PNG)
@@ -319,7 +392,7 @@ def run_protocol_processing(dirs: dict[str, Path]) -> None:
             try:
                 for p in protocols[:10]:  # Limit to 10 for demo speed
                     card_path = dirs["images"] / f"{p.protocol_id or 'protocol'}_card.png"
-                    render_protocol_card_image(p, card_path)
+                    render_protocol_card_image(p, card_path, related=related.related_for(p, 5))
                 console.print(f"  ✓ Generated {min(len(protocols), 10)} protocol cards")
             except Exception as e:
                 console.print(f"  [yellow]⚠ Protocol card export failed: {e}[/yellow]")
@@ -328,7 +401,7 @@ def run_protocol_processing(dirs: dict[str, Path]) -> None:
             console.print("\n  [bold]Generating PDF exports...[/bold]")
             try:
                 pdf_path = dirs["exports"] / "protocol_documentation.pdf"
-                export_protocols_to_pdf(protocols, pdf_path)
+                export_protocols_to_pdf(protocols, pdf_path, related=related, duplicates=duplicates)
                 console.print(f"  ✓ protocol_documentation.pdf")
                 
                 summary_pdf = dirs["exports"] / "protocol_summary.pdf"
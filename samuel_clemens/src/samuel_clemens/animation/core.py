@@ -15,6 +15,8 @@ from enum import Enum
 
 from rich.console import Console
 
+from samuel_clemens.utils.io import BulkWriter
+
 console = Console()
 
 
@@ -194,15 +196,11 @@ def save_animation_frames(
         List of created file paths
     """
     directory = Path(directory)
-    directory.mkdir(parents=True, exist_ok=True)
-    
-    created = []
+    writer = BulkWriter()
     
     # Save each frame
     for frame in sequence.frames:
-        filepath = directory / f"{prefix}_{frame.index:04d}.txt"
-        filepath.write_text(frame.content)
-        created.append(filepath)
+        writer.add(directory / f"{prefix}_{frame.index:04d}.txt", frame.content)
     
     # Save metadata
     import json
@@ -220,10 +218,10 @@ def save_animation_frames(
             "easing": sequence.config.easing.value,
         },
     }
-    metadata_path.write_text(json.dumps(metadata, indent=2))
-    created.append(metadata_path)
+    writer.add(metadata_path, json.dumps(metadata, indent=2))
     
-    return created
+    # All files in one concurrent batch
+    return writer.write().paths
 
 
 def render_animation_preview(
@@ -30,7 +30,7 @@ def cli() -> None:
       Core:     greet, farewell, story, wisdom, status, expedition
       Stories:  generate, mashup, gallery, templates, elements
       Visual:   dashboard, banner, portrait, map, timeline, energy
-      Protocol: cycles, entities, quotes, interact
+      Protocol: cycles, entities, quotes, interact, search, corpus
     """
     pass
 
@@ -706,6 +706,139 @@ def interact(entity_id: str) -> None:
         console.print("[dim]Use 'twain entities' to see available entities.[/dim]")
 
 
+@cli.command()
+@click.argument("query")
+@click.option(
+    "--folder", "-f",
+    type=click.Path(exists=True, file_okay=False),
+    default=".",
+    help="Folder holding the protocol files",
+)
+@click.option("--limit", "-n", default=10, help="Maximum number of results")
+@click.option("--recursive", "-r", is_flag=True, help="Also index subdirectories")
+@click.option("--rebuild", is_flag=True, help="Rebuild the index from scratch")
+def search(query: str, folder: str, limit: int, recursive: bool, rebuild: bool) -> None:
+    """
+    Search the protocol corpus (BM25 ranked, "quoted phrases" supported).
+    
+    The index lives in FOLDER/.twain_cache and only re-indexes changed files.
+    
+    Example: twain search '"hero host" goldilocks'
+    """
+    import time
+    from pathlib import Path
+    from samuel_clemens.processing import ParseCache, build_search_index
+    
+    cache_dir = Path(folder) / ".twain_cache"
+    cache_dir.mkdir(exist_ok=True)
+    index = build_search_index(
+        folder,
+        cache_dir,
+        cache=ParseCache(cache_dir),
+        recursive=recursive,
+        rebuild=rebuild,
+    )
+    
+    start = time.perf_counter()
+    hits = index.search(query, limit=limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if not hits:
+        console.print(f"[yellow]No protocols match {query!r}.[/yellow]")
+        console.print(f"[dim]Searched {len(index)} documents in {elapsed_ms:.1f} ms[/dim]")
+        return
+    
+    table = Table(title=f"🔍 {query}")
+    table.add_column("#", style="dim")
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Title", style="green", max_width=50)
+    table.add_column("Score", style="magenta", justify="right")
+    table.add_column("Sections", style="yellow", max_width=40)
+    
+    for i, hit in enumerate(hits, 1):
+        table.add_row(
+            str(i),
+            hit.protocol_id or Path(hit.path).name,
+            hit.title or "-",
+            f"{hit.score:.2f}",
+            "; ".join(hit.sections[:3]),
+        )
+    
+    console.print(table)
+    console.print(f"[dim]{len(hits)} of {len(index)} documents in {elapsed_ms:.1f} ms[/dim]")
+
+
+@cli.command()
+@click.option(
+    "--folder", "-f",
+    type=click.Path(exists=True, file_okay=False),
+    default=".",
+    help="Folder holding the protocol files",
+)
+@click.option("--protocol", "-p", type=int, default=None, help="Show one protocol's row")
+@click.option("--recursive", "-r", is_flag=True, help="Also scan subdirectories")
+def corpus(folder: str, protocol: int | None, recursive: bool) -> None:
+    """
+    Summarize the protocol corpus from its columnar snapshot.
+    
+    The snapshot lives in FOLDER/.twain_cache and is rewritten only when
+    protocol files change, so an unchanged corpus opens without parsing.
+    
+    Example: twain corpus -p 92
+    """
+    import time
+    from pathlib import Path
+    from samuel_clemens.processing import ParseCache, load_corpus_snapshot
+    from samuel_clemens.processing.snapshot import STATUS_EMERGENT, STATUS_OPERATIONAL
+    
+    cache_dir = Path(folder) / ".twain_cache"
+    cache_dir.mkdir(exist_ok=True)
+    start = time.perf_counter()
+    with load_corpus_snapshot(
+        folder, cache_dir, cache=ParseCache(cache_dir), recursive=recursive
+    ) as snapshot:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if protocol is not None:
+            row = snapshot.find(protocol)
+            if row is None:
+                console.print(f"[red]Protocol {protocol} not found.[/red]")
+                return
+            record = snapshot.record(row)
+            console.print(Panel(
+                f"[bold]{record.title or Path(record.filepath).name}[/bold]\n\n"
+                f"Category: {record.category or '-'}\n"
+                f"Status: {record.status or '-'}\n"
+                f"Words: {record.word_count:,}  Lines: {record.line_count:,}  "
+                f"Emojis: {record.emoji_count}\n"
+                f"Sections: {len(record.sections)}  Tables: {len(record.tables)}\n"
+                f"References: {', '.join(f'P{n}' for n in record.references) or '-'}",
+                title=f"📑 {record.protocol_id}",
+                border_style="cyan",
+            ))
+            return
+        
+        codes = snapshot.status_code
+        categories: dict[str, int] = {}
+        for sid in snapshot.category:
+            name = snapshot.string(sid) or "Uncategorized"
+            categories[name] = categories.get(name, 0) + 1
+        
+        table = Table(title="📚 Protocol Corpus")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="green")
+        table.add_row("Documents", f"{len(snapshot):,}")
+        table.add_row("Words", f"{sum(snapshot.word_count):,}")
+        table.add_row("Emojis", f"{sum(snapshot.emoji_count):,}")
+        table.add_row("Operational", str(sum(1 for c in codes if c & STATUS_OPERATIONAL)))
+        table.add_row("Emergent", str(sum(1 for c in codes if c & STATUS_EMERGENT)))
+        for name, count in sorted(categories.items(), key=lambda x: -x[1])[:5]:
+            table.add_row(f"  {name[:40]}", str(count))
+        
+        console.print(table)
+        console.print(f"[dim]Opened snapshot in {elapsed_ms:.1f} ms[/dim]")
+
+
 @cli.command()
 def network() -> None:
     """
@@ -5,24 +5,90 @@ Processing Module - Parse and analyze protocol files and text documents.
 — Mark Twain
 
 This module provides:
-- Generic and protocol-specific file parsing
+- Generic and protocol-specific file parsing (with field projection)
+- Single-pass, line-indexed tokenization
 - Emoji analysis and extraction
 - Structured section extraction
+- Typed, columnar tables and corpus-wide table stacking
 - Markdown conversion and export
 - Obsidian [[wikilink]] vault export
 - PDF document generation
-- Bulk folder processing
+- Bulk folder processing (optionally across a process pool)
+- Persistent parse cache for unchanged files
+- Inverted full-text index with BM25 ranking and phrase queries
+- Protocol reference graph (centrality, cycles, upstream queries)
+- TF-IDF "similar protocols" recommender
+- One-pass, mergeable corpus statistics for the folder reports
+- Schema-compiled JSON encoders and streaming NDJSON corpus export/load
+- Columnar, memory-mapped corpus snapshots
+- SQLite protocol catalog with faceted and full-text queries
+- MinHash/LSH near-duplicate documents and sections
 """
 
 from samuel_clemens.processing.parser import (
     ParsedDocument,
     ProtocolDocument,
+    ParseError,
+    FIELD_PROFILES,
     parse_file,
     parse_folder,
+    iter_parse_folder,
     parse_protocol,
     parse_protocols_by_prefix,
     iter_protocol_files,
 )
+from samuel_clemens.processing.cache import (
+    ParseCache,
+)
+from samuel_clemens.processing.graph import (
+    ReferenceGraph,
+    load_reference_graph,
+)
+from samuel_clemens.processing.related import (
+    RelatedIndex,
+    RelatedProtocol,
+)
+from samuel_clemens.processing.catalog import (
+    ProtocolCatalog,
+    CatalogEntry,
+    CatalogSection,
+    build_protocol_catalog,
+)
+from samuel_clemens.processing.dedup import (
+    DuplicateIndex,
+    LSHIndex,
+    NearDuplicate,
+    minhash_signature,
+)
+from samuel_clemens.processing.snapshot import (
+    CorpusSnapshot,
+    SnapshotRecord,
+    write_corpus_snapshot,
+    load_corpus_snapshot,
+)
+from samuel_clemens.processing.stats import (
+    CorpusStats,
+    DocumentStats,
+    EmojiTally,
+)
+from samuel_clemens.processing.codec import (
+    encode_document,
+    encoder_for,
+    decode_document,
+    iter_corpus_ndjson,
+    load_corpus_ndjson,
+)
+from samuel_clemens.processing.search import (
+    SearchIndex,
+    SearchHit,
+    build_search_index,
+)
+from samuel_clemens.processing.tokens import (
+    Token,
+    TokenKind,
+    TokenStream,
+    tokenize,
+)
 from samuel_clemens.processing.emoji import (
     EmojiInfo,
     extract_emojis,
@@ -32,6 +98,8 @@ from samuel_clemens.processing.emoji import (
     get_emoji_categories,
     replace_emojis_with_text,
     strip_emojis,
+    iter_replace_emojis_with_text,
+    iter_strip_emojis,
 )
 from samuel_clemens.processing.sections import (
     Section,
@@ -45,16 +113,26 @@ from samuel_clemens.processing.sections import (
     extract_conclusion,
     extract_checkmarks,
     extract_protocol_references,
+    extract_referenced_numbers,
+)
+from samuel_clemens.processing.tables import (
+    TableColumn,
+    StackedTable,
+    concat_tables,
+    corpus_tables,
 )
 from samuel_clemens.processing.export import (
     export_to_markdown,
     export_to_json,
+    export_corpus_ndjson,
     export_folder_summary,
     export_emoji_report,
     export_structure_analysis,
     export_protocol_index,
 )
 from samuel_clemens.processing.obsidian import (
+    KNOWN_ENTITIES,
+    EntityLinker,
     WikiLink,
     ObsidianPage,
     ObsidianVault,
@@ -75,11 +153,56 @@ __all__ = [
     # Parser
     "ParsedDocument",
     "ProtocolDocument",
+    "ParseError",
+    "FIELD_PROFILES",
     "parse_file",
     "parse_folder",
+    "iter_parse_folder",
     "parse_protocol",
     "parse_protocols_by_prefix",
     "iter_protocol_files",
+    # Cache
+    "ParseCache",
+    # Graph
+    "ReferenceGraph",
+    "load_reference_graph",
+    # Related
+    "RelatedIndex",
+    "RelatedProtocol",
+    # Search
+    "SearchIndex",
+    "SearchHit",
+    "build_search_index",
+    # Catalog
+    "ProtocolCatalog",
+    "CatalogEntry",
+    "CatalogSection",
+    "build_protocol_catalog",
+    # Dedup
+    "DuplicateIndex",
+    "LSHIndex",
+    "NearDuplicate",
+    "minhash_signature",
+    # Snapshot
+    "CorpusSnapshot",
+    "SnapshotRecord",
+    "write_corpus_snapshot",
+    "load_corpus_snapshot",
+    # Stats
+    "CorpusStats",
+    "DocumentStats",
+    "EmojiTally",
+    # Codec
+    "encode_document",
+    "encoder_for",
+    "decode_document",
+    "iter_corpus_ndjson",
+    "load_corpus_ndjson",
+    # Tokens
+    "Token",
+    "TokenKind",
+    "TokenStream",
+    "tokenize",
     # Emoji
     "EmojiInfo",
     "extract_emojis",
@@ -89,6 +212,8 @@ __all__ = [
     "get_emoji_categories",
     "replace_emojis_with_text",
     "strip_emojis",
+    "iter_replace_emojis_with_text",
+    "iter_strip_emojis",
     # Sections
     "Section",
     "TableData",
@@ -101,14 +226,23 @@ __all__ = [
     "extract_conclusion",
     "extract_checkmarks",
     "extract_protocol_references",
+    "extract_referenced_numbers",
+    # Tables
+    "TableColumn",
+    "StackedTable",
+    "concat_tables",
+    "corpus_tables",
     # Export
     "export_to_markdown",
     "export_to_json",
+    "export_corpus_ndjson",
     "export_folder_summary",
     "export_emoji_report",
     "export_structure_analysis",
     "export_protocol_index",
     # Obsidian
+    "KNOWN_ENTITIES",
+    "EntityLinker",
     "WikiLink",
     "ObsidianPage",
     "ObsidianVault",
@@ -0,0 +1,176 @@
+"""
+Parse Cache - Persistent, content-hashed cache of parsed protocol documents.
+
+"It is better to keep your mouth closed and let people think you are a fool
+than to open it and remove all doubt." — Mark Twain
+
+Entries are keyed by file path and validated by size and mtime, falling
+back to a content hash when the stat changed but the bytes might not
+have. The whole cache lives in one compressed pickle stamped with the
+parser version, so a warm run loads every document with a single read.
+Documents keep track of the field groups their parse deferred, so one
+cached from a narrow profile is re-parsed when a caller needs more.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from samuel_clemens.processing.parser import FIELD_PROFILES, PARSER_VERSION, ProtocolDocument
+from samuel_clemens.utils.io import load_versioned, save_versioned, store_path
+
+
+DEFAULT_CACHE_FILENAME = "parse_cache.bin"
+
+
+@dataclass
+class CacheEntry:
+    """A cached document with the file state it was parsed from."""
+    size: int
+    mtime_ns: int
+    digest: str
+    document: ProtocolDocument
+
+
+def _file_digest(filepath: Path) -> str:
+    """Hash a file's bytes."""
+    return hashlib.blake2b(filepath.read_bytes(), digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed ProtocolDocuments.
+
+    Usage:
+        cache = ParseCache(output_dir / "parse_cache.bin")
+        doc = cache.get(path) or parse_protocol(path)
+        cache.put(doc)
+        cache.save()
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = store_path(path, DEFAULT_CACHE_FILENAME)
+        self.entries: dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file, discarding it if stale or unreadable."""
+        self.entries = {}
+        if not self.path.exists():
+            return
+
+        payload = load_versioned(self.path, PARSER_VERSION)
+        if payload is None:
+            self._dirty = True
+            return
+
+        self.entries = payload.get("entries", {})
+
+    def get(
+        self,
+        filepath: Path | str,
+        stat: Optional[os.stat_result] = None,
+        groups: Iterable[str] = FIELD_PROFILES["full"],
+    ) -> Optional[ProtocolDocument]:
+        """
+        Get the cached document for a file if it is still current.
+
+        A document cached from a narrower parse (e.g. the "index" profile)
+        is a miss when the caller needs field groups it deferred.
+
+        Args:
+            filepath: Path to the source file
+            stat: Pre-fetched stat of the file (saves a syscall)
+            groups: Field groups the caller needs extracted
+
+        Returns:
+            Cached ProtocolDocument, or None on a miss
+        """
+        filepath = Path(filepath)
+        entry = self.entries.get(str(filepath))
+        if entry is None or not entry.document.deferred_groups.isdisjoint(groups):
+            self.misses += 1
+            return None
+
+        try:
+            stat = stat or filepath.stat()
+            if entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                self.hits += 1
+                return entry.document
+
+            # Stat changed: the bytes may still be identical (touch, checkout)
+            if entry.size == stat.st_size and entry.digest == _file_digest(filepath):
+                entry.mtime_ns = stat.st_mtime_ns
+                self._dirty = True
+                self.hits += 1
+                return entry.document
+        except OSError:
+            pass
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        document: ProtocolDocument,
+        stat: Optional[os.stat_result] = None,
+    ) -> None:
+        """
+        Store a freshly parsed document.
+
+        Args:
+            document: Parsed document (keyed by its filepath)
+            stat: Pre-fetched stat of the file
+        """
+        filepath = Path(document.filepath)
+        try:
+            stat = stat or filepath.stat()
+            digest = _file_digest(filepath)
+        except OSError:
+            return
+
+        self.entries[str(filepath)] = CacheEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digest=digest,
+            document=document,
+        )
+        self._dirty = True
+
+    def prune(self) -> int:
+        """
+        Drop entries whose source files no longer exist.
+
+        Returns:
+            Number of entries dropped
+        """
+        missing = [key for key in self.entries if not os.path.exists(key)]
+        for key in missing:
+            del self.entries[key]
+        if missing:
+            self._dirty = True
+        return len(missing)
+
+    def save(self) -> bool:
+        """
+        Write the cache to disk if anything changed.
+
+        Returns:
+            True if the cache file was written
+        """
+        if not self._dirty:
+            return False
+
+        save_versioned(self.path, PARSER_VERSION, {"entries": self.entries})
+        self._dirty = False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,583 @@
+"""
+Protocol Catalog - SQLite-backed store for faceted protocol queries.
+
+"Supposing is good, but finding out is better." — Mark Twain
+
+Parsed protocols are upserted into a local SQLite database: one row per
+document, plus its sections (with FTS5 over their text), the protocol
+numbers it references and its emoji counts. Category, status, discovery
+date and protocol number are indexed, so a question like "operational
+protocols in category X discovered after Y, most cited first" is one
+SQL query rather than a parse of the whole corpus.
+
+Upserts are batched, one transaction per batch, and skip documents
+whose content digest is unchanged (like the search index).
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+
+from samuel_clemens.processing.parser import (
+    ParsedDocument,
+    ProtocolDocument,
+    parse_protocols_by_prefix,
+)
+from samuel_clemens.processing.sections import walk_sections
+from samuel_clemens.utils.io import content_digest
+
+if TYPE_CHECKING:
+    from samuel_clemens.processing.cache import ParseCache
+
+
+# Bump whenever the schema or a derived column changes
+CATALOG_VERSION = 1
+
+DEFAULT_CATALOG_FILENAME = "protocol_catalog.db"
+
+# Documents written per transaction
+DEFAULT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    digest TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    title TEXT,
+    protocol_number INTEGER,
+    protocol_id TEXT,
+    category TEXT COLLATE NOCASE,
+    status TEXT COLLATE NOCASE,
+    is_operational INTEGER NOT NULL DEFAULT 0,
+    is_emergent INTEGER NOT NULL DEFAULT 0,
+    discovery_date TEXT,
+    discovered_on TEXT,
+    word_count INTEGER NOT NULL,
+    line_count INTEGER NOT NULL,
+    emoji_count INTEGER NOT NULL,
+    reference_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_category ON documents (category);
+CREATE INDEX IF NOT EXISTS documents_status ON documents (status);
+CREATE INDEX IF NOT EXISTS documents_discovered_on ON documents (discovered_on);
+CREATE INDEX IF NOT EXISTS documents_protocol_number ON documents (protocol_number);
+
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    level INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_document ON sections (document_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS section_text USING fts5 (title, body);
+
+CREATE TABLE IF NOT EXISTS protocol_references (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    target_number INTEGER NOT NULL,
+    PRIMARY KEY (document_id, target_number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS protocol_references_target ON protocol_references (target_number);
+
+CREATE TABLE IF NOT EXISTS emoji_counts (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    char TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (document_id, char)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS emoji_counts_char ON emoji_counts (char);
+"""
+
+_TABLES = ("section_text", "emoji_counts", "protocol_references", "sections", "documents")
+
+# Other documents citing this row (via the protocol_references_target index)
+_CITED_BY = (
+    "(SELECT COUNT(*) FROM protocol_references r "
+    "WHERE r.target_number = d.protocol_number AND r.document_id != d.id)"
+)
+
+# Accepted order_by keys -> SQL expression
+_ORDERINGS = {
+    "protocol_number": "d.protocol_number",
+    "discovery_date": "d.discovered_on",
+    "title": "d.title",
+    "word_count": "d.word_count",
+    "emoji_count": "d.emoji_count",
+    "reference_count": "d.reference_count",
+    "cited_by": "cited_by",
+}
+
+# Columns facets() can count by
+_FACETS = ("category", "status", "discovered_on")
+
+_MONTHS = {
+    name: i for i, name in enumerate(
+        ("january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"), 1
+    )
+}
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})(?:-(\d{2}))?")
+_WRITTEN_DATE = re.compile(r"([A-Za-z]+)\.?\s+(?:(\d{1,2})(?:st|nd|rd|th)?,?\s+)?(\d{4})")
+_YEAR = re.compile(r"\b(\d{4})\b")
+
+
+def discovery_day(text: Optional[str]) -> Optional[str]:
+    """
+    Normalize a free-form discovery date to ISO "YYYY-MM-DD".
+
+    Month-only dates ("January 2026") map to the first of the month and
+    year-only dates to January 1st, so they sort and compare as dates.
+
+    Args:
+        text: Date as written in the protocol metadata
+
+    Returns:
+        ISO date string, or None if no date is recognized
+    """
+    if not text:
+        return None
+    match = _ISO_DATE.search(text)
+    if match:
+        year, month, day = match.groups()
+        return f"{year}-{month}-{day or '01'}"
+    match = _WRITTEN_DATE.search(text)
+    if match and match.group(1).lower() in _MONTHS:
+        month = _MONTHS[match.group(1).lower()]
+        return f"{match.group(3)}-{month:02d}-{int(match.group(2) or 1):02d}"
+    match = _YEAR.search(text)
+    if match:
+        return f"{match.group(1)}-01-01"
+    return None
+
+
+@dataclass
+class CatalogEntry:
+    """One protocol row returned by a catalog query."""
+    path: str
+    filename: str
+    title: Optional[str]
+    protocol_number: Optional[int]
+    protocol_id: Optional[str]
+    category: Optional[str]
+    status: Optional[str]
+    discovery_date: Optional[str]
+    word_count: int
+    emoji_count: int
+    reference_count: int  # Distinct other protocols this one references
+    cited_by: int  # Other catalogued documents referencing this one
+
+
+@dataclass
+class CatalogSection:
+    """A section matching a full-text catalog search."""
+    path: str
+    protocol_id: Optional[str]
+    title: str
+    level: int
+    snippet: str
+    score: float
+
+
+class ProtocolCatalog:
+    """
+    SQLite catalog of parsed protocols.
+
+    Usage:
+        catalog = ProtocolCatalog(output_dir / "protocol_catalog.db")
+        catalog.update(parse_protocols_by_prefix(folder))
+        catalog.query(category="Emergent", operational=True,
+                      discovered_after="2026-01-01", order_by="cited_by")
+    """
+
+    def __init__(self, path: Optional[Path | str] = None):
+        if path is None:
+            self.path = None
+        else:
+            self.path = Path(path)
+            if self.path.is_dir():
+                self.path = self.path / DEFAULT_CATALOG_FILENAME
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(self.path) if self.path else ":memory:")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if self.path is not None:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        try:
+            self._open_schema()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    def _open_schema(self) -> None:
+        """Create the schema, starting empty if the file is from another version."""
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        with self.connection:
+            if version != CATALOG_VERSION:
+                for table in _TABLES:
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __enter__(self) -> "ProtocolCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def clear(self) -> None:
+        """Drop every catalogued document."""
+        with self.connection:
+            self.connection.execute("DELETE FROM section_text")
+            self.connection.execute("DELETE FROM documents")
+
+    # ---------------------------------------------------------------- updates
+
+    def upsert(self, documents: Iterable[ParsedDocument], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Insert documents, replacing older versions of the same files.
+
+        Documents are written in batches, each in a single transaction.
+
+        Args:
+            documents: Parsed documents
+            batch_size: Documents per transaction
+
+        Returns:
+            Number of documents inserted or replaced
+        """
+        changed = 0
+        batch: list[ParsedDocument] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                changed += self._write_batch(batch)
+                batch = []
+        if batch:
+            changed += self._write_batch(batch)
+        return changed
+
+    def _write_batch(self, batch: list[ParsedDocument]) -> int:
+        conn = self.connection
+        digests = {str(doc.filepath): content_digest(doc.content) for doc in batch}
+        marks = ",".join("?" * len(digests))
+        existing = {
+            path: (doc_id, digest)
+            for doc_id, path, digest in conn.execute(
+                f"SELECT id, path, digest FROM documents WHERE path IN ({marks})",
+                list(digests),
+            )
+        }
+
+        stale = []
+        fresh = {}  # Later duplicates of a path win
+        for doc in batch:
+            path = str(doc.filepath)
+            known = existing.get(path)
+            if known is not None:
+                if known[1] == digests[path]:
+                    continue
+                stale.append(known[0])
+            fresh[path] = doc
+        if not fresh:
+            return 0
+
+        documents, sections, texts, references, emojis = [], [], [], [], []
+        with conn:
+            self._delete_ids(stale)
+            (next_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM documents").fetchone()
+            (next_section,) = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM sections").fetchone()
+
+            for doc_id, (path, doc) in enumerate(fresh.items(), next_id):
+                is_protocol = isinstance(doc, ProtocolDocument)
+                # A protocol's own title mentions its number; that is no reference
+                numbers = [
+                    n for n in doc.referenced_numbers if n != doc.protocol_number
+                ] if is_protocol else ()
+                discovery_date = doc.discovery_date if is_protocol else None
+                documents.append((
+                    doc_id, path, digests[path], doc.filename, doc.title,
+                    doc.protocol_number if is_protocol else None,
+                    doc.protocol_id if is_protocol else None,
+                    doc.category if is_protocol else None,
+                    doc.status if is_protocol else None,
+                    is_protocol and doc.is_operational,
+                    is_protocol and doc.is_emergent,
+                    discovery_date, discovery_day(discovery_date),
+                    doc.word_count, doc.line_count, doc.emoji_count, len(numbers),
+                ))
+                for position, section in enumerate(walk_sections(doc.sections)):
+                    sections.append((next_section, doc_id, position, section.plain_title, section.level))
+                    # Subsections are indexed on their own, so each row holds only its own text
+                    texts.append((next_section, section.plain_title, section.own_content))
+                    next_section += 1
+                references.extend((doc_id, number) for number in numbers)
+                emojis.extend(
+                    (doc_id, e.char, e.name, e.category, e.count) for e in doc.emojis
+                )
+
+            conn.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                documents,
+            )
+            conn.executemany("INSERT INTO sections VALUES (?, ?, ?, ?, ?)", sections)
+            conn.executemany("INSERT INTO section_text (rowid, title, body) VALUES (?, ?, ?)", texts)
+            conn.executemany("INSERT INTO protocol_references VALUES (?, ?)", references)
+            conn.executemany("INSERT INTO emoji_counts VALUES (?, ?, ?, ?, ?)", emojis)
+        return len(fresh)
+
+    def _delete_ids(self, doc_ids: list[int]) -> None:
+        """Delete documents (inside the caller's transaction)."""
+        if not doc_ids:
+            return
+        marks = ",".join("?" * len(doc_ids))
+        # FTS rows are not covered by the foreign-key cascade
+        self.connection.execute(
+            f"DELETE FROM section_text WHERE rowid IN "
+            f"(SELECT id FROM sections WHERE document_id IN ({marks}))",
+            doc_ids,
+        )
+        self.connection.execute(f"DELETE FROM documents WHERE id IN ({marks})", doc_ids)
+
+    def remove(self, path: Path | str) -> bool:
+        """
+        Remove a document from the catalog.
+
+        Args:
+            path: Source file path of the document
+
+        Returns:
+            True if the document was catalogued
+        """
+        row = self.connection.execute(
+            "SELECT id FROM documents WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row is None:
+            return False
+        with self.connection:
+            self._delete_ids([row[0]])
+        return True
+
+    def update(
+        self,
+        documents: Iterable[ParsedDocument],
+        prune: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Bring the catalog up to date with a set of documents.
+
+        Args:
+            documents: Current documents of the corpus
+            prune: Remove catalogued documents that are not in the set
+            batch_size: Documents per transaction
+
+        Returns:
+            Number of documents added, replaced or removed
+        """
+        seen: set[str] = set()
+
+        def tracked() -> Iterator[ParsedDocument]:
+            for document in documents:
+                seen.add(str(document.filepath))
+                yield document
+
+        changed = self.upsert(tracked(), batch_size=batch_size)
+
+        if prune:
+            gone = [
+                doc_id for doc_id, path in self.connection.execute("SELECT id, path FROM documents")
+                if path not in seen
+            ]
+            with self.connection:
+                self._delete_ids(gone)
+            changed += len(gone)
+        return changed
+
+    # ---------------------------------------------------------------- queries
+
+    @staticmethod
+    def _where(
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        operational: Optional[bool] = None,
+        emergent: Optional[bool] = None,
+        discovered_after: Optional[date | str] = None,
+        discovered_before: Optional[date | str] = None,
+        text: Optional[str] = None,
+    ) -> tuple[str, list]:
+        """Build the WHERE clause shared by query() and facets()."""
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("d.category = ?")
+            params.append(category)
+        if status is not None:
+            clauses.append("d.status = ?")
+            params.append(status)
+        if operational is not None:
+            clauses.append("d.is_operational = ?")
+            params.append(int(operational))
+        if emergent is not None:
+            clauses.append("d.is_emergent = ?")
+            params.append(int(emergent))
+        if discovered_after is not None:
+            clauses.append("d.discovered_on > ?")
+            params.append(str(discovered_after))
+        if discovered_before is not None:
+            clauses.append("d.discovered_on < ?")
+            params.append(str(discovered_before))
+        if text is not None:
+            clauses.append(
+                "d.id IN (SELECT s.document_id FROM sections s WHERE s.id IN "
+                "(SELECT rowid FROM section_text WHERE section_text MATCH ?))"
+            )
+            params.append(text)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _execute(self, sql: str, params: list) -> sqlite3.Cursor:
+        try:
+            return self.connection.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            # Malformed FTS5 query syntax surfaces here
+            raise ValueError(f"Invalid catalog query: {e}") from e
+
+    def query(
+        self,
+        order_by: str = "protocol_number",
+        descending: bool = False,
+        limit: Optional[int] = None,
+        **filters,
+    ) -> list[CatalogEntry]:
+        """
+        Find catalogued documents matching every given filter.
+
+        Args:
+            order_by: One of protocol_number, discovery_date, title,
+                word_count, emoji_count, reference_count, cited_by
+            descending: Sort largest first
+            limit: Maximum number of rows
+            **filters: category, status, operational, emergent,
+                discovered_after / discovered_before (ISO date or date,
+                exclusive) and text (FTS5 query over section text)
+
+        Returns:
+            List of CatalogEntry
+        """
+        if order_by not in _ORDERINGS:
+            raise ValueError(f"Cannot order by {order_by!r} (choose from {', '.join(_ORDERINGS)})")
+        where, params = self._where(**filters)
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            "SELECT d.path, d.filename, d.title, d.protocol_number, d.protocol_id, "
+            "d.category, d.status, d.discovery_date, d.word_count, d.emoji_count, "
+            f"d.reference_count, {_CITED_BY} AS cited_by FROM documents d{where} "
+            f"ORDER BY {_ORDERINGS[order_by]} {direction}, d.path"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [CatalogEntry(*row) for row in self._execute(sql, params)]
+
+    def facets(self, column: str, **filters) -> dict[Optional[str], int]:
+        """
+        Count matching documents per value of a column.
+
+        Args:
+            column: One of category, status, discovered_on
+            **filters: As for query()
+
+        Returns:
+            dict of value -> document count, most common first
+        """
+        if column not in _FACETS:
+            raise ValueError(f"Cannot facet by {column!r} (choose from {', '.join(_FACETS)})")
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT d.{column}, COUNT(*) AS n FROM documents d{where} "
+            f"GROUP BY d.{column} ORDER BY n DESC, d.{column}"
+        )
+        return dict(self._execute(sql, params).fetchall())
+
+    def emoji_totals(self, limit: Optional[int] = None, **filters) -> list[tuple[str, str, int]]:
+        """
+        Emoji uses summed over the matching documents.
+
+        Args:
+            limit: Maximum number of emojis
+            **filters: As for query()
+
+        Returns:
+            List of (char, name, count), most used first
+        """
+        where, params = self._where(**filters)
+        sql = (
+            "SELECT e.char, e.name, SUM(e.count) AS total FROM emoji_counts e "
+            f"JOIN documents d ON d.id = e.document_id{where} "
+            "GROUP BY e.char ORDER BY total DESC, e.char"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._execute(sql, params).fetchall()
+
+    def search_sections(self, text: str, limit: int = 10) -> list[CatalogSection]:
+        """
+        Full-text search over section titles and text.
+
+        Args:
+            text: FTS5 query (terms, "phrases", AND/OR/NOT, prefix*)
+            limit: Maximum number of sections
+
+        Returns:
+            List of CatalogSection, best match first
+        """
+        sql = (
+            "SELECT d.path, d.protocol_id, s.title, s.level, "
+            "snippet(section_text, 1, '[', ']', '…', 12), bm25(section_text) AS rank "
+            "FROM section_text JOIN sections s ON s.id = section_text.rowid "
+            "JOIN documents d ON d.id = s.document_id "
+            "WHERE section_text MATCH ? ORDER BY rank LIMIT ?"
+        )
+        return [
+            CatalogSection(path, protocol_id, title, level, snippet, -rank)
+            for path, protocol_id, title, level, snippet, rank in self._execute(sql, [text, limit])
+        ]
+
+
+def build_protocol_catalog(
+    folder_path: Path | str,
+    catalog_path: Path | str,
+    cache: Optional[ParseCache] = None,
+    recursive: bool = False,
+) -> ProtocolCatalog:
+    """
+    Create or incrementally update the catalog for a protocol folder.
+
+    Args:
+        folder_path: Folder holding the protocol files
+        catalog_path: Database file (or directory for the default filename)
+        cache: ParseCache to reuse unchanged parses from
+        recursive: Also scan subdirectories
+
+    Returns:
+        Up-to-date ProtocolCatalog (close it when done)
+    """
+    catalog = ProtocolCatalog(catalog_path)
+    catalog.update(parse_protocols_by_prefix(folder_path, cache=cache, recursive=recursive))
+    return catalog
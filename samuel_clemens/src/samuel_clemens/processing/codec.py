@@ -0,0 +1,353 @@
+"""
+Codec - Schema-compiled JSON encoding and decoding of parsed documents.
+
+"The report of my death was an exaggeration." — Mark Twain
+
+Walking ``__dict__`` with isinstance checks costs a type test per value
+and drags along whatever happens to be on the instance (every Section
+holds its whole owning document). Instead, one encoder function is
+generated per dataclass from its field annotations: the field list, the
+per-field conversion (Path, datetime, array, nested dataclasses) and the
+recursion are all decided once, and encoding is straight-line attribute
+reads into a dict literal.
+
+Decoding goes the other way through a pydantic TypeAdapter built once
+for the record schema: each NDJSON line is parsed and validated in one
+call, then rebuilt into ParsedDocument / ProtocolDocument objects.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import json
+import types
+import typing
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, Callable, Iterator, Literal, Optional, Union
+
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict  # pydantic requires it before Python 3.12
+
+from samuel_clemens.processing.dedup import minhash_signature
+from samuel_clemens.processing.emoji import EmojiInfo
+from samuel_clemens.processing.parser import ParsedDocument, ProtocolDocument
+from samuel_clemens.processing.sections import MetadataBlock, Quote, Section, TableData
+
+
+# Fields left out of the encoded form. A Section's source is its owning
+# document's content, which the document record already carries.
+_SKIPPED_FIELDS: dict[type, frozenset[str]] = {
+    Section: frozenset({"source"}),
+}
+
+# Record discriminator, so loaders know which class to rebuild
+DOCUMENT_KINDS: dict[type, str] = {
+    ParsedDocument: "document",
+    ProtocolDocument: "protocol",
+}
+
+# Values JSON takes as-is: no conversion code is generated for these
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+_encoders: dict[type, Callable[[Any], dict]] = {}
+
+_dumps = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), check_circular=False
+).encode
+
+
+def _is_plain(tp: Any) -> bool:
+    """True if values of this annotation serialize without conversion."""
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        return all(_is_plain(arg) for arg in typing.get_args(tp))
+    if origin in (list, tuple, dict):
+        return all(_is_plain(arg) for arg in typing.get_args(tp) if arg is not Ellipsis)
+    return tp in _PLAIN_TYPES
+
+
+def _value_expr(tp: Any, ref: str, namespace: dict, owner: type) -> str:
+    """Python expression converting ``ref`` (annotated ``tp``) for JSON."""
+    if _is_plain(tp):
+        return ref
+
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            return f"None if {ref} is None else {_value_expr(args[0], ref, namespace, owner)}"
+    elif origin in (list, set, frozenset) and typing.get_args(tp):
+        (item,) = typing.get_args(tp)
+        return f"[{_value_expr(item, 'item', namespace, owner)} for item in {ref}]"
+    elif origin is dict and typing.get_args(tp):
+        _, value = typing.get_args(tp)
+        return f"{{key: {_value_expr(value, 'item', namespace, owner)} for key, item in {ref}.items()}}"
+    elif tp is Path:
+        return f"str({ref})"
+    elif tp is datetime:
+        return f"{ref}.isoformat()"
+    elif tp is array:
+        return f"{ref}.tolist()"
+    elif dataclasses.is_dataclass(tp):
+        if tp is owner:
+            return f"encode({ref})"  # Recursive type (Section.subsections)
+        name = f"encode_{tp.__name__}"
+        namespace[name] = encoder_for(tp)
+        return f"{name}({ref})"
+
+    raise TypeError(f"No JSON encoding for {owner.__name__} field type {tp!r}")
+
+
+def encoder_for(cls: type) -> Callable[[Any], dict]:
+    """
+    Get (compiling on first use) the JSON encoder for a dataclass.
+
+    Args:
+        cls: Dataclass type
+
+    Returns:
+        Function mapping an instance to a JSON-ready dict
+    """
+    encoder = _encoders.get(cls)
+    if encoder is not None:
+        return encoder
+
+    hints = typing.get_type_hints(cls)
+    skipped = _SKIPPED_FIELDS.get(cls, frozenset())
+    namespace: dict[str, Any] = {}
+    lines = ["def encode(obj):", "    return {"]
+    kind = DOCUMENT_KINDS.get(cls)
+    if kind is not None:
+        lines.append(f"        'kind': {kind!r},")
+    for f in dataclasses.fields(cls):
+        if f.name in skipped:
+            continue
+        expr = _value_expr(hints[f.name], f"obj.{f.name}", namespace, cls)
+        lines.append(f"        {f.name!r}: {expr},")
+    lines.append("    }")
+
+    exec("\n".join(lines), namespace)
+    encoder = _encoders[cls] = namespace["encode"]
+    encoder.__qualname__ = f"encode_{cls.__name__}"
+    return encoder
+
+
+def encode_document(doc: ParsedDocument) -> dict:
+    """
+    Encode a parsed document (with all its fields) as a JSON-ready dict.
+
+    Fields deferred by a projected parse are extracted on access.
+
+    Args:
+        doc: Parsed or protocol document
+
+    Returns:
+        dict with a "kind" discriminator ("document" or "protocol")
+    """
+    return encoder_for(type(doc))(doc)
+
+
+def dumps_document(doc: ParsedDocument) -> str:
+    """Encode a parsed document as one compact JSON line."""
+    return _dumps(encoder_for(type(doc))(doc))
+
+
+# Compile the document schemas up front so the first export pays nothing
+for _cls in (EmojiInfo, MetadataBlock, Quote, Section, TableData, ParsedDocument, ProtocolDocument):
+    encoder_for(_cls)
+
+
+# ------------------------------------------------------------------ decoding
+
+class _SectionRecord(TypedDict):
+    title: str
+    level: int
+    start_line: int
+    end_line: int
+    emoji: Optional[str]
+    subsections: list[_SectionRecord]
+    start: int
+    end: Optional[int]
+
+
+class _TableRecord(TypedDict):
+    headers: list[str]
+    rows: list[list[str]]
+    start_line: int
+    end_line: int
+
+
+class _QuoteRecord(TypedDict):
+    text: str
+    attribution: Optional[str]
+    line_number: int
+
+
+class _EmojiRecord(TypedDict):
+    char: str
+    name: str
+    category: str
+    count: int
+    positions: list[int]
+
+
+class _MetadataRecord(TypedDict):
+    protocol_number: Optional[str]
+    category: Optional[str]
+    status: Optional[str]
+    discovery_date: Optional[str]
+    document_type: Optional[str]
+    raw_fields: dict[str, str]
+
+
+class _BaseRecord(TypedDict):
+    filepath: str
+    filename: str
+    content: str
+    title: Optional[str]
+    subtitle: Optional[str]
+    sections: list[_SectionRecord]
+    tables: list[_TableRecord]
+    quotes: list[_QuoteRecord]
+    emojis: list[_EmojiRecord]
+    word_count: int
+    line_count: int
+    minhash: NotRequired[list[int]]  # Absent from exports older than the field
+    parsed_at: datetime
+
+
+class _DocumentRecord(_BaseRecord):
+    kind: Literal["document"]
+
+
+class _ProtocolRecord(_BaseRecord):
+    kind: Literal["protocol"]
+    metadata: _MetadataRecord
+    protocol_number: Optional[int]
+    protocol_id: Optional[str]
+    category: Optional[str]
+    status: Optional[str]
+    discovery_date: Optional[str]
+    protocol_type: Optional[str]
+    emergent_observation: Optional[_SectionRecord]
+    conclusion: Optional[_SectionRecord]
+    checkmarks: list[str]
+    protocol_references: list[tuple[int, str]]
+    referenced_numbers: list[int]
+    footer_emojis: list[str]
+
+
+# Built (and its validator compiled) once, at import
+_record_adapter = TypeAdapter(
+    Annotated[Union[_DocumentRecord, _ProtocolRecord], Field(discriminator="kind")]
+)
+
+
+def _section(record: _SectionRecord, source: str) -> Section:
+    return Section(
+        title=record["title"],
+        level=record["level"],
+        source=source,
+        start_line=record["start_line"],
+        end_line=record["end_line"],
+        emoji=record["emoji"],
+        subsections=[_section(sub, source) for sub in record["subsections"]],
+        start=record["start"],
+        end=record["end"],
+    )
+
+
+def decode_document(record: dict) -> ParsedDocument:
+    """
+    Rebuild a document from a validated record (see encode_document).
+
+    Args:
+        record: Record produced by encode_document
+
+    Returns:
+        ParsedDocument or ProtocolDocument
+    """
+    content = record["content"]
+    common = dict(
+        filepath=Path(record["filepath"]),
+        filename=record["filename"],
+        content=content,
+        title=record["title"],
+        subtitle=record["subtitle"],
+        sections=[_section(s, content) for s in record["sections"]],
+        tables=[TableData(**t) for t in record["tables"]],
+        quotes=[Quote(**q) for q in record["quotes"]],
+        emojis=[EmojiInfo(**e) for e in record["emojis"]],
+        word_count=record["word_count"],
+        line_count=record["line_count"],
+        minhash=array("Q", record["minhash"]) if "minhash" in record else minhash_signature(content),
+        parsed_at=record["parsed_at"],
+    )
+    if record["kind"] == "document":
+        return ParsedDocument(**common)
+
+    emergent = record["emergent_observation"]
+    conclusion = record["conclusion"]
+    return ProtocolDocument(
+        **common,
+        metadata=MetadataBlock(**record["metadata"]),
+        protocol_number=record["protocol_number"],
+        protocol_id=record["protocol_id"],
+        category=record["category"],
+        status=record["status"],
+        discovery_date=record["discovery_date"],
+        protocol_type=record["protocol_type"],
+        emergent_observation=_section(emergent, content) if emergent else None,
+        conclusion=_section(conclusion, content) if conclusion else None,
+        checkmarks=record["checkmarks"],
+        protocol_references=record["protocol_references"],
+        referenced_numbers=array("I", record["referenced_numbers"]),
+        footer_emojis=record["footer_emojis"],
+    )
+
+
+def iter_corpus_ndjson(path: Path | str) -> Iterator[ParsedDocument]:
+    """
+    Load an NDJSON corpus export lazily, one record at a time.
+
+    Each line is validated and rebuilt only when the iterator reaches it,
+    so memory stays flat however many records the file holds.
+
+    Args:
+        path: File written by export_corpus_ndjson (gzip if it ends in ".gz")
+
+    Yields:
+        ParsedDocument or ProtocolDocument per record
+
+    Raises:
+        ValueError: If a line is not a valid corpus record
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    validate = _record_adapter.validate_json
+
+    with opener(path, "rb") as handle:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = validate(line)
+            except ValidationError as e:
+                raise ValueError(f"{path}:{line_number}: invalid corpus record\n{e}") from e
+            yield decode_document(record)
+
+
+def load_corpus_ndjson(path: Path | str) -> list[ParsedDocument]:
+    """
+    Load every record of an NDJSON corpus export.
+
+    Args:
+        path: File written by export_corpus_ndjson
+
+    Returns:
+        List of ParsedDocument / ProtocolDocument
+    """
+    return list(iter_corpus_ndjson(path))
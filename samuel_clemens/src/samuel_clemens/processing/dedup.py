@@ -0,0 +1,335 @@
+"""
+Near-Duplicate Detection - MinHash signatures and an LSH index.
+
+"There is no such thing as a new idea. It is impossible. We simply take a
+lot of old ideas and put them into a sort of mental kaleidoscope."
+— Mark Twain
+
+Each document (or section) is reduced to a fixed-size MinHash signature
+of its word 5-shingles, computed with one-permutation hashing: every
+shingle is hashed once, the hash picks one of NUM_PERMUTATIONS bins and
+each bin keeps its minimum. The fraction of equal bins between two
+signatures estimates the Jaccard similarity of their shingle sets.
+
+Signatures are split into bands and bucketed on each band (locality-
+sensitive hashing), so only documents sharing a whole band are compared:
+finding every near-duplicate pair takes time proportional to the corpus
+plus the candidates, not to every pair of documents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from samuel_clemens.processing.sections import walk_sections
+
+if TYPE_CHECKING:
+    from samuel_clemens.processing.parser import ParsedDocument
+    from samuel_clemens.processing.sections import Section
+
+
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 5  # Words per shingle
+
+# 16 bands of 4 rows: pairs at 0.8 similarity collide with probability
+# above 0.999, pairs at 0.3 with about 0.12 (then rejected on the estimate)
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+
+# Sections shorter than this are headings and boilerplate, not content
+MIN_SECTION_WORDS = 30
+
+_WORD = re.compile(r"\w+")
+_EMPTY = (1 << 64) - 1
+
+
+def minhash_signature(text: str, shingle_size: int = SHINGLE_SIZE) -> array:
+    """
+    Compute the MinHash signature of a text's word shingles.
+
+    Args:
+        text: Document or section text
+        shingle_size: Words per shingle
+
+    Returns:
+        array("Q") of NUM_PERMUTATIONS values (empty if the text has no words)
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return array("Q")
+
+    bins = [_EMPTY] * NUM_PERMUTATIONS
+    blake2b = hashlib.blake2b
+    from_bytes = int.from_bytes
+    for i in range(max(len(words) - shingle_size + 1, 1)):
+        shingle = " ".join(words[i:i + shingle_size]).encode("utf-8")
+        h = from_bytes(blake2b(shingle, digest_size=8).digest(), "little")
+        b, value = h % NUM_PERMUTATIONS, h // NUM_PERMUTATIONS
+        if value < bins[b]:
+            bins[b] = value
+
+    # Short texts leave bins empty: borrow from the next filled bin
+    # (circularly), offset by the distance so borrowed values stay distinct
+    if _EMPTY in bins:
+        filled = list(bins)
+        for b in range(NUM_PERMUTATIONS):
+            if filled[b] != _EMPTY:
+                continue
+            for distance in range(1, NUM_PERMUTATIONS):
+                value = filled[(b + distance) % NUM_PERMUTATIONS]
+                if value != _EMPTY:
+                    bins[b] = (value + distance * 0x9E3779B97F4A7C15) % _EMPTY
+                    break
+    return array("Q", bins)
+
+
+def estimate_similarity(first: array, second: array) -> float:
+    """
+    Estimate the Jaccard similarity of two signatures.
+
+    Args:
+        first: MinHash signature
+        second: MinHash signature
+
+    Returns:
+        Fraction of equal bins (0.0 if either signature is empty)
+    """
+    if not first or not second:
+        return 0.0
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERMUTATIONS
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hash index over MinHash signatures.
+
+    Usage:
+        index = LSHIndex()
+        for doc in documents:
+            index.add(doc.filename, doc.minhash)
+        for first, second, similarity in index.pairs(0.8):
+            ...
+    """
+
+    def __init__(self, bands: int = DEFAULT_BANDS):
+        if NUM_PERMUTATIONS % bands:
+            raise ValueError(f"bands must divide {NUM_PERMUTATIONS}, got {bands}")
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self.signatures: dict[Hashable, array] = {}
+        self.buckets: list[dict[bytes, list[Hashable]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: array) -> Iterator[bytes]:
+        rows = self.rows
+        for start in range(0, NUM_PERMUTATIONS, rows):
+            yield signature[start:start + rows].tobytes()
+
+    def add(self, key: Hashable, signature: array) -> bool:
+        """
+        Index a signature under a key.
+
+        Args:
+            key: Unique key (e.g. a filename)
+            signature: MinHash signature
+
+        Returns:
+            True if indexed (False for empty signatures or known keys)
+        """
+        if len(signature) != NUM_PERMUTATIONS or key in self.signatures:
+            return False
+        self.signatures[key] = signature
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            band.setdefault(band_key, []).append(key)
+        return True
+
+    def query(self, signature: array, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[Hashable, float]]:
+        """
+        Find indexed keys similar to a signature.
+
+        Args:
+            signature: MinHash signature
+            threshold: Minimum estimated similarity
+
+        Returns:
+            List of (key, similarity), most similar first
+        """
+        if len(signature) != NUM_PERMUTATIONS:
+            return []
+        candidates: dict[Hashable, None] = {}
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(dict.fromkeys(band.get(band_key, ())))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self.signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda m: -m[1])
+        return matches
+
+    def pairs(self, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[Hashable, Hashable, float]]:
+        """
+        Find every pair of indexed keys at or above a similarity.
+
+        Args:
+            threshold: Minimum estimated similarity
+
+        Returns:
+            List of (first, second, similarity) with first added before
+            second, most similar first
+        """
+        order = {key: i for i, key in enumerate(self.signatures)}
+        seen: set[tuple[int, int]] = set()
+        found = []
+        for band in self.buckets:
+            for keys in band.values():
+                if len(keys) < 2:
+                    continue
+                for i, first in enumerate(keys):
+                    for second in keys[i + 1:]:
+                        pair = (order[first], order[second])
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        similarity = estimate_similarity(
+                            self.signatures[first], self.signatures[second]
+                        )
+                        if similarity >= threshold:
+                            found.append((pair, first, second, similarity))
+        found.sort(key=lambda f: (-f[3], f[0]))
+        return [(first, second, similarity) for _, first, second, similarity in found]
+
+
+@dataclass
+class NearDuplicate:
+    """Two documents (or sections) with near-identical text."""
+    first: str  # Filename
+    second: str
+    similarity: float  # Estimated Jaccard similarity of word shingles
+    first_section: Optional[str] = None  # Section titles, for section pairs
+    second_section: Optional[str] = None
+
+
+@dataclass
+class DuplicateIndex:
+    """
+    Near-duplicate documents and sections of a corpus.
+
+    Usage:
+        duplicates = DuplicateIndex.from_documents(documents)
+        for pair in duplicates.documents:
+            print(pair.first, pair.second, pair.similarity)
+        kept = [d for d in documents if not duplicates.is_redundant(d)]
+    """
+    threshold: float = DEFAULT_THRESHOLD
+    documents: list[NearDuplicate] = field(default_factory=list)
+    sections: list[NearDuplicate] = field(default_factory=list)
+    redundant: dict[str, str] = field(default_factory=dict)  # Path -> kept filename
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: Iterable[ParsedDocument],
+        threshold: float = DEFAULT_THRESHOLD,
+        sections: bool = True,
+        min_section_words: int = MIN_SECTION_WORDS,
+        bands: int = DEFAULT_BANDS,
+    ) -> "DuplicateIndex":
+        """
+        Find near-duplicates among documents (using their parsed minhash).
+
+        Within each group of near-duplicate documents the first one, in
+        the given order, is kept and the others are marked redundant.
+
+        Args:
+            documents: Parsed documents
+            threshold: Minimum estimated similarity
+            sections: Also compare sections across documents
+            min_section_words: Ignore sections with fewer words
+            bands: LSH bands (more bands find less similar pairs)
+
+        Returns:
+            DuplicateIndex
+        """
+        documents = list(documents)
+        result = cls(threshold=threshold)
+
+        index = LSHIndex(bands)
+        by_path = {}
+        for doc in documents:
+            path = str(doc.filepath)
+            if index.add(path, doc.minhash):
+                by_path[path] = doc
+
+        # Union near-duplicates into groups rooted at their earliest member
+        order = {path: i for i, path in enumerate(by_path)}
+        root: dict[str, str] = {}
+
+        def find(path: str) -> str:
+            while root.get(path, path) != path:
+                path = root[path]
+            return path
+
+        for first, second, similarity in index.pairs(threshold):
+            result.documents.append(
+                NearDuplicate(by_path[first].filename, by_path[second].filename, similarity)
+            )
+            a, b = find(first), find(second)
+            if a != b:
+                if order[a] > order[b]:
+                    a, b = b, a
+                root[b] = a
+
+        for path in by_path:
+            kept = find(path)
+            if kept != path:
+                result.redundant[path] = by_path[kept].filename
+
+        if sections:
+            result.sections = _section_duplicates(documents, threshold, min_section_words, bands)
+        return result
+
+    def is_redundant(self, document: ParsedDocument) -> bool:
+        """True if a near-duplicate of the document comes earlier in the corpus."""
+        return str(document.filepath) in self.redundant
+
+    def unique(self, documents: Iterable[ParsedDocument]) -> list[ParsedDocument]:
+        """The documents that are not redundant, in order."""
+        return [doc for doc in documents if str(doc.filepath) not in self.redundant]
+
+
+def _section_duplicates(
+    documents: list[ParsedDocument],
+    threshold: float,
+    min_words: int,
+    bands: int,
+) -> list[NearDuplicate]:
+    """Near-duplicate sections of different documents."""
+    index = LSHIndex(bands)
+    owners: dict[tuple[int, int], tuple[ParsedDocument, Section]] = {}
+    for d, doc in enumerate(documents):
+        for s, section in enumerate(walk_sections(doc.sections)):
+            text = section.own_content
+            if len(_WORD.findall(text)) < min_words:
+                continue
+            key = (d, s)
+            if index.add(key, minhash_signature(text)):
+                owners[key] = (doc, section)
+
+    pairs = []
+    for first, second, similarity in index.pairs(threshold):
+        if first[0] == second[0]:
+            continue  # Repetition within one document is not redundancy
+        (doc_a, section_a), (doc_b, section_b) = owners[first], owners[second]
+        pairs.append(NearDuplicate(
+            doc_a.filename, doc_b.filename, similarity,
+            section_a.plain_title, section_b.plain_title,
+        ))
+    return pairs
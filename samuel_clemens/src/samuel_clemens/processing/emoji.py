@@ -10,9 +10,12 @@ from __future__ import annotations
 import re
 import unicodedata
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Iterable, Iterator, TYPE_CHECKING
 from collections import Counter
 
+if TYPE_CHECKING:
+    from samuel_clemens.processing.tokens import TokenStream
+
 
 @dataclass
 class EmojiInfo:
@@ -93,6 +96,16 @@ EMOJI_CATEGORIES = {
 }
 
 
+# Code point ranges for common emoji blocks
+_EMOJI_RANGES = [
+    (0x1F300, 0x1F9FF),  # Miscellaneous Symbols and Pictographs, Emoticons, etc.
+    (0x2600, 0x26FF),    # Miscellaneous Symbols
+    (0x2700, 0x27BF),    # Dingbats
+    (0x1F600, 0x1F64F),  # Emoticons
+    (0x1F680, 0x1F6FF),  # Transport and Map Symbols
+]
+
+
 def _is_emoji(char: str) -> bool:
     """Check if character is an emoji."""
     if len(char) == 0:
@@ -117,78 +130,107 @@ def _is_emoji(char: str) -> bool:
     
     # Check code point ranges for common emoji blocks
     code_point = ord(char[0])
-    emoji_ranges = [
-        (0x1F300, 0x1F9FF),  # Miscellaneous Symbols and Pictographs, Emoticons, etc.
-        (0x2600, 0x26FF),    # Miscellaneous Symbols
-        (0x2700, 0x27BF),    # Dingbats
-        (0x1F600, 0x1F64F),  # Emoticons
-        (0x1F680, 0x1F6FF),  # Transport and Map Symbols
-    ]
-    
-    for start, end in emoji_ranges:
+    for start, end in _EMOJI_RANGES:
         if start <= code_point <= end:
             return True
     
     return False
 
 
-def extract_emojis(text: str) -> list[EmojiInfo]:
+def _build_emoji_pattern() -> re.Pattern[str]:
     """
-    Extract all emojis from text with their positions.
+    Compile the emoji scanner.
+    
+    Known emojis (longest first, so variation-selector sequences win) and
+    the emoji code-point blocks match directly; any other non-ASCII char
+    is captured in the ``other`` group for the _is_emoji fallback.
+    """
+    known = sorted(EMOJI_CATEGORIES, key=len, reverse=True)
+    ranges = "".join(f"{chr(start)}-{chr(end)}" for start, end in _EMOJI_RANGES)
+    return re.compile(
+        "(?P<known>" + "|".join(re.escape(k) for k in known) + f"|[{ranges}])"
+        r"|(?P<other>[^\x00-\x7f])"
+    )
+
+
+_EMOJI_PATTERN = _build_emoji_pattern()
+
+# _is_emoji verdicts for non-ASCII chars outside the known set
+_OTHER_CHARS: dict[str, bool] = {}
+
+
+def _iter_emojis(text: str) -> Iterator[tuple[int, str]]:
+    """
+    Scan text for emojis, yielding (position, emoji) pairs in order.
     
     Args:
-        text: Text to analyze
+        text: Text to scan
         
-    Returns:
-        List of EmojiInfo objects
+    Yields:
+        Tuples of character offset and matched emoji
     """
+    for match in _EMOJI_PATTERN.finditer(text):
+        emoji = match.group("known")
+        if emoji is None:
+            emoji = match.group("other")
+            is_emoji = _OTHER_CHARS.get(emoji)
+            if is_emoji is None:
+                is_emoji = _OTHER_CHARS[emoji] = _is_emoji(emoji)
+            if not is_emoji:
+                continue
+        yield match.start(), emoji
+
+
+def _describe_emoji(emoji: str) -> tuple[str, str]:
+    """Get the (name, category) of an emoji."""
+    name_parts = EMOJI_CATEGORIES.get(emoji)
+    if name_parts:
+        return name_parts
+    try:
+        name = unicodedata.name(emoji[0], "unknown").lower()
+    except ValueError:
+        name = "unknown"
+    return name, "other"
+
+
+def _collect_emojis(matches: Iterable[tuple[int, str]]) -> list[EmojiInfo]:
+    """Group (position, emoji) pairs into EmojiInfo records."""
     emoji_dict: dict[str, EmojiInfo] = {}
     
-    # Handle multi-character emojis (like flag sequences)
-    # and variation selectors
-    i = 0
-    while i < len(text):
-        char = text[i]
+    for pos, emoji_found in matches:
+        if emoji_found in emoji_dict:
+            emoji_dict[emoji_found].count += 1
+            emoji_dict[emoji_found].positions.append(pos)
+            continue
         
-        # Check for multi-char emoji (up to 4 chars for complex emojis)
-        emoji_found = None
-        for length in range(4, 0, -1):
-            if i + length <= len(text):
-                candidate = text[i:i+length]
-                if candidate in EMOJI_CATEGORIES or (length == 1 and _is_emoji(candidate)):
-                    emoji_found = candidate
-                    break
-        
-        if emoji_found:
-            if emoji_found in emoji_dict:
-                emoji_dict[emoji_found].count += 1
-                emoji_dict[emoji_found].positions.append(i)
-            else:
-                # Get emoji info
-                name_parts = EMOJI_CATEGORIES.get(emoji_found, (None, None))
-                if name_parts[0]:
-                    name, category = name_parts
-                else:
-                    try:
-                        name = unicodedata.name(emoji_found[0], "unknown").lower()
-                    except ValueError:
-                        name = "unknown"
-                    category = "other"
-                
-                emoji_dict[emoji_found] = EmojiInfo(
-                    char=emoji_found,
-                    name=name,
-                    category=category,
-                    count=1,
-                    positions=[i],
-                )
-            i += len(emoji_found)
-        else:
-            i += 1
+        name, category = _describe_emoji(emoji_found)
+        emoji_dict[emoji_found] = EmojiInfo(
+            char=emoji_found,
+            name=name,
+            category=category,
+            count=1,
+            positions=[pos],
+        )
     
     return list(emoji_dict.values())
 
 
+def extract_emojis(text: str | TokenStream) -> list[EmojiInfo]:
+    """
+    Extract all emojis from text with their positions.
+    
+    Args:
+        text: Text to analyze, or a pre-built TokenStream
+        
+    Returns:
+        List of EmojiInfo objects
+    """
+    if isinstance(text, str):
+        return _collect_emojis(_iter_emojis(text))
+    
+    return _collect_emojis(text.emoji_matches())
+
+
 def count_emojis(text: str) -> int:
     """Count total emojis in text."""
     return sum(e.count for e in extract_emojis(text))
@@ -266,6 +308,37 @@ def get_emoji_categories() -> dict[str, list[str]]:
     return categories
 
 
+def _substitute_emojis(text: str, replacements: Optional[dict[str, str]], format: str) -> str:
+    """
+    Rebuild text with every emoji replaced, in one forward pass.
+    
+    Args:
+        text: Text with emojis
+        replacements: Memo of emoji -> replacement (None strips emojis)
+        format: 'brackets' for [emoji_name], 'colon' for :emoji_name:
+        
+    Returns:
+        Rebuilt text
+    """
+    parts = []
+    last = 0
+    for pos, emoji in _iter_emojis(text):
+        parts.append(text[last:pos])
+        if replacements is not None:
+            replacement = replacements.get(emoji)
+            if replacement is None:
+                name = _describe_emoji(emoji)[0]
+                replacement = f"[{name}]" if format == "brackets" else f":{name}:"
+                replacements[emoji] = replacement
+            parts.append(replacement)
+        last = pos + len(emoji)
+    
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return "".join(parts)
+
+
 def replace_emojis_with_text(text: str, format: str = "brackets") -> str:
     """
     Replace all emojis with text descriptions.
@@ -277,41 +350,45 @@ def replace_emojis_with_text(text: str, format: str = "brackets") -> str:
     Returns:
         Text with emojis replaced
     """
-    emojis = extract_emojis(text)
-    
-    # Sort by position descending to maintain positions
-    all_positions = []
-    for emoji in emojis:
-        for pos in emoji.positions:
-            all_positions.append((pos, len(emoji.char), emoji.name))
-    
-    all_positions.sort(key=lambda x: -x[0])
-    
-    result = text
-    for pos, length, name in all_positions:
-        if format == "brackets":
-            replacement = f"[{name}]"
-        else:
-            replacement = f":{name}:"
-        result = result[:pos] + replacement + result[pos+length:]
-    
-    return result
+    return _substitute_emojis(text, {}, format)
 
 
 def strip_emojis(text: str) -> str:
     """Remove all emojis from text."""
-    emojis = extract_emojis(text)
-    
-    # Sort by position descending
-    all_positions = []
-    for emoji in emojis:
-        for pos in emoji.positions:
-            all_positions.append((pos, len(emoji.char)))
+    return _substitute_emojis(text, None, "brackets")
+
+
+def iter_replace_emojis_with_text(
+    source: Iterable[str],
+    format: str = "brackets",
+) -> Iterator[str]:
+    """
+    Replace emojis chunk by chunk, for file-like inputs.
     
-    all_positions.sort(key=lambda x: -x[0])
+    Emojis never span a newline, so any input iterated by lines (such as
+    an open text file) is converted exactly, in constant memory.
     
-    result = text
-    for pos, length in all_positions:
-        result = result[:pos] + result[pos+length:]
+    Args:
+        source: Iterable of text lines (e.g. an open file)
+        format: 'brackets' for [emoji_name], 'colon' for :emoji_name:
+        
+    Yields:
+        Converted lines
+    """
+    replacements: dict[str, str] = {}
+    for line in source:
+        yield _substitute_emojis(line, replacements, format)
+
+
+def iter_strip_emojis(source: Iterable[str]) -> Iterator[str]:
+    """
+    Remove emojis chunk by chunk, for file-like inputs.
     
-    return result
+    Args:
+        source: Iterable of text lines (e.g. an open file)
+        
+    Yields:
+        Lines without emojis
+    """
+    for line in source:
+        yield _substitute_emojis(line, None, "brackets")
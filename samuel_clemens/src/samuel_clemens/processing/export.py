@@ -7,14 +7,23 @@ when I hate them." — Mark Twain
 
 from __future__ import annotations
 
+import gzip
 import json
-from dataclasses import asdict
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Iterable
 from datetime import datetime
 
+from samuel_clemens.processing.codec import dumps_document, encoder_for
+from samuel_clemens.processing.dedup import DuplicateIndex
 from samuel_clemens.processing.parser import ParsedDocument, ProtocolDocument
 from samuel_clemens.processing.emoji import EmojiInfo, analyze_emoji_usage
+from samuel_clemens.processing.graph import ReferenceGraph
+from samuel_clemens.processing.stats import CorpusStats
+
+
+# Dataclasses with field types the codec has no encoder for
+_UNENCODABLE: set[type] = set()
 
 
 def _serialize_for_json(obj: Any) -> Any:
@@ -23,6 +32,12 @@ def _serialize_for_json(obj: Any) -> Any:
         return str(obj)
     if isinstance(obj, datetime):
         return obj.isoformat()
+    if is_dataclass(obj) and not isinstance(obj, type) and type(obj) not in _UNENCODABLE:
+        try:
+            return encoder_for(type(obj))(obj)
+        except TypeError:
+            # A field type the codec cannot compile: walk the fields instead
+            _UNENCODABLE.add(type(obj))
     if hasattr(obj, "__dict__"):
         return {k: _serialize_for_json(v) for k, v in obj.__dict__.items()}
     if isinstance(obj, list):
@@ -227,10 +242,50 @@ def export_to_json(
     return output_path
 
 
+def export_corpus_ndjson(
+    documents: Iterable[ParsedDocument | ProtocolDocument],
+    output_path: Path | str,
+    compress: Optional[bool] = None,
+) -> Path:
+    """
+    Export documents as NDJSON: one full JSON record per line.
+    
+    Records are encoded and written one at a time, so memory stays flat
+    when documents come from a generator such as iter_parse_folder.
+    
+    Args:
+        documents: Documents to export (any iterable)
+        output_path: Output file path
+        compress: Write gzip (default: when the path ends in ".gz")
+        
+    Returns:
+        Path to created file
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if compress is None:
+        compress = output_path.suffix == ".gz"
+    
+    if compress:
+        handle = gzip.open(output_path, "wt", encoding="utf-8", compresslevel=1)
+    else:
+        handle = open(output_path, "w", encoding="utf-8")
+    
+    with handle:
+        write = handle.write
+        for doc in documents:
+            write(dumps_document(doc))
+            write("\n")
+    
+    return output_path
+
+
 def export_folder_summary(
     documents: list[ParsedDocument | ProtocolDocument],
     output_path: Path | str,
     format: str = "markdown",
+    stats: Optional[CorpusStats] = None,
 ) -> Path:
     """
     Export summary of all documents in a folder.
@@ -239,6 +294,7 @@ def export_folder_summary(
         documents: List of parsed documents
         output_path: Output file path
         format: 'markdown' or 'json'
+        stats: Precollected stats of the documents (collected if None)
         
     Returns:
         Path to created file
@@ -246,21 +302,24 @@ def export_folder_summary(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    if stats is None:
+        stats = CorpusStats.from_documents(documents)
+    
     if format == "json":
         data = {
-            "total_documents": len(documents),
-            "total_words": sum(d.word_count for d in documents),
-            "total_lines": sum(d.line_count for d in documents),
-            "total_emojis": sum(d.emoji_count for d in documents),
+            "total_documents": len(stats),
+            "total_words": stats.total_words,
+            "total_lines": stats.total_lines,
+            "total_emojis": stats.total_emojis,
             "documents": [
                 {
                     "filename": d.filename,
                     "title": d.title,
                     "word_count": d.word_count,
                     "emoji_count": d.emoji_count,
-                    "protocol_number": d.protocol_number if isinstance(d, ProtocolDocument) else None,
+                    "protocol_number": d.protocol_number,
                 }
-                for d in documents
+                for d in stats.documents
             ],
         }
         output_path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
@@ -269,16 +328,16 @@ def export_folder_summary(
         lines.append("# Document Summary")
         lines.append("")
         lines.append(f"**Generated:** {datetime.now().isoformat()}")
-        lines.append(f"**Total Documents:** {len(documents)}")
-        lines.append(f"**Total Words:** {sum(d.word_count for d in documents):,}")
-        lines.append(f"**Total Emojis:** {sum(d.emoji_count for d in documents):,}")
+        lines.append(f"**Total Documents:** {len(stats)}")
+        lines.append(f"**Total Words:** {stats.total_words:,}")
+        lines.append(f"**Total Emojis:** {stats.total_emojis:,}")
         lines.append("")
         
         # Table
         lines.append("| # | File | Title | Words | Emojis |")
         lines.append("|---|------|-------|-------|--------|")
         
-        for i, doc in enumerate(documents, 1):
+        for i, doc in enumerate(stats.documents, 1):
             title = (doc.title or "")[:40]
             lines.append(f"| {i} | `{doc.filename}` | {title} | {doc.word_count:,} | {doc.emoji_count} |")
         
@@ -291,6 +350,7 @@ def export_folder_summary(
 def export_emoji_report(
     documents: list[ParsedDocument | ProtocolDocument],
     output_path: Path | str,
+    stats: Optional[CorpusStats] = None,
 ) -> Path:
     """
     Export emoji usage report across all documents.
@@ -298,6 +358,7 @@ def export_emoji_report(
     Args:
         documents: List of parsed documents
         output_path: Output file path
+        stats: Precollected stats of the documents (collected if None)
         
     Returns:
         Path to created file
@@ -305,31 +366,16 @@ def export_emoji_report(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Aggregate emoji data
-    emoji_totals: dict[str, dict] = {}
-    
-    for doc in documents:
-        for emoji in doc.emojis:
-            if emoji.char not in emoji_totals:
-                emoji_totals[emoji.char] = {
-                    "name": emoji.name,
-                    "category": emoji.category,
-                    "count": 0,
-                    "documents": [],
-                }
-            emoji_totals[emoji.char]["count"] += emoji.count
-            emoji_totals[emoji.char]["documents"].append(doc.filename)
-    
-    # Sort by count
-    sorted_emojis = sorted(emoji_totals.items(), key=lambda x: -x[1]["count"])
+    if stats is None:
+        stats = CorpusStats.from_documents(documents)
     
     lines = []
     lines.append("# Emoji Usage Report")
     lines.append("")
     lines.append(f"**Generated:** {datetime.now().isoformat()}")
-    lines.append(f"**Documents Analyzed:** {len(documents)}")
-    lines.append(f"**Unique Emojis:** {len(emoji_totals)}")
-    lines.append(f"**Total Emoji Uses:** {sum(e['count'] for e in emoji_totals.values()):,}")
+    lines.append(f"**Documents Analyzed:** {len(stats)}")
+    lines.append(f"**Unique Emojis:** {len(stats.emojis)}")
+    lines.append(f"**Total Emoji Uses:** {stats.total_emoji_uses:,}")
     lines.append("")
     
     # Table
@@ -338,9 +384,10 @@ def export_emoji_report(
     lines.append("| Emoji | Name | Category | Count | Documents |")
     lines.append("|-------|------|----------|-------|-----------|")
     
-    for emoji_char, data in sorted_emojis[:50]:
-        doc_count = len(set(data["documents"]))
-        lines.append(f"| {emoji_char} | {data['name']} | {data['category']} | {data['count']} | {doc_count} |")
+    for tally in stats.top_emojis(50):
+        lines.append(
+            f"| {tally.char} | {tally.name} | {tally.category} | {tally.count} | {len(tally.documents)} |"
+        )
     
     lines.append("")
     
@@ -348,12 +395,7 @@ def export_emoji_report(
     lines.append("## By Category")
     lines.append("")
     
-    category_counts: dict[str, int] = {}
-    for data in emoji_totals.values():
-        cat = data["category"]
-        category_counts[cat] = category_counts.get(cat, 0) + data["count"]
-    
-    for cat, count in sorted(category_counts.items(), key=lambda x: -x[1]):
+    for cat, count in stats.emoji_categories().items():
         lines.append(f"- **{cat}:** {count:,}")
     
     lines.append("")
@@ -365,6 +407,9 @@ def export_emoji_report(
 def export_structure_analysis(
     documents: list[ParsedDocument | ProtocolDocument],
     output_path: Path | str,
+    graph: Optional[ReferenceGraph] = None,
+    stats: Optional[CorpusStats] = None,
+    duplicates: Optional[DuplicateIndex] = None,
 ) -> Path:
     """
     Export document structure analysis.
@@ -372,6 +417,10 @@ def export_structure_analysis(
     Args:
         documents: List of parsed documents
         output_path: Output file path
+        graph: Prebuilt reference graph (built from the protocols if None)
+        stats: Precollected stats of the documents (collected if None)
+        duplicates: Near-duplicates to report, possibly found over a wider
+            corpus (found among the documents if None)
         
     Returns:
         Path to created file
@@ -379,29 +428,25 @@ def export_structure_analysis(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    if stats is None:
+        stats = CorpusStats.from_documents(documents)
+    
     lines = []
     lines.append("# Document Structure Analysis")
     lines.append("")
     lines.append(f"**Generated:** {datetime.now().isoformat()}")
-    lines.append(f"**Documents:** {len(documents)}")
+    lines.append(f"**Documents:** {len(stats)}")
     lines.append("")
     
     # Common section patterns
-    all_sections: dict[str, int] = {}
-    for doc in documents:
-        for section in doc.sections:
-            # Normalize title
-            title = section.plain_title.upper()
-            all_sections[title] = all_sections.get(title, 0) + 1
-    
     lines.append("## Common Section Titles")
     lines.append("")
-    for title, count in sorted(all_sections.items(), key=lambda x: -x[1])[:20]:
+    for title, count in stats.common_sections(20):
         lines.append(f"- **{title}**: {count} documents")
     lines.append("")
     
     # Protocol-specific analysis
-    protocol_docs = [d for d in documents if isinstance(d, ProtocolDocument)]
+    protocol_docs = stats.protocols
     if protocol_docs:
         lines.append("## Protocol Analysis")
         lines.append("")
@@ -428,10 +473,69 @@ def export_structure_analysis(
         lines.append("## Protocol Cross-References")
         lines.append("")
         for doc in protocol_docs[:10]:
-            if doc.protocol_references:
-                refs = ", ".join(f"P{n}" for n, _ in doc.protocol_references[:5])
+            if doc.referenced_numbers:
+                refs = ", ".join(f"P{n}" for n in doc.referenced_numbers[:5])
                 lines.append(f"- **{doc.protocol_id}** references: {refs}")
         lines.append("")
+        
+        # Reference graph
+        if graph is None:
+            graph = ReferenceGraph.from_documents(protocol_docs)
+        if graph.edge_count:
+            lines.append("## Reference Graph")
+            lines.append("")
+            lines.append(f"**Protocols:** {len(graph)} ({len(graph.documented)} documented)")
+            lines.append(f"**References:** {graph.edge_count}")
+            lines.append("")
+            
+            lines.append("### Most Central (PageRank)")
+            lines.append("")
+            ranks = graph.pagerank()
+            for number, rank in sorted(ranks.items(), key=lambda x: (-x[1], x[0]))[:10]:
+                lines.append(f"- **P{number}**: {rank:.4f}")
+            lines.append("")
+            
+            lines.append("### Most Referenced")
+            lines.append("")
+            degrees = graph.in_degree()
+            for number, degree in sorted(degrees.items(), key=lambda x: (-x[1], x[0]))[:10]:
+                lines.append(f"- **P{number}**: referenced by {degree} protocols")
+            lines.append("")
+            
+            cycles = [c for c in graph.strongly_connected_components() if len(c) > 1]
+            if cycles:
+                lines.append("### Reference Cycles")
+                lines.append("")
+                for component in cycles:
+                    lines.append(f"- {' ↔ '.join(f'P{n}' for n in component)}")
+                lines.append("")
+    
+    # Near-duplicate documents and sections (MinHash/LSH)
+    if duplicates is None:
+        duplicates = DuplicateIndex.from_documents(documents)
+    lines.append("## Near-Duplicates")
+    lines.append("")
+    lines.append(f"**Similarity Threshold:** {duplicates.threshold:.0%} (estimated shingle overlap)")
+    lines.append("")
+    lines.append("### Documents")
+    lines.append("")
+    if duplicates.documents:
+        for pair in duplicates.documents:
+            lines.append(f"- **{pair.first}** ≈ **{pair.second}** ({pair.similarity:.0%})")
+    else:
+        lines.append("No near-duplicate documents.")
+    lines.append("")
+    if duplicates.sections:
+        lines.append("### Sections")
+        lines.append("")
+        for pair in duplicates.sections[:20]:
+            lines.append(
+                f"- {pair.first} › **{pair.first_section}** ≈ "
+                f"{pair.second} › **{pair.second_section}** ({pair.similarity:.0%})"
+            )
+        if len(duplicates.sections) > 20:
+            lines.append(f"  ... and {len(duplicates.sections) - 20} more")
+        lines.append("")
     
     output_path.write_text("\n".join(lines), encoding="utf-8")
     
@@ -441,6 +545,7 @@ def export_structure_analysis(
 def export_protocol_index(
     protocols: list[ProtocolDocument],
     output_path: Path | str,
+    stats: Optional[CorpusStats] = None,
 ) -> Path:
     """
     Export a protocol index with links and metadata.
@@ -448,6 +553,7 @@ def export_protocol_index(
     Args:
         protocols: List of protocol documents
         output_path: Output file path
+        stats: Precollected stats of the protocols (collected if None)
         
     Returns:
         Path to created file
@@ -455,8 +561,11 @@ def export_protocol_index(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    if stats is None:
+        stats = CorpusStats.from_documents(protocols)
+    
     # Sort by protocol number
-    protocols = sorted(protocols, key=lambda p: p.protocol_number or 0)
+    protocols = sorted(stats.protocols, key=lambda p: p.protocol_number or 0)
     
     lines = []
     lines.append("# Protocol Index")
@@ -486,13 +595,18 @@ def export_protocol_index(
     # Full table
     lines.append("## Full Index")
     lines.append("")
-    lines.append("| P# | Title | Category | Status |")
-    lines.append("|---|-------|----------|--------|")
+    lines.append("| P# | Title | Category | Status | References |")
+    lines.append("|---|-------|----------|--------|------------|")
     
     for p in protocols:
         status = "✅" if p.is_operational else "⚠️"
         title = (p.title or "")[:50]
-        lines.append(f"| {p.protocol_number} | {title} | {p.category or '-'} | {status} |")
+        # Parsed reference numbers, minus the protocol's own title mention
+        refs = [n for n in p.referenced_numbers if n != p.protocol_number]
+        ref_text = ", ".join(f"P{n}" for n in refs[:5]) or "-"
+        if len(refs) > 5:
+            ref_text += f" (+{len(refs) - 5})"
+        lines.append(f"| {p.protocol_number} | {title} | {p.category or '-'} | {status} | {ref_text} |")
     
     lines.append("")
     output_path.write_text("\n".join(lines), encoding="utf-8")
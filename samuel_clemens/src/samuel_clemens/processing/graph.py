@@ -0,0 +1,438 @@
+"""
+Reference Graph - Protocol-to-protocol reference graph in CSR form.
+
+"The best way to cheer yourself up is to try to cheer somebody else up."
+— Mark Twain
+
+Nodes are protocol numbers; an edge A -> B means protocol A references
+protocol B. Adjacency is stored compressed-sparse-row style in flat
+``array`` buffers, once for outgoing and once for incoming edges, so
+every query is a linear sweep over contiguous integers rather than a
+walk over per-node Python containers.
+
+The graph is persisted together with a signature of its inputs; when
+the signature of the current corpus matches, the stored graph (and any
+centrality already computed on it) is reused instead of rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+from samuel_clemens.processing.parser import ProtocolDocument
+from samuel_clemens.utils.io import load_versioned, save_versioned, store_path
+
+
+# Bump whenever the stored graph layout changes
+GRAPH_VERSION = 1
+
+DEFAULT_GRAPH_FILENAME = "reference_graph.bin"
+
+
+def _build_csr(n_nodes: int, edges: list[tuple[int, int]]) -> tuple[array, array]:
+    """Build (indptr, indices) for edges sorted by source then target."""
+    indptr = array("I", [0]) * (n_nodes + 1)
+    for source, _ in edges:
+        indptr[source + 1] += 1
+    for i in range(n_nodes):
+        indptr[i + 1] += indptr[i]
+    indices = array("I", (target for _, target in edges))
+    return indptr, indices
+
+
+def graph_signature(documents: Iterable[ProtocolDocument]) -> str:
+    """
+    Hash the graph inputs (protocol numbers and their references).
+
+    Args:
+        documents: Parsed protocols
+
+    Returns:
+        Hex digest that changes whenever any document's edges change
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    rows = sorted(
+        (doc.protocol_number, doc.referenced_numbers.tobytes())
+        for doc in documents
+        if doc.protocol_number is not None
+    )
+    for number, refs in rows:
+        digest.update(number.to_bytes(4, "little"))
+        digest.update(len(refs).to_bytes(4, "little"))
+        digest.update(refs)
+    return digest.hexdigest()
+
+
+class ReferenceGraph:
+    """
+    Directed reference graph over protocol numbers.
+
+    Usage:
+        graph = ReferenceGraph.from_documents(protocols)
+        graph.pagerank()[95]
+        graph.upstream(95)           # Everything P95 builds on
+        graph.shortest_path(95, 73)  # [95, ..., 73]
+    """
+
+    def __init__(
+        self,
+        nodes: array,
+        documented: set[int],
+        out_indptr: array,
+        out_indices: array,
+        signature: str = "",
+    ):
+        self.nodes = nodes  # Sorted protocol numbers
+        self.node_ids = {number: i for i, number in enumerate(nodes)}
+        self.documented = documented  # Numbers with a parsed document
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.signature = signature
+
+        # Incoming adjacency is the transpose of the outgoing one
+        edges = sorted(
+            (target, source)
+            for source in range(len(nodes))
+            for target in out_indices[out_indptr[source]:out_indptr[source + 1]]
+        )
+        self.in_indptr, self.in_indices = _build_csr(len(nodes), edges)
+
+        self._computed: dict[str, object] = {}
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[ProtocolDocument]) -> "ReferenceGraph":
+        """
+        Build the graph from parsed protocols.
+
+        Documents without a protocol number cannot be referenced by number
+        and are skipped. Referenced numbers without a document become
+        nodes too, so upstream queries still reach them. Self-references
+        (a protocol's own title) are not edges.
+
+        Args:
+            documents: Parsed protocols
+
+        Returns:
+            ReferenceGraph
+        """
+        documents = [doc for doc in documents if doc.protocol_number is not None]
+
+        numbers = set()
+        for doc in documents:
+            numbers.add(doc.protocol_number)
+            numbers.update(doc.referenced_numbers)
+        nodes = array("I", sorted(numbers))
+        node_ids = {number: i for i, number in enumerate(nodes)}
+
+        # Documents sharing a number merge their references
+        edge_set = set()
+        for doc in documents:
+            source = node_ids[doc.protocol_number]
+            for number in doc.referenced_numbers:
+                if number != doc.protocol_number:
+                    edge_set.add((source, node_ids[number]))
+
+        out_indptr, out_indices = _build_csr(len(nodes), sorted(edge_set))
+        return cls(
+            nodes=nodes,
+            documented={doc.protocol_number for doc in documents},
+            out_indptr=out_indptr,
+            out_indices=out_indices,
+            signature=graph_signature(documents),
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_indices)
+
+    def _id(self, number: int) -> int:
+        try:
+            return self.node_ids[number]
+        except KeyError:
+            raise KeyError(f"Protocol {number} is not in the reference graph") from None
+
+    def references(self, number: int) -> list[int]:
+        """Get the protocols a protocol references directly."""
+        i = self._id(number)
+        return [self.nodes[j] for j in self.out_indices[self.out_indptr[i]:self.out_indptr[i + 1]]]
+
+    def referenced_by(self, number: int) -> list[int]:
+        """Get the protocols that reference a protocol directly."""
+        i = self._id(number)
+        return [self.nodes[j] for j in self.in_indices[self.in_indptr[i]:self.in_indptr[i + 1]]]
+
+    # ------------------------------------------------------------- centrality
+
+    def in_degree(self) -> dict[int, int]:
+        """Get how many protocols reference each protocol."""
+        indptr = self.in_indptr
+        return {number: indptr[i + 1] - indptr[i] for i, number in enumerate(self.nodes)}
+
+    def pagerank(
+        self,
+        damping: float = 0.85,
+        tolerance: float = 1e-10,
+        max_iterations: int = 100,
+    ) -> dict[int, float]:
+        """
+        Rank protocols by PageRank over the reference edges.
+
+        Rank of dangling protocols (no outgoing references) is spread
+        evenly over all nodes. Results are cached per parameter set and
+        persisted with the graph.
+
+        Args:
+            damping: Probability of following a reference
+            tolerance: L1 change at which iteration stops
+            max_iterations: Iteration cap
+
+        Returns:
+            Protocol number -> rank (ranks sum to 1)
+        """
+        key = f"pagerank:{damping}:{tolerance}:{max_iterations}"
+        if key in self._computed:
+            return self._computed[key]
+
+        n = len(self.nodes)
+        if n == 0:
+            return {}
+
+        out_indptr, in_indptr, in_indices = self.out_indptr, self.in_indptr, self.in_indices
+        out_degree = [out_indptr[i + 1] - out_indptr[i] for i in range(n)]
+        dangling = [i for i in range(n) if out_degree[i] == 0]
+        ranks = [1.0 / n] * n
+
+        for _ in range(max_iterations):
+            share = [
+                rank / degree if degree else 0.0
+                for rank, degree in zip(ranks, out_degree)
+            ]
+            base = (1.0 - damping) / n + damping * sum(ranks[i] for i in dangling) / n
+            new_ranks = [
+                base + damping * sum(share[j] for j in in_indices[in_indptr[i]:in_indptr[i + 1]])
+                for i in range(n)
+            ]
+            change = sum(abs(a - b) for a, b in zip(new_ranks, ranks))
+            ranks = new_ranks
+            if change < tolerance:
+                break
+
+        result = dict(zip(self.nodes, ranks))
+        self._computed[key] = result
+        return result
+
+    # --------------------------------------------------------------- structure
+
+    def strongly_connected_components(self) -> list[list[int]]:
+        """
+        Find groups of protocols that (transitively) reference each other.
+
+        Iterative Tarjan, so deep reference chains cannot overflow the
+        recursion limit.
+
+        Returns:
+            Components as sorted protocol numbers, largest first
+        """
+        if "scc" in self._computed:
+            return self._computed["scc"]
+
+        n = len(self.nodes)
+        indptr, indices = self.out_indptr, self.out_indices
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, indptr[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, edge = work[-1]
+                if edge < indptr[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    child = indices[edge]
+                    if index[child] == -1:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        work.append((child, indptr[child]))
+                    elif on_stack[child]:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(self.nodes[member])
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        components.sort(key=lambda c: (-len(c), c[0]))
+        self._computed["scc"] = components
+        return components
+
+    def _reachable(self, number: int, indptr: array, indices: array) -> list[int]:
+        start = self._id(number)
+        seen = bytearray(len(self.nodes))
+        seen[start] = 1
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbour in indices[indptr[node]:indptr[node + 1]]:
+                    if not seen[neighbour]:
+                        seen[neighbour] = 1
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        seen[start] = 0
+        return [self.nodes[i] for i in range(len(seen)) if seen[i]]
+
+    def upstream(self, number: int) -> list[int]:
+        """
+        Get everything a protocol builds on, directly or transitively.
+
+        Args:
+            number: Protocol number
+
+        Returns:
+            Sorted protocol numbers reachable along references
+        """
+        return self._reachable(number, self.out_indptr, self.out_indices)
+
+    def downstream(self, number: int) -> list[int]:
+        """
+        Get every protocol that builds on a protocol, directly or transitively.
+
+        Args:
+            number: Protocol number
+
+        Returns:
+            Sorted protocol numbers that reach it along references
+        """
+        return self._reachable(number, self.in_indptr, self.in_indices)
+
+    def shortest_path(self, source: int, target: int) -> Optional[list[int]]:
+        """
+        Find the shortest reference chain between two protocols.
+
+        Args:
+            source: Protocol number to start from
+            target: Protocol number to reach
+
+        Returns:
+            Protocol numbers from source to target, or None if unreachable
+        """
+        start, goal = self._id(source), self._id(target)
+        parent = array("i", [-1]) * len(self.nodes)
+        parent[start] = start
+        queue = deque([start])
+        indptr, indices = self.out_indptr, self.out_indices
+
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return [self.nodes[i] for i in reversed(path)]
+            for neighbour in indices[indptr[node]:indptr[node + 1]]:
+                if parent[neighbour] == -1:
+                    parent[neighbour] = node
+                    queue.append(neighbour)
+        return None
+
+    # ------------------------------------------------------------ persistence
+
+    def save(self, path: Path | str) -> Path:
+        """
+        Write the graph (and cached centrality) to disk.
+
+        Args:
+            path: Graph file, or a directory for the default filename
+
+        Returns:
+            Path written
+        """
+        payload = {
+            "signature": self.signature,
+            "nodes": self.nodes,
+            "documented": self.documented,
+            "out_indptr": self.out_indptr,
+            "out_indices": self.out_indices,
+            "computed": self._computed,
+        }
+        return save_versioned(store_path(path, DEFAULT_GRAPH_FILENAME), GRAPH_VERSION, payload)
+
+    @classmethod
+    def load(cls, path: Path | str) -> Optional["ReferenceGraph"]:
+        """
+        Read a saved graph.
+
+        Args:
+            path: Graph file, or a directory holding the default filename
+
+        Returns:
+            ReferenceGraph, or None if missing, unreadable or outdated
+        """
+        payload = load_versioned(store_path(path, DEFAULT_GRAPH_FILENAME), GRAPH_VERSION)
+        if payload is None:
+            return None
+
+        graph = cls(
+            nodes=payload["nodes"],
+            documented=payload["documented"],
+            out_indptr=payload["out_indptr"],
+            out_indices=payload["out_indices"],
+            signature=payload["signature"],
+        )
+        graph._computed = payload.get("computed", {})
+        return graph
+
+
+def load_reference_graph(
+    documents: list[ProtocolDocument],
+    path: Path | str,
+) -> ReferenceGraph:
+    """
+    Load the stored graph, rebuilding it only if any document changed.
+
+    Args:
+        documents: Current parsed protocols
+        path: Graph file, or a directory for the default filename
+
+    Returns:
+        ReferenceGraph matching the documents
+    """
+    stored = ReferenceGraph.load(path)
+    if stored is not None and stored.signature == graph_signature(documents):
+        return stored
+
+    graph = ReferenceGraph.from_documents(documents)
+    # Computed before saving so the stored graph carries its centrality
+    graph.pagerank()
+    graph.strongly_connected_components()
+    graph.save(path)
+    return graph
@@ -5,20 +5,32 @@ Obsidian Export - Generate Obsidian-compatible markdown with [[wikilinks]].
 
 Features:
 - [[Wikilink]] style internal links
-- Entity cross-referencing
-- Backlink tracking
+- Entity cross-referencing (one compiled scan for any number of entities)
+- Backlink index, updated as pages are added
 - Vault structure with folders
+- Incremental export: only new or changed pages are written
 """
 
 from __future__ import annotations
 
+import hashlib
 import re
+import warnings
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Iterator
+from typing import Optional, Iterable, Iterator
 from datetime import datetime
 
+from samuel_clemens.processing.dedup import DuplicateIndex
 from samuel_clemens.processing.parser import ParsedDocument, ProtocolDocument
+from samuel_clemens.processing.related import RelatedIndex, RelatedProtocol
+from samuel_clemens.utils.io import BulkWriter, load_versioned, save_versioned
+
+
+# Bump whenever the manifest layout changes
+VAULT_MANIFEST_VERSION = 1
+
+DEFAULT_MANIFEST_FILENAME = ".vault_manifest.bin"
 
 
 @dataclass
@@ -43,14 +55,24 @@ class ObsidianPage:
     outgoing_links: list[WikiLink] = field(default_factory=list)
     tags: list[str] = field(default_factory=list)
     
-    def render(self) -> str:
-        """Render page with YAML frontmatter."""
+    def render(
+        self,
+        created: Optional[str] = None,
+        backlinks: Optional[Iterable[str]] = None,
+    ) -> str:
+        """
+        Render page with YAML frontmatter.
+        
+        Args:
+            created: ISO timestamp for the created field (now if None)
+            backlinks: Names of the pages linking here, listed at the end
+        """
         lines = []
         
         # YAML frontmatter
         lines.append("---")
         lines.append(f"title: \"{self.title}\"")
-        lines.append(f"created: {datetime.now().isoformat()}")
+        lines.append(f"created: {created or datetime.now().isoformat()}")
         
         if self.tags:
             lines.append(f"tags: [{', '.join(self.tags)}]")
@@ -65,48 +87,168 @@ class ObsidianPage:
         lines.append("")
         lines.append(self.content)
         
+        if backlinks:
+            lines.append("")
+            lines.append("## Backlinks")
+            lines.append("")
+            for name in backlinks:
+                lines.append(f"- [[{name}]]")
+        
         return "\n".join(lines)
 
 
+@dataclass
+class _ManifestEntry:
+    """An exported page, as last written."""
+    digest: bytes  # blake2b of the rendered page
+    created: str  # ISO timestamp of the first export
+    size: int
+    mtime_ns: int
+
+
+def _page_name(page_path: str) -> str:
+    """Link name of a page path ("Protocols/Protocol_92.md" -> "Protocol_92")."""
+    return page_path.rsplit("/", 1)[-1].removesuffix(".md")
+
+
 @dataclass
 class ObsidianVault:
-    """An Obsidian vault structure."""
+    """
+    An Obsidian vault structure.
+    
+    Pages are indexed by their outgoing links as they are added, so the
+    pages linking to any page are a lookup rather than a scan of the vault.
+    Add pages complete: links appended to a page after add_page are not
+    indexed.
+    """
     name: str
     root_path: Path
     pages: dict[str, ObsidianPage] = field(default_factory=dict)
+    # Link target -> paths of the pages linking to it (dict as ordered set)
+    backlinks: dict[str, dict[str, None]] = field(default_factory=dict, repr=False)
+    
+    def __post_init__(self) -> None:
+        for page_path, page in self.pages.items():
+            self._index_links(page_path, page)
+    
+    def _index_links(self, page_path: str, page: ObsidianPage) -> None:
+        for link in page.outgoing_links:
+            self.backlinks.setdefault(link.target, {})[page_path] = None
     
     def add_page(self, page: ObsidianPage, folder: str = "") -> None:
-        """Add a page to the vault."""
+        """Add a page to the vault (replacing any page at the same path)."""
         key = f"{folder}/{page.filename}" if folder else page.filename
+        if key in self.pages:
+            self.remove_page(key)
         self.pages[key] = page
+        self._index_links(key, page)
+    
+    def remove_page(self, page_path: str) -> Optional[ObsidianPage]:
+        """Remove a page and its links; returns it (None if absent)."""
+        page = self.pages.pop(page_path, None)
+        if page is not None:
+            for link in page.outgoing_links:
+                sources = self.backlinks.get(link.target)
+                if sources is not None:
+                    sources.pop(page_path, None)
+                    if not sources:
+                        del self.backlinks[link.target]
+        return page
     
     def get_page(self, name: str) -> Optional[ObsidianPage]:
         """Get page by name."""
         return self.pages.get(name)
     
+    def get_backlinks(self, name: str) -> list[str]:
+        """Paths of the pages linking to a page name (e.g. "Protocol_92")."""
+        return list(self.backlinks.get(name, ()))
+    
     def get_all_links(self) -> dict[str, list[str]]:
         """Get all links (target -> sources)."""
-        backlinks: dict[str, list[str]] = {}
-        
-        for page_path, page in self.pages.items():
-            for link in page.outgoing_links:
-                target = link.target
-                if target not in backlinks:
-                    backlinks[target] = []
-                backlinks[target].append(page_path)
-        
-        return backlinks
+        return {target: list(sources) for target, sources in self.backlinks.items()}
+    
+    def linked_from(self, folder: str) -> list[str]:
+        """Link targets of the pages in a folder."""
+        prefix = f"{folder}/"
+        return [
+            target for target, sources in self.backlinks.items()
+            if any(source.startswith(prefix) for source in sources)
+        ]
+    
+    @property
+    def manifest_path(self) -> Path:
+        return self.root_path / DEFAULT_MANIFEST_FILENAME
+    
+    def _load_manifest(self) -> dict[str, _ManifestEntry]:
+        """Load the manifest of the last export, empty if stale or unreadable."""
+        payload = load_versioned(self.manifest_path, VAULT_MANIFEST_VERSION)
+        return payload.get("pages", {}) if payload is not None else {}
+    
+    def _save_manifest(self, manifest: dict[str, _ManifestEntry]) -> None:
+        save_versioned(self.manifest_path, VAULT_MANIFEST_VERSION, {"pages": manifest})
     
     def export(self) -> int:
-        """Export vault to filesystem."""
+        """
+        Export vault to filesystem, writing only new or changed pages.
+        
+        Each page is rendered with a Backlinks section listing the pages
+        that link to it, read from the backlink index.
+        
+        A manifest in the vault root records each exported page's digest,
+        created timestamp and file stat. Pages whose rendered text and file
+        are unchanged are not rewritten, and the rest are written in one
+        concurrent batch by a BulkWriter. Pages keep the created timestamp
+        of their first export, and pages exported before but no longer in
+        the vault are deleted (files the vault never wrote are left alone).
+        
+        Returns:
+            Number of pages written
+        """
         self.root_path.mkdir(parents=True, exist_ok=True)
+        previous = self._load_manifest()
+        manifest: dict[str, _ManifestEntry] = {}
+        now = datetime.now().isoformat()
         
-        count = 0
+        writer = BulkWriter()
+        pending: dict[Path, tuple[str, bytes, str]] = {}
         for page_path, page in self.pages.items():
             filepath = self.root_path / page_path
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_text(page.render(), encoding="utf-8")
-            count += 1
+            entry = previous.get(page_path)
+            created = entry.created if entry is not None else now
+            name = _page_name(page_path)
+            sources = self.backlinks.get(name, ())
+            backlinks = sorted({_page_name(source) for source in sources} - {name})
+            data = page.render(created, backlinks).encode("utf-8")
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            
+            if entry is not None and entry.digest == digest:
+                try:
+                    st = filepath.stat()
+                except OSError:
+                    st = None
+                if st is not None and (st.st_size, st.st_mtime_ns) == (entry.size, entry.mtime_ns):
+                    manifest[page_path] = entry
+                    continue
+            
+            pending[writer.add(filepath, data)] = (page_path, digest, created)
+        
+        report = writer.write()
+        for result in report.results:
+            page_path, digest, created = pending[result.path]
+            manifest[page_path] = _ManifestEntry(digest, created, result.size, result.mtime_ns)
+        count = len(report)
+        
+        # Remove pages of the last export that are gone from the vault
+        for page_path in previous.keys() - manifest.keys():
+            filepath = self.root_path / page_path
+            filepath.unlink(missing_ok=True)
+            folder = filepath.parent
+            while folder != self.root_path and folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+                folder = folder.parent
+        
+        if count or previous.keys() != manifest.keys():
+            self._save_manifest(manifest)
         
         return count
 
@@ -119,59 +261,183 @@ def _slugify(text: str) -> str:
     return slug[:50]  # Limit length
 
 
-def _extract_entities(text: str) -> list[str]:
-    """Extract entity names from text for linking."""
-    entities = []
+# "Protocol N" mentions; bare "PN" shorthand does not make an entity
+_PROTOCOL_MENTION = re.compile(r"\bProtocol\s+(\d+)\b", re.IGNORECASE)
+
+# Entities linked in every page (spaces become underscores in page names)
+KNOWN_ENTITIES = (
+    "Mark Twain", "Samuel Clemens",
+    "Lewis & Clark", "Marco Polo", "John Muir",
+    "Nikola Tesla", "Alexander von Humboldt",
+    "NSPFRP", "HHF-AI MRI", "Syntheverse",
+    "Hero Host", "Gold Nugget", "Expedition",
+)
+
+
+def _trie_pattern(names: Iterable[str]) -> str:
+    """
+    Regex alternation of names, factored into a character trie.
     
-    # Protocol references
-    protocol_pattern = r"Protocol\s+(\d+)(?::\s*([^,\n]+))?"
-    for match in re.finditer(protocol_pattern, text, re.IGNORECASE):
-        num = match.group(1)
-        name = match.group(2) if match.group(2) else f"Protocol_{num}"
-        entities.append(f"Protocol_{num}")
+    At any position the regex engine then tries only the branches that
+    share the next character, instead of every name in turn; greedy
+    optional tails make the longest name win.
+    """
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: dict) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if ends:
+            return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+        return body
+    
+    return build(trie)
+
+
+class EntityLinker:
+    """
+    Find and link many entity names in one scan of the text.
     
-    # Known entity types
-    known_entities = [
-        "Mark Twain", "Samuel Clemens",
-        "Lewis & Clark", "Marco Polo", "John Muir",
-        "Nikola Tesla", "Alexander von Humboldt",
-        "NSPFRP", "HHF-AI MRI", "Syntheverse",
-        "Hero Host", "Gold Nugget", "Expedition",
-    ]
+    Compiled once from the entity list into two trie-shaped regexes: one
+    spots every entity mentioned anywhere (as a substring, ignoring
+    case), the other finds whole-word mentions to link while skipping
+    text already inside [[wikilinks]]. "Protocol N" mentions are matched
+    generically, so protocol numbers need no entries.
     
-    for entity in known_entities:
-        if entity.lower() in text.lower():
-            entities.append(entity.replace(" ", "_"))
+    Usage:
+        linker = EntityLinker([*KNOWN_ENTITIES, "Huck Finn"])
+        content, links = linker.link(content, linker.find(content))
+    """
     
-    return list(set(entities))
-
-
-def _add_wikilinks(text: str, entities: list[str]) -> tuple[str, list[WikiLink]]:
-    """Add [[wikilinks]] to text for known entities."""
-    result = text
-    links = []
+    def __init__(self, names: Iterable[str] = KNOWN_ENTITIES):
+        self.names = tuple(dict.fromkeys(names))
+        # Lowercased mention -> page name
+        self._entities = {name.lower(): name.replace(" ", "_") for name in self.names}
+        trie = _trie_pattern(self._entities) if self._entities else "(?!)"
+        
+        # Lookahead reports the longest name at every position, including
+        # names inside other names; shorter names sharing that start are
+        # the longest one's prefixes, listed here
+        self._detect = re.compile(f"(?=({trie}))")  # Run on lowercased text
+        self._prefixes = {
+            key: [key[:i] for i in range(1, len(key)) if key[:i] in self._entities]
+            for key in self._entities
+        }
+        
+        self._mention = re.compile(
+            rf"\[\[.*?\]\]|\b(Protocol (\d+)|{trie})\b", re.IGNORECASE
+        )
     
-    for entity in entities:
-        # Convert entity back to readable form
-        readable = entity.replace("_", " ")
+    def find(self, text: str, protocol_numbers: Optional[Iterable[int]] = None) -> list[str]:
+        """
+        Page names of the entities a text mentions.
         
-        # Pattern to find entity (not already in wikilink)
-        pattern = rf"(?<!\[\[)\b{re.escape(readable)}\b(?!\]\])"
+        Args:
+            text: Text to scan
+            protocol_numbers: Protocol numbers already extracted by the parser
+                (skips re-scanning the text for "Protocol N" mentions)
+            
+        Returns:
+            List of page names ("Protocol_5", "Mark_Twain", ...)
+        """
+        if protocol_numbers is None:
+            protocol_numbers = {int(match.group(1)) for match in _PROTOCOL_MENTION.finditer(text)}
+        found = {f"Protocol_{num}": None for num in protocol_numbers}
         
-        if re.search(pattern, result, re.IGNORECASE):
-            # Replace first occurrence
-            match = re.search(pattern, result, re.IGNORECASE)
-            if match:
-                original = match.group(0)
-                result = result[:match.start()] + f"[[{entity}|{original}]]" + result[match.end():]
-                links.append(WikiLink(target=entity, display=original))
+        entities, prefixes = self._entities, self._prefixes
+        for key in {match.group(1) for match in self._detect.finditer(text.lower())}:
+            found[entities[key]] = None
+            for prefix in prefixes[key]:
+                found[entities[prefix]] = None
+        return list(found)
+    
+    def link(self, text: str, entities: Iterable[str]) -> tuple[str, list[WikiLink]]:
+        """
+        Link the first whole-word mention of each given entity.
+        
+        Args:
+            text: Text to link
+            entities: Page names to link (from find)
+            
+        Returns:
+            (linked text, links in text order)
+        """
+        wanted = set(entities)
+        pieces = []
+        links = []
+        last = 0
+        for match in self._mention.finditer(text):
+            original = match.group(1)
+            if original is None:
+                continue  # An existing [[wikilink]]
+            number = match.group(2)
+            if number is not None:
+                target = f"Protocol_{number}"
+            else:
+                target = self._entities[original.lower()]
+            if target not in wanted:
+                continue
+            wanted.discard(target)
+            link = WikiLink(target=target, display=original)
+            pieces.append(text[last:match.start()])
+            pieces.append(str(link))
+            links.append(link)
+            last = match.end()
+            if not wanted:
+                break
+        pieces.append(text[last:])
+        return "".join(pieces), links
+
+
+_default_linker = EntityLinker()
+
+
+def _extract_entities(
+    text: str,
+    protocol_numbers: Optional[Iterable[int]] = None,
+    linker: Optional[EntityLinker] = None,
+) -> list[str]:
+    """
+    Extract entity names from text for linking.
     
-    return result, links
+    Args:
+        text: Text to scan for known entities
+        protocol_numbers: Protocol numbers already extracted by the parser
+            (skips re-scanning the text for "Protocol N" mentions)
+        linker: Linker compiled from the tracked entities (KNOWN_ENTITIES if None)
+    """
+    return (linker or _default_linker).find(text, protocol_numbers)
+
+
+def _add_wikilinks(
+    text: str,
+    entities: list[str],
+    linker: Optional[EntityLinker] = None,
+) -> tuple[str, list[WikiLink]]:
+    """Add [[wikilinks]] to text for known entities."""
+    return (linker or _default_linker).link(text, entities)
+
+
+def _related_link(item: RelatedProtocol) -> WikiLink:
+    """Link to a related protocol's page."""
+    if item.protocol_number:
+        return WikiLink(target=f"Protocol_{item.protocol_number}", display=item.title or item.key)
+    return WikiLink(target=_slugify(item.title or item.key), display=item.title or item.key)
 
 
 def protocol_to_obsidian_page(
     protocol: ProtocolDocument,
     add_links: bool = True,
+    related: Optional[list[RelatedProtocol]] = None,
+    linker: Optional[EntityLinker] = None,
 ) -> ObsidianPage:
     """
     Convert a protocol document to an Obsidian page.
@@ -179,6 +445,8 @@ def protocol_to_obsidian_page(
     Args:
         protocol: Protocol document
         add_links: Add [[wikilinks]] for entities
+        related: Protocols with similar content (from a RelatedIndex)
+        linker: Linker compiled from the tracked entities (KNOWN_ENTITIES if None)
         
     Returns:
         ObsidianPage
@@ -216,30 +484,47 @@ def protocol_to_obsidian_page(
         lines.append("")
     
     # Protocol references as links
+    reference_links = []
     if protocol.protocol_references:
         lines.append("## 🔗 Related Protocols")
         lines.append("")
         for num, desc in protocol.protocol_references:
-            link = f"[[Protocol_{num}|Protocol {num}]]"
+            reference_links.append(WikiLink(target=f"Protocol_{num}", display=f"Protocol {num}"))
+            link = str(reference_links[-1])
             if desc:
                 lines.append(f"- {link}: {desc}")
             else:
                 lines.append(f"- {link}")
         lines.append("")
     
+    content = "\n".join(lines)
+    
+    # Add entity links
+    outgoing_links = reference_links
+    if add_links:
+        entities = _extract_entities(content, protocol.referenced_numbers, linker)
+        content, entity_links = _add_wikilinks(content, entities, linker)
+        outgoing_links.extend(entity_links)
+    
+    # Content-similar protocols (added after entity linking, already linked)
+    lines = []
+    if related:
+        lines.append("## 🧭 Similar Protocols")
+        lines.append("")
+        for item in related:
+            link = _related_link(item)
+            outgoing_links.append(link)
+            lines.append(f"- {link} ({item.score:.2f})")
+        lines.append("")
+    
     # Footer
     if protocol.footer_emojis:
         lines.append("")
         lines.append("---")
         lines.append("".join(protocol.footer_emojis))
     
-    content = "\n".join(lines)
-    
-    # Add entity links
-    outgoing_links = []
-    if add_links:
-        entities = _extract_entities(content)
-        content, outgoing_links = _add_wikilinks(content, entities)
+    if lines:
+        content = content + "\n" + "\n".join(lines)
     
     # Build tags
     tags = ["protocol", "nspfrp"]
@@ -273,25 +558,46 @@ def export_obsidian_vault(
     documents: list[ParsedDocument | ProtocolDocument],
     output_path: Path | str,
     vault_name: str = "MarkTwainVerse",
+    related: Optional[RelatedIndex] = None,
+    related_count: int = 5,
+    duplicates: Optional[DuplicateIndex] = None,
+    linker: Optional[EntityLinker] = None,
+    entity_pages: bool = False,
 ) -> ObsidianVault:
     """
     Export documents as an Obsidian vault.
     
+    Only pages that changed since the last export into output_path are
+    written (see ObsidianVault.export).
+    
     Args:
         documents: Documents to export
         output_path: Vault root path
         vault_name: Name of the vault
+        related: Related-protocols index to list similar pages from
+        related_count: Similar protocols listed per page
+        duplicates: Near-duplicates; documents it marks redundant are skipped
+        linker: Linker compiled from the tracked entities (KNOWN_ENTITIES if None)
+        entity_pages: Also create a page per referenced entity
         
     Returns:
         ObsidianVault
     """
     output_path = Path(output_path)
     vault = ObsidianVault(name=vault_name, root_path=output_path)
+    if duplicates is not None:
+        documents = duplicates.unique(documents)
+    
+    # Neighbours of every protocol, scored in batches
+    similar_by_path = related.related_all(related_count) if related is not None else None
     
     # Convert each document
     for doc in documents:
         if isinstance(doc, ProtocolDocument):
-            page = protocol_to_obsidian_page(doc)
+            similar = None
+            if similar_by_path is not None:
+                similar = similar_by_path.get(str(doc.filepath), [])
+            page = protocol_to_obsidian_page(doc, related=similar, linker=linker)
             vault.add_page(page, folder="Protocols")
         else:
             # Generic document
@@ -306,6 +612,8 @@ def export_obsidian_vault(
     
     # Create index pages
     _create_vault_index(vault, documents)
+    if entity_pages:
+        create_entity_pages(vault)
     
     # Export to filesystem
     vault.export()
@@ -313,14 +621,34 @@ def export_obsidian_vault(
     return vault
 
 
-def _create_vault_index(vault: ObsidianVault, documents: list) -> None:
+def _newest_source(documents: list) -> Optional[datetime]:
+    """Modification time of the newest source file."""
+    newest = None
+    for doc in documents:
+        try:
+            mtime = Path(doc.filepath).stat().st_mtime
+        except OSError:
+            continue
+        if newest is None or mtime > newest:
+            newest = mtime
+    return datetime.fromtimestamp(newest) if newest is not None else None
+
+
+def _create_vault_index(
+    vault: ObsidianVault,
+    documents: list,
+) -> None:
     """Create index pages for the vault."""
     
     # Main index
     lines = []
+    links = []
     lines.append("# MarkTwainVerse Knowledge Base")
     lines.append("")
-    lines.append(f"**Generated:** {datetime.now().isoformat()}")
+    # Stamped with the newest source, so an unchanged corpus renders the same
+    updated = _newest_source(documents)
+    if updated is not None:
+        lines.append(f"**Updated:** {updated.isoformat()}")
     lines.append(f"**Total Documents:** {len(documents)}")
     lines.append("")
     
@@ -332,6 +660,7 @@ def _create_vault_index(vault: ObsidianVault, documents: list) -> None:
         for p in sorted(protocols, key=lambda x: x.protocol_number or 0):
             status = "✅" if p.is_operational else "⚠️"
             lines.append(f"- {status} [[Protocol_{p.protocol_number}|{p.title}]]")
+            links.append(WikiLink(target=f"Protocol_{p.protocol_number}", display=p.title))
         lines.append("")
     
     # Navigation
@@ -340,17 +669,22 @@ def _create_vault_index(vault: ObsidianVault, documents: list) -> None:
     lines.append("- [[Protocol_Index|Protocol Index]]")
     lines.append("- [[Entity_Index|Entity Index]]")
     lines.append("- [[Tag_Index|Tags]]")
+    links.append(WikiLink(target="Protocol_Index", display="Protocol Index"))
+    links.append(WikiLink(target="Entity_Index", display="Entity Index"))
+    links.append(WikiLink(target="Tag_Index", display="Tags"))
     
     vault.add_page(ObsidianPage(
         filename="README.md",
         title="MarkTwainVerse Knowledge Base",
         content="\n".join(lines),
+        outgoing_links=links,
         tags=["index"],
     ))
     
     # Protocol index
     if protocols:
         index_lines = ["# Protocol Index", ""]
+        index_links = []
         
         # Group by category
         by_category: dict[str, list] = {}
@@ -365,70 +699,87 @@ def _create_vault_index(vault: ObsidianVault, documents: list) -> None:
             index_lines.append("")
             for p in sorted(protos, key=lambda x: x.protocol_number or 0):
                 index_lines.append(f"- [[Protocol_{p.protocol_number}]]")
+                index_links.append(WikiLink(target=f"Protocol_{p.protocol_number}"))
             index_lines.append("")
         
         vault.add_page(ObsidianPage(
             filename="Protocol_Index.md",
             title="Protocol Index",
             content="\n".join(index_lines),
+            outgoing_links=index_links,
             tags=["index", "protocols"],
         ))
     
-    # Entity index
-    all_entities = set()
-    for doc in documents:
-        if isinstance(doc, ProtocolDocument):
-            all_entities.update(_extract_entities(doc.content))
-    
+    # Entity index: everything the protocol pages link to
+    entities = sorted(vault.linked_from("Protocols"))
     entity_lines = ["# Entity Index", ""]
-    for entity in sorted(all_entities):
+    for entity in entities:
         entity_lines.append(f"- [[{entity}]]")
     
     vault.add_page(ObsidianPage(
         filename="Entity_Index.md",
         title="Entity Index",
         content="\n".join(entity_lines),
+        outgoing_links=[WikiLink(target=entity) for entity in entities],
         tags=["index", "entities"],
     ))
 
 
 def create_entity_pages(
     vault: ObsidianVault,
-    documents: list[ProtocolDocument],
-) -> None:
+    folder: str | Iterable[ProtocolDocument] = "Protocols",
+) -> int:
     """
-    Create stub pages for all referenced entities.
+    Create stub pages for the entities a folder's pages link to.
+    
+    Entities come from the vault's backlink index; targets that already
+    have a page of their own (e.g. exported protocols) get no stub.
+    
+    Passing the source documents as the second argument, as in
+    create_entity_pages(vault, documents), is deprecated: the documents
+    are ignored and the entities linked from "Protocols" are used.
     
     Args:
         vault: Vault to add pages to
-        documents: Source documents
+        folder: Folder of the pages whose links name entities
+        
+    Returns:
+        Number of entity pages created
     """
-    # Collect all entities and their references
-    entity_refs: dict[str, list[str]] = {}
-    
-    for doc in documents:
-        if not isinstance(doc, ProtocolDocument):
+    if not isinstance(folder, str):
+        warnings.warn(
+            "create_entity_pages(vault, documents) is deprecated; entities now come from "
+            "the vault's links, so pass a folder name or nothing",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        folder = "Protocols"
+    
+    prefix = f"{folder}/"
+    names = {_page_name(page_path) for page_path in vault.pages}
+    count = 0
+    
+    for entity in sorted(vault.linked_from(folder)):
+        if entity in names:
             continue
+        refs = sorted({
+            _page_name(source) for source in vault.get_backlinks(entity)
+            if source.startswith(prefix)
+        })
         
-        entities = _extract_entities(doc.content)
-        for entity in entities:
-            if entity not in entity_refs:
-                entity_refs[entity] = []
-            if doc.protocol_id:
-                entity_refs[entity].append(doc.protocol_id)
-    
-    # Create pages
-    for entity, refs in entity_refs.items():
         lines = [f"# {entity.replace('_', ' ')}", ""]
-        
         lines.append("## Referenced In")
         lines.append("")
-        for ref in set(refs):
+        for ref in refs:
             lines.append(f"- [[{ref}]]")
         
         vault.add_page(ObsidianPage(
             filename=f"{entity}.md",
             title=entity.replace("_", " "),
             content="\n".join(lines),
+            outgoing_links=[WikiLink(target=ref) for ref in refs],
             tags=["entity"],
         ), folder="Entities")
+        count += 1
+    
+    return count
@@ -7,13 +7,18 @@ difference between lightning and a lightning bug." — Mark Twain
 
 from __future__ import annotations
 
+import os
 import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Iterator
+from typing import Optional, Iterable, Iterator, TYPE_CHECKING
 from datetime import datetime
 
+from samuel_clemens.processing.dedup import minhash_signature
 from samuel_clemens.processing.emoji import extract_emojis, EmojiInfo, analyze_emoji_usage
+from samuel_clemens.processing.tokens import TokenKind, TokenStream, tokenize
 from samuel_clemens.processing.sections import (
     Section,
     MetadataBlock,
@@ -26,8 +31,52 @@ from samuel_clemens.processing.sections import (
     extract_conclusion,
     extract_checkmarks,
     extract_protocol_references,
+    extract_referenced_numbers,
 )
 
+if TYPE_CHECKING:
+    from samuel_clemens.processing.cache import ParseCache
+
+
+# Bump whenever parsing output changes; invalidates on-disk parse caches
+PARSER_VERSION = 5
+
+# Deferrable fields, grouped by the extractor that fills them. Everything
+# else (title, metadata, protocol id, footer) is always parsed.
+_FIELD_GROUPS: dict[str, tuple[str, ...]] = {
+    "sections": ("sections", "emergent_observation", "conclusion"),
+    "tables": ("tables",),
+    "quotes": ("quotes",),
+    "emojis": ("emojis",),
+    "word_count": ("word_count",),
+    "checkmarks": ("checkmarks",),
+    "protocol_references": ("protocol_references", "referenced_numbers"),
+    "minhash": ("minhash",),
+}
+
+# Token kinds each group needs from the tokenizer
+_GROUP_KINDS: dict[str, frozenset[TokenKind]] = {
+    "sections": frozenset({TokenKind.HEADING}),
+    "tables": frozenset({TokenKind.TABLE_ROW, TokenKind.TABLE_SEPARATOR}),
+    "quotes": frozenset({TokenKind.BLOCKQUOTE}),
+    "emojis": frozenset({TokenKind.EMOJI}),
+    "word_count": frozenset(),
+    "checkmarks": frozenset({TokenKind.CHECKMARK}),
+    "protocol_references": frozenset({TokenKind.REFERENCE}),
+    "minhash": frozenset(),
+}
+
+_FIELD_TO_GROUP = {
+    name: group for group, names in _FIELD_GROUPS.items() for name in names
+}
+
+# Named field projections for parse_file/parse_protocol
+FIELD_PROFILES: dict[str, frozenset[str]] = {
+    "index": frozenset(),
+    "card": frozenset({"sections", "emojis", "checkmarks", "word_count"}),
+    "full": frozenset(_FIELD_GROUPS),
+}
+
 
 @dataclass
 class ParsedDocument:
@@ -45,12 +94,35 @@ class ParsedDocument:
     
     # Analysis
     emojis: list[EmojiInfo] = field(default_factory=list)
-    word_count: int = 0
+    # Deferrable fields use factories so no class attribute hides __getattr__
+    word_count: int = field(default_factory=int)
     line_count: int = 0
+    minhash: array = field(default_factory=lambda: array("Q"))  # Near-duplicate signature
     
     # Parsing metadata
     parsed_at: datetime = field(default_factory=datetime.now)
     
+    def __getattr__(self, name: str):
+        # Only reached for attributes missing from the instance, i.e. fields
+        # skipped by a projected parse: extract them now and keep them
+        deferred = self.__dict__.get("_deferred")
+        if not deferred or name not in deferred:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        _load_deferred(self, {deferred[name]})
+        return self.__dict__[name]
+    
+    @property
+    def deferred_fields(self) -> set[str]:
+        """Names of fields not extracted yet (loaded on first access)."""
+        return set(self.__dict__.get("_deferred", ()))
+    
+    @property
+    def deferred_groups(self) -> set[str]:
+        """Field groups not extracted yet (see FIELD_PROFILES)."""
+        return set(self.__dict__.get("_deferred", {}).values())
+    
     @property
     def has_tables(self) -> bool:
         return len(self.tables) > 0
@@ -93,10 +165,11 @@ class ProtocolDocument(ParsedDocument):
     protocol_type: Optional[str] = None
     
     # Protocol structure
-    emergent_observation: Optional[Section] = None
-    conclusion: Optional[Section] = None
+    emergent_observation: Optional[Section] = field(default_factory=lambda: None)
+    conclusion: Optional[Section] = field(default_factory=lambda: None)
     checkmarks: list[str] = field(default_factory=list)
     protocol_references: list[tuple[int, str]] = field(default_factory=list)
+    referenced_numbers: array = field(default_factory=lambda: array("I"))  # Sorted, distinct
     
     # Footer
     footer_emojis: list[str] = field(default_factory=list)
@@ -116,88 +189,180 @@ class ProtocolDocument(ParsedDocument):
         return False
 
 
-def parse_file(filepath: Path | str) -> ParsedDocument:
+def _extract_title(stream: TokenStream) -> tuple[Optional[str], Optional[str]]:
+    """Get the title (first H1) and subtitle (H2 directly below it)."""
+    lines = stream.lines
+    for i, line in enumerate(lines):
+        if line.startswith("# "):
+            title = line[2:].strip()
+            # Check for subtitle on next line
+            if i + 1 < len(lines) and lines[i + 1].startswith("## "):
+                return title, lines[i + 1][3:].strip()
+            return title, None
+    return None, None
+
+
+# Fields every parse fills, accepted (and ignored) in explicit field lists
+_ALWAYS_PARSED = frozenset({
+    "title", "subtitle", "line_count", "metadata", "protocol_number",
+    "protocol_id", "category", "status", "discovery_date", "protocol_type",
+    "footer_emojis",
+})
+
+
+def _resolve_fields(fields: str | Iterable[str]) -> frozenset[str]:
+    """Map a profile name or field names to the field groups to extract."""
+    if isinstance(fields, str):
+        if fields not in FIELD_PROFILES:
+            raise ValueError(
+                f"Unknown field profile: {fields!r} "
+                f"(expected one of {', '.join(FIELD_PROFILES)})"
+            )
+        return FIELD_PROFILES[fields]
+    
+    groups = set()
+    for name in fields:
+        if name in _FIELD_TO_GROUP:
+            groups.add(_FIELD_TO_GROUP[name])
+        elif name not in _ALWAYS_PARSED:
+            raise ValueError(f"Unknown document field: {name!r}")
+    return frozenset(groups)
+
+
+def _tokenize_for(content: str, groups: Iterable[str], with_metadata: bool = False) -> TokenStream:
+    """Tokenize only what the given field groups need."""
+    groups = set(groups)
+    kinds = {kind for group in groups for kind in _GROUP_KINDS[group]}
+    if with_metadata:
+        kinds.add(TokenKind.METADATA)
+    return tokenize(content, kinds=kinds, count_words="word_count" in groups)
+
+
+def _find_emergent(sections: list[Section]) -> Optional[Section]:
+    """Find the emergent observation section (top level or one below)."""
+    for section in sections:
+        for candidate in [section, *section.subsections]:
+            if "EMERGENT" in candidate.title.upper():
+                return candidate
+    return None
+
+
+def _fill_fields(doc: ParsedDocument, stream: TokenStream, groups: Iterable[str]) -> None:
+    """Run the extractors for the given field groups onto a document."""
+    groups = set(groups)
+    is_protocol = isinstance(doc, ProtocolDocument)
+    
+    if "sections" in groups:
+        doc.sections = extract_sections(stream)
+        if is_protocol:
+            doc.emergent_observation = _find_emergent(doc.sections)
+            doc.conclusion = extract_conclusion(stream, sections=doc.sections)
+    if "tables" in groups:
+        doc.tables = extract_tables(stream)
+    if "quotes" in groups:
+        doc.quotes = extract_quotes(stream)
+    if "emojis" in groups:
+        doc.emojis = extract_emojis(stream)
+    if "word_count" in groups:
+        doc.word_count = stream.word_count
+    if "minhash" in groups:
+        doc.minhash = minhash_signature(stream.text)
+    if is_protocol and "checkmarks" in groups:
+        doc.checkmarks = extract_checkmarks(stream)
+    if is_protocol and "protocol_references" in groups:
+        doc.protocol_references = extract_protocol_references(stream)
+        doc.referenced_numbers = extract_referenced_numbers(stream)
+
+
+def _defer_fields(doc: ParsedDocument, groups: Iterable[str]) -> None:
+    """Drop the fields of skipped groups so first access extracts them."""
+    deferred = {}
+    for group in groups:
+        for name in _FIELD_GROUPS[group]:
+            if name in doc.__dict__:
+                del doc.__dict__[name]
+                deferred[name] = group
+    if deferred:
+        doc.__dict__["_deferred"] = deferred
+
+
+def _load_deferred(doc: ParsedDocument, groups: set[str]) -> None:
+    """Extract deferred field groups from the document's content."""
+    deferred = doc.__dict__["_deferred"]
+    _fill_fields(doc, _tokenize_for(doc.content, groups), groups)
+    for name in [name for name, group in deferred.items() if group in groups]:
+        del deferred[name]
+
+
+def parse_file(
+    filepath: Path | str,
+    fields: str | Iterable[str] = "full",
+) -> ParsedDocument:
     """
     Parse any text/markdown file.
     
     Args:
         filepath: Path to file
+        fields: Field profile ("index", "card", "full") or field names to
+            extract now; other fields are extracted on first access
         
     Returns:
         ParsedDocument
     """
     filepath = Path(filepath)
+    groups = _resolve_fields(fields)
     
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
     
     content = filepath.read_text(encoding="utf-8")
     
-    # Basic parsing
-    lines = content.split("\n")
+    # Single tokenizer pass shared by every requested extractor
+    stream = _tokenize_for(content, groups)
+    title, subtitle = _extract_title(stream)
     
-    # Extract title (first H1)
-    title = None
-    subtitle = None
-    for i, line in enumerate(lines):
-        if line.startswith("# "):
-            title = line[2:].strip()
-            # Check for subtitle on next line
-            if i + 1 < len(lines) and lines[i + 1].startswith("## "):
-                subtitle = lines[i + 1][3:].strip()
-            break
-    
-    # Extract structure
-    sections = extract_sections(content)
-    tables = extract_tables(content)
-    quotes = extract_quotes(content)
-    emojis = extract_emojis(content)
-    
-    # Count words
-    word_count = len(re.findall(r"\w+", content))
-    
-    return ParsedDocument(
+    doc = ParsedDocument(
         filepath=filepath,
         filename=filepath.name,
         content=content,
         title=title,
         subtitle=subtitle,
-        sections=sections,
-        tables=tables,
-        quotes=quotes,
-        emojis=emojis,
-        word_count=word_count,
-        line_count=len(lines),
+        line_count=stream.line_count,
     )
+    _fill_fields(doc, stream, groups)
+    _defer_fields(doc, _FIELD_GROUPS.keys() - groups)
+    return doc
 
 
-def parse_protocol(filepath: Path | str) -> ProtocolDocument:
+def parse_protocol(
+    filepath: Path | str,
+    fields: str | Iterable[str] = "full",
+) -> ProtocolDocument:
     """
     Parse an NSPFRP protocol file with protocol-specific extraction.
     
+    Title, metadata, protocol id and footer emojis are always parsed.
+    Skipping the rest is much cheaper for index-style callers.
+    
     Args:
         filepath: Path to protocol file
+        fields: Field profile ("index", "card", "full") or field names to
+            extract now; other fields are extracted on first access
         
     Returns:
         ProtocolDocument with full protocol analysis
     """
     filepath = Path(filepath)
+    groups = _resolve_fields(fields)
     
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
     
     content = filepath.read_text(encoding="utf-8")
-    lines = content.split("\n")
     
-    # Basic parsing
-    title = None
-    subtitle = None
-    for i, line in enumerate(lines):
-        if line.startswith("# "):
-            title = line[2:].strip()
-            if i + 1 < len(lines) and lines[i + 1].startswith("## "):
-                subtitle = lines[i + 1][3:].strip()
-            break
+    # Single tokenizer pass shared by every requested extractor
+    stream = _tokenize_for(content, groups, with_metadata=True)
+    title, subtitle = _extract_title(stream)
     
     # Extract protocol number from title
     protocol_number = None
@@ -208,26 +373,11 @@ def parse_protocol(filepath: Path | str) -> ProtocolDocument:
             protocol_number = int(match.group(1))
             protocol_id = f"P{protocol_number}"
     
-    # Extract structure
-    sections = extract_sections(content)
-    tables = extract_tables(content)
-    quotes = extract_quotes(content)
-    emojis = extract_emojis(content)
-    metadata = extract_metadata(content)
-    conclusion = extract_conclusion(content)
-    checkmarks = extract_checkmarks(content)
-    protocol_refs = extract_protocol_references(content)
-    
-    # Find emergent observation section
-    emergent = None
-    for section in sections:
-        if "EMERGENT" in section.title.upper():
-            emergent = section
-            break
+    metadata = extract_metadata(stream)
     
     # Extract footer emojis (last non-empty line with only emojis)
     footer_emojis = []
-    for line in reversed(lines):
+    for line in reversed(stream.lines):
         line = line.strip()
         if not line:
             continue
@@ -237,21 +387,13 @@ def parse_protocol(filepath: Path | str) -> ProtocolDocument:
             footer_emojis = [e.char for e in emoji_analysis["emojis"]]
         break
     
-    # Word count
-    word_count = len(re.findall(r"\w+", content))
-    
-    return ProtocolDocument(
+    doc = ProtocolDocument(
         filepath=filepath,
         filename=filepath.name,
         content=content,
         title=title,
         subtitle=subtitle,
-        sections=sections,
-        tables=tables,
-        quotes=quotes,
-        emojis=emojis,
-        word_count=word_count,
-        line_count=len(lines),
+        line_count=stream.line_count,
         metadata=metadata,
         protocol_number=protocol_number,
         protocol_id=protocol_id,
@@ -259,12 +401,146 @@ def parse_protocol(filepath: Path | str) -> ProtocolDocument:
         status=metadata.status,
         discovery_date=metadata.discovery_date,
         protocol_type=metadata.document_type,
-        emergent_observation=emergent,
-        conclusion=conclusion,
-        checkmarks=checkmarks,
-        protocol_references=protocol_refs,
         footer_emojis=footer_emojis,
     )
+    _fill_fields(doc, stream, groups)
+    _defer_fields(doc, _FIELD_GROUPS.keys() - groups)
+    return doc
+
+
+@dataclass
+class ParseError:
+    """A file that could not be parsed."""
+    filepath: Path
+    error_type: str
+    message: str
+    
+    def __str__(self) -> str:
+        return f"{self.filepath}: {self.error_type}: {self.message}"
+
+
+def _parse_path(
+    filepath: Path,
+    as_protocols: bool,
+    fields: str | Iterable[str] = "full",
+) -> ParsedDocument | ParseError:
+    """Parse one file, returning a ParseError instead of raising."""
+    try:
+        if as_protocols:
+            return parse_protocol(filepath, fields=fields)
+        return parse_file(filepath, fields=fields)
+    except Exception as e:
+        return ParseError(
+            filepath=filepath,
+            error_type=type(e).__name__,
+            message=str(e),
+        )
+
+
+def _find_files(folder_path: Path | str, pattern: str, recursive: bool) -> list[Path]:
+    """Find files matching a pattern, sorted by path."""
+    folder_path = Path(folder_path)
+    
+    if not folder_path.exists():
+        raise FileNotFoundError(f"Folder not found: {folder_path}")
+    
+    if not folder_path.is_dir():
+        raise ValueError(f"Not a directory: {folder_path}")
+    
+    if recursive:
+        files = list(folder_path.rglob(pattern))
+    else:
+        files = list(folder_path.glob(pattern))
+    
+    # Sort by name
+    files.sort()
+    return files
+
+
+def _iter_parse_paths(
+    files: list[Path],
+    as_protocols: bool,
+    workers: Optional[int],
+    errors: Optional[list[ParseError]],
+    fields: str | Iterable[str] = "full",
+) -> Iterator[ParsedDocument | ProtocolDocument]:
+    """Parse files in order, optionally across a process pool."""
+    if not isinstance(fields, str):
+        fields = frozenset(fields)  # Picklable for the pool
+    
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    
+    if not workers or workers <= 1 or len(files) <= 1:
+        results: Iterable[ParsedDocument | ParseError] = (
+            _parse_path(filepath, as_protocols, fields) for filepath in files
+        )
+        yield from _collect_errors(results, errors)
+        return
+    
+    workers = min(workers, len(files))
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in submission (sorted) order as they complete
+        results = pool.map(
+            _parse_path,
+            files,
+            [as_protocols] * len(files),
+            [fields] * len(files),
+            chunksize=chunksize,
+        )
+        yield from _collect_errors(results, errors)
+
+
+def _collect_errors(
+    results: Iterable[ParsedDocument | ParseError],
+    errors: Optional[list[ParseError]],
+) -> Iterator[ParsedDocument | ProtocolDocument]:
+    """Yield documents, diverting failures into the error report (or a warning)."""
+    for result in results:
+        if isinstance(result, ParseError):
+            if errors is not None:
+                errors.append(result)
+            else:
+                print(f"Warning: Failed to parse {result.filepath}: {result.message}")
+            continue
+        yield result
+
+
+def iter_parse_folder(
+    folder_path: Path | str,
+    pattern: str = "*.md",
+    recursive: bool = False,
+    as_protocols: bool = False,
+    workers: Optional[int] = None,
+    errors: Optional[list[ParseError]] = None,
+    fields: str | Iterable[str] = "full",
+    exclude: Iterable[Path | str] = (),
+) -> Iterator[ParsedDocument | ProtocolDocument]:
+    """
+    Parse matching files in a folder, streaming documents as they are ready.
+    
+    Documents are yielded in sorted path order even when parsed in parallel.
+    
+    Args:
+        folder_path: Directory to scan
+        pattern: Glob pattern for files (default: *.md)
+        recursive: Search recursively
+        as_protocols: Parse as protocol documents
+        workers: Worker processes (None or 1 parses in-process, 0 uses all CPUs)
+        errors: List to collect per-file ParseError records into
+            (if None, each failure is printed as a warning)
+        fields: Field profile or field names to extract eagerly
+        exclude: Paths to skip (e.g. files already parsed elsewhere)
+        
+    Yields:
+        Parsed documents
+    """
+    files = _find_files(folder_path, pattern, recursive)
+    if exclude:
+        skip = {Path(path) for path in exclude}
+        files = [filepath for filepath in files if filepath not in skip]
+    yield from _iter_parse_paths(files, as_protocols, workers, errors, fields)
 
 
 def parse_folder(
@@ -272,6 +548,10 @@ def parse_folder(
     pattern: str = "*.md",
     recursive: bool = False,
     as_protocols: bool = False,
+    workers: Optional[int] = None,
+    errors: Optional[list[ParseError]] = None,
+    fields: str | Iterable[str] = "full",
+    exclude: Iterable[Path | str] = (),
 ) -> list[ParsedDocument | ProtocolDocument]:
     """
     Parse all matching files in a folder.
@@ -281,9 +561,50 @@ def parse_folder(
         pattern: Glob pattern for files (default: *.md)
         recursive: Search recursively
         as_protocols: Parse as protocol documents
+        workers: Worker processes (None or 1 parses in-process, 0 uses all CPUs)
+        errors: List to collect per-file ParseError records into
+            (if None, each failure is printed as a warning)
+        fields: Field profile or field names to extract eagerly
+        exclude: Paths to skip (e.g. files already parsed elsewhere)
         
     Returns:
-        List of parsed documents
+        List of parsed documents, sorted by path
+    """
+    return list(iter_parse_folder(
+        folder_path,
+        pattern=pattern,
+        recursive=recursive,
+        as_protocols=as_protocols,
+        workers=workers,
+        errors=errors,
+        fields=fields,
+        exclude=exclude,
+    ))
+
+
+# Filename prefixes that mark protocol documents
+PROTOCOL_PREFIXES = ("NSPFRP_", "PROTOCOL_", "P_", "NSP_")
+
+
+def _scan_protocol_entries(
+    folder_path: Path | str,
+    prefixes: Optional[Iterable[str]] = None,
+    recursive: bool = False,
+) -> Iterator[os.DirEntry]:
+    """
+    Scan for protocol files in one os.scandir pass per directory.
+    
+    Every entry is classified against all prefixes at once, so each file
+    is seen exactly once however many prefixes match it. The DirEntry
+    caches its stat, which the parse cache reuses for validation.
+    
+    Args:
+        folder_path: Directory to scan
+        prefixes: Filename prefixes (default: PROTOCOL_PREFIXES)
+        recursive: Descend into subdirectories
+        
+    Yields:
+        DirEntry for each protocol file, sorted by name within a directory
     """
     folder_path = Path(folder_path)
     
@@ -293,33 +614,38 @@ def parse_folder(
     if not folder_path.is_dir():
         raise ValueError(f"Not a directory: {folder_path}")
     
-    # Find files
-    if recursive:
-        files = list(folder_path.rglob(pattern))
-    else:
-        files = list(folder_path.glob(pattern))
-    
-    # Sort by name
-    files.sort()
+    prefixes = PROTOCOL_PREFIXES if prefixes is None else tuple(prefixes)
     
-    # Parse each file
-    documents = []
-    for filepath in files:
+    pending = [os.fspath(folder_path)]
+    while pending:
+        directory = pending.pop()
+        subdirs = []
         try:
-            if as_protocols:
-                doc = parse_protocol(filepath)
-            else:
-                doc = parse_file(filepath)
-            documents.append(doc)
-        except Exception as e:
-            print(f"Warning: Failed to parse {filepath}: {e}")
-    
-    return documents
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".md") and name.startswith(prefixes):
+                if entry.is_file():
+                    yield entry
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        
+        # Reversed so directories pop off the stack in sorted order
+        pending.extend(reversed(subdirs))
 
 
 def parse_protocols_by_prefix(
     folder_path: Path | str,
     prefixes: list[str] = None,
+    workers: Optional[int] = None,
+    errors: Optional[list[ParseError]] = None,
+    cache: Optional[ParseCache] = None,
+    fields: str | Iterable[str] = "full",
+    recursive: bool = False,
 ) -> list[ProtocolDocument]:
     """
     Parse protocol files matching common prefixes.
@@ -327,49 +653,66 @@ def parse_protocols_by_prefix(
     Args:
         folder_path: Directory to scan
         prefixes: List of prefixes (default: NSPFRP_, PROTOCOL_, etc.)
+        workers: Worker processes (None or 1 parses in-process, 0 uses all CPUs)
+        errors: List to collect per-file ParseError records into
+            (if None, each failure is printed as a warning)
+        cache: ParseCache to reuse unchanged documents from (saved afterwards)
+        fields: Field profile or field names to extract eagerly
+        recursive: Also scan subdirectories
         
     Returns:
         List of ProtocolDocument objects
     """
-    if prefixes is None:
-        prefixes = ["NSPFRP_", "PROTOCOL_", "P_", "NSP_"]
-    
-    folder_path = Path(folder_path)
-    
-    all_protocols = []
-    for prefix in prefixes:
-        pattern = f"{prefix}*.md"
-        protocols = parse_folder(folder_path, pattern=pattern, as_protocols=True)
-        all_protocols.extend(protocols)
-    
-    # Deduplicate by filepath
-    seen = set()
-    unique = []
-    for doc in all_protocols:
-        if doc.filepath not in seen:
-            seen.add(doc.filepath)
-            unique.append(doc)
-    
-    # Sort by protocol number
-    unique.sort(key=lambda d: d.protocol_number or 0)
+    groups = _resolve_fields(fields)
+    unique: list[ProtocolDocument] = []
+    to_parse: list[Path] = []
+    stats: dict[Path, os.stat_result] = {}
+    for entry in _scan_protocol_entries(folder_path, prefixes, recursive):
+        filepath = Path(entry.path)
+        if cache is None:
+            to_parse.append(filepath)
+            continue
+        
+        try:
+            stat = entry.stat()
+        except OSError:
+            stat = None
+        cached = cache.get(filepath, stat=stat, groups=groups)
+        if cached is not None:
+            unique.append(cached)
+        else:
+            to_parse.append(filepath)
+            stats[filepath] = stat
+    
+    for doc in _iter_parse_paths(to_parse, True, workers, errors, fields):
+        if cache is not None:
+            cache.put(doc, stat=stats.get(doc.filepath))
+        unique.append(doc)
+    
+    if cache is not None:
+        cache.save()
+    
+    # Sort by protocol number (then path, so cached and fresh docs interleave stably)
+    unique.sort(key=lambda d: (d.protocol_number or 0, str(d.filepath)))
     
     return unique
 
 
-def iter_protocol_files(folder_path: Path | str) -> Iterator[Path]:
+def iter_protocol_files(
+    folder_path: Path | str,
+    prefixes: Optional[Iterable[str]] = None,
+    recursive: bool = False,
+) -> Iterator[Path]:
     """
     Iterate over protocol files in a folder.
     
     Args:
         folder_path: Directory to scan
+        prefixes: Filename prefixes (default: PROTOCOL_PREFIXES)
+        recursive: Also scan subdirectories
         
     Yields:
         Paths to protocol files
     """
-    folder_path = Path(folder_path)
-    
-    prefixes = ["NSPFRP_", "PROTOCOL_", "P_", "NSP_"]
-    
-    for prefix in prefixes:
-        for filepath in folder_path.glob(f"{prefix}*.md"):
-            yield filepath
+    for entry in _scan_protocol_entries(folder_path, prefixes, recursive):
+        yield Path(entry.path)
@@ -14,6 +14,7 @@ Features:
 from __future__ import annotations
 
 import io
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Any
@@ -42,7 +43,9 @@ except ImportError:
     letter = (612.0, 792.0)
     A4 = (595.27, 841.89)
 
+from samuel_clemens.processing.dedup import DuplicateIndex
 from samuel_clemens.processing.parser import ParsedDocument, ProtocolDocument
+from samuel_clemens.processing.related import RelatedIndex
 
 
 @dataclass
@@ -123,49 +126,64 @@ def _get_styles(config: PDFConfig) -> dict:
     return styles
 
 
+# Emoji and typography the base PDF fonts cannot draw
+_TEXT_REPLACEMENTS = {
+    '✅': '[OK]',
+    '❌': '[X]',
+    '⚠️': '[!]',
+    '🚨': '[!]',
+    '🎯': '*',
+    '📊': '',
+    '🌟': '*',
+    '✨': '*',
+    '🔄': '',
+    '🔗': '',
+    '🏗️': '',
+    '💎': '*',
+    '📝': '',
+    '📖': '',
+    '📚': '',
+    '🚀': '',
+    '🌐': '',
+    '🎬': '',
+    '🎩': '',
+    '⭐': '*',
+    '💡': '',
+    '🔘': 'o',
+    '—': '-',
+    '–': '-',
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2018': "'",
+    '\u2019': "'",
+}
+
+# Single characters, XML escapes included, go through one translate table;
+# multi-codepoint sequences (emoji + variation selector) need a regex
+_CLEAN_TABLE = str.maketrans({
+    **{old: new for old, new in _TEXT_REPLACEMENTS.items() if len(old) == 1},
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+})
+_SEQUENCES = {old: new for old, new in _TEXT_REPLACEMENTS.items() if len(old) > 1}
+_SEQUENCE_PATTERN = re.compile("|".join(
+    re.escape(old) for old in sorted(_SEQUENCES, key=len, reverse=True)
+))
+# Last code points of the sequences (the variation selector U+FE0F), to
+# skip the regex for the many lines that contain none
+_SEQUENCE_ENDS = frozenset(old[-1] for old in _SEQUENCES)
+
+
 def _clean_text(text: str) -> str:
-    """Clean text for PDF rendering."""
-    # Remove or replace problematic characters
-    replacements = {
-        '✅': '[OK]',
-        '❌': '[X]',
-        '⚠️': '[!]',
-        '🚨': '[!]',
-        '🎯': '*',
-        '📊': '',
-        '🌟': '*',
-        '✨': '*',
-        '🔄': '',
-        '🔗': '',
-        '🏗️': '',
-        '💎': '*',
-        '📝': '',
-        '📖': '',
-        '📚': '',
-        '🚀': '',
-        '🌐': '',
-        '🎬': '',
-        '🎩': '',
-        '⭐': '*',
-        '💡': '',
-        '🔘': 'o',
-        '—': '-',
-        '–': '-',
-        '"': '"',
-        '"': '"',
-        ''': "'",
-        ''': "'",
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    
-    # Escape XML special chars
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    
-    return text
+    """Clean text for PDF rendering (replace emoji, escape XML)."""
+    if text.isascii():
+        # Most lines: only the XML specials could need replacing
+        if '&' not in text and '<' not in text and '>' not in text:
+            return text
+    elif any(end in text for end in _SEQUENCE_ENDS):
+        text = _SEQUENCE_PATTERN.sub(lambda m: _SEQUENCES[m.group()], text)
+    return text.translate(_CLEAN_TABLE)
 
 
 def _markdown_to_paragraphs(text: str, styles: dict) -> list:
@@ -314,6 +332,9 @@ def export_protocols_to_pdf(
     protocols: list[ProtocolDocument],
     output_path: Path | str,
     config: Optional[PDFConfig] = None,
+    related: Optional[RelatedIndex] = None,
+    related_count: int = 5,
+    duplicates: Optional[DuplicateIndex] = None,
 ) -> Path:
     """
     Export multiple protocols to a single PDF.
@@ -322,12 +343,17 @@ def export_protocols_to_pdf(
         protocols: Protocols to export
         output_path: Output file path
         config: PDF configuration
+        related: Related-protocols index to list similar protocols from
+        related_count: Similar protocols listed per protocol
+        duplicates: Near-duplicates; protocols it marks redundant are skipped
         
     Returns:
         Path to created PDF
     """
     _check_reportlab()
     
+    if duplicates is not None:
+        protocols = duplicates.unique(protocols)
     config = config or PDFConfig()
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -417,6 +443,16 @@ def export_protocols_to_pdf(
             for check in protocol.checkmarks[:8]:
                 elements.append(Paragraph(f"[OK] {_clean_text(check)}", styles['CustomBody']))
         
+        # Content-similar protocols
+        similar = related.related_for(protocol, related_count) if related is not None else []
+        if similar:
+            elements.append(Paragraph("Similar Protocols", styles['CustomHeading']))
+            for item in similar:
+                elements.append(Paragraph(
+                    f"{item.key}: {_clean_text(item.title or 'Untitled')} ({item.score:.2f})",
+                    styles['CustomBody']
+                ))
+        
         elements.append(PageBreak())
     
     # Build
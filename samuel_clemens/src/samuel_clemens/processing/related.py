@@ -0,0 +1,367 @@
+"""
+Related Protocols - TF-IDF vectors and cosine-nearest-neighbour lookup.
+
+"Never tell the truth to people who are not worthy of it." — Mark Twain
+
+Every document becomes a sparse TF-IDF vector (sublinear term frequency,
+smoothed inverse document frequency, L2-normalized). The weighted
+vectors are laid out as a sparse term-major matrix: for each term, the
+rows that contain it and their weights, in parallel ``array`` buffers.
+Scoring one document against the corpus is then a single sparse
+matrix-vector product that only touches rows sharing a term with it.
+
+Raw term counts are kept per document and keyed by a content digest, so
+updating one file recounts only that file; the weighted matrix is
+refreshed from the stored counts on the next query.
+
+By default the lookup is approximate: a document queries with only its
+MAX_QUERY_TERMS strongest terms, and in corpora of MIN_DOCUMENTS_TO_PRUNE
+or more documents, terms found in over MAX_DOCUMENT_FREQUENCY of them
+are skipped. Scores are then lower bounds of the true cosine, and a
+neighbour that shares only weak or common terms can be missed. An index
+created with exact=True scores every shared term.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from dataclasses import dataclass
+from itertools import compress
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from samuel_clemens.processing.parser import ParsedDocument
+from samuel_clemens.processing.search import analyze
+from samuel_clemens.utils.io import content_digest, load_versioned, save_versioned, store_path
+
+
+# Bump whenever the stored layout or term analysis changes
+RELATED_VERSION = 1
+
+DEFAULT_RELATED_FILENAME = "related_index.bin"
+
+# Approximate lookup: only the strongest terms of a document drive its
+# neighbour search, and terms found in most documents of a large corpus
+# carry too little weight to be worth a sweep
+MAX_QUERY_TERMS = 64
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_DOCUMENTS_TO_PRUNE = 100
+
+# Documents scored together by related_all; each holds a dense score row
+BATCH_SIZE = 16
+
+
+@dataclass
+class RelatedProtocol:
+    """A document similar to another, by cosine similarity."""
+    key: str  # Protocol id (e.g. "P92"), or file stem for unnumbered docs
+    protocol_number: Optional[int]
+    title: Optional[str]
+    score: float
+
+
+@dataclass
+class _VectorRecord:
+    """Per-document term counts."""
+    path: str
+    key: str
+    protocol_number: Optional[int]
+    title: Optional[str]
+    digest: str
+    term_ids: array  # array('I'), ascending
+    counts: array  # array('I'), parallel to term_ids
+
+
+def _document_key(document: ParsedDocument) -> str:
+    return getattr(document, "protocol_id", None) or Path(document.filepath).stem
+
+
+def _is_feature(term: str) -> bool:
+    """Skip very short words and bare numbers, which only add noise."""
+    return len(term) > 2 and not term.isdigit()
+
+
+class RelatedIndex:
+    """
+    TF-IDF vector store with "related protocols" lookup.
+
+    Scores are approximate unless exact is set (see the module docstring).
+
+    Usage:
+        related = RelatedIndex(output_dir / "related_index.bin")
+        related.update(protocols)
+        related.save()
+        related.related("P92", k=5)
+    """
+
+    def __init__(self, path: Optional[Path | str] = None, exact: bool = False):
+        self.path = store_path(path, DEFAULT_RELATED_FILENAME) if path is not None else None
+        self.exact = exact
+        self.clear()
+        if self.path is not None:
+            self.load()
+
+    def clear(self) -> None:
+        """Drop every vector."""
+        self.records: dict[str, _VectorRecord] = {}  # Path -> record
+        self.vocabulary: dict[str, int] = {}
+        self.document_frequency = array("I")
+        self._matrix = None  # (rows, postings, row_terms, row_of, key_rows), built on demand
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ---------------------------------------------------------------- updates
+
+    def add(self, document: ParsedDocument) -> bool:
+        """
+        Count a document's terms, replacing any older version of the file.
+
+        Args:
+            document: Parsed document
+
+        Returns:
+            True if the store changed (False if the content is unchanged)
+        """
+        path = str(document.filepath)
+        digest = content_digest(document.content)
+        existing = self.records.get(path)
+        if existing is not None:
+            if existing.digest == digest:
+                return False
+            self.remove(path)
+
+        counts: dict[int, int] = {}
+        for term in analyze(document.content):
+            if not _is_feature(term):
+                continue
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = self.vocabulary[term] = len(self.vocabulary)
+                self.document_frequency.append(0)
+            counts[term_id] = counts.get(term_id, 0) + 1
+
+        term_ids = array("I", sorted(counts))
+        for term_id in term_ids:
+            self.document_frequency[term_id] += 1
+
+        self.records[path] = _VectorRecord(
+            path=path,
+            key=_document_key(document),
+            protocol_number=getattr(document, "protocol_number", None),
+            title=document.title,
+            digest=digest,
+            term_ids=term_ids,
+            counts=array("I", (counts[term_id] for term_id in term_ids)),
+        )
+        self._matrix = None
+        self._dirty = True
+        return True
+
+    def remove(self, path: Path | str) -> bool:
+        """
+        Drop a document's vector.
+
+        Args:
+            path: Source file path of the document
+
+        Returns:
+            True if the document was stored
+        """
+        record = self.records.pop(str(path), None)
+        if record is None:
+            return False
+        for term_id in record.term_ids:
+            self.document_frequency[term_id] -= 1
+        self._matrix = None
+        self._dirty = True
+        return True
+
+    def update(self, documents: Iterable[ParsedDocument], prune: bool = True) -> int:
+        """
+        Bring the store up to date with a set of documents.
+
+        Args:
+            documents: Current documents of the corpus
+            prune: Drop stored documents that are not in the set
+
+        Returns:
+            Number of documents added, replaced or removed
+        """
+        changed = 0
+        seen = set()
+        for document in documents:
+            seen.add(str(document.filepath))
+            changed += self.add(document)
+        if prune:
+            for path in [path for path in self.records if path not in seen]:
+                changed += self.remove(path)
+        return changed
+
+    # ---------------------------------------------------------------- vectors
+
+    def _build_matrix(self):
+        """Weight the stored counts into a term-major sparse matrix."""
+        rows = list(self.records.values())
+        n_docs = len(rows)
+        idf = [
+            math.log((1 + n_docs) / (1 + df)) + 1.0 if df else 0.0
+            for df in self.document_frequency
+        ]
+        max_df = n_docs
+        if n_docs >= MIN_DOCUMENTS_TO_PRUNE and not self.exact:
+            max_df = int(n_docs * MAX_DOCUMENT_FREQUENCY)
+
+        postings: dict[int, tuple[array, array]] = {}
+        row_terms: list[list[tuple[float, int]]] = []
+        for row, record in enumerate(rows):
+            weights = [
+                (1.0 + math.log(count)) * idf[term_id]
+                for term_id, count in zip(record.term_ids, record.counts)
+            ]
+            norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+            terms = []
+            for term_id, weight in zip(record.term_ids, weights):
+                weight /= norm
+                terms.append((weight, term_id))
+                if self.document_frequency[term_id] <= max_df:
+                    entry = postings.get(term_id)
+                    if entry is None:
+                        entry = postings[term_id] = (array("I"), array("d"))
+                    entry[0].append(row)
+                    entry[1].append(weight)
+            if not self.exact:
+                terms.sort(reverse=True)
+                del terms[MAX_QUERY_TERMS:]
+            row_terms.append(terms)
+
+        # Lookup by protocol id or source path; the first file claims an id
+        row_of: dict[str, int] = {}
+        key_rows: dict[str, list[int]] = {}
+        for row, record in enumerate(rows):
+            row_of.setdefault(record.key, row)
+            row_of[record.path] = row
+            key_rows.setdefault(record.key, []).append(row)
+
+        self._matrix = (rows, postings, row_terms, row_of, key_rows)
+        return self._matrix
+
+    def _score_batch(self, batch: Sequence[int], k: int) -> list[list[RelatedProtocol]]:
+        """Score a batch of rows against every row and keep each one's k best."""
+        rows, postings, row_terms, _, key_rows = self._matrix or self._build_matrix()
+        n_rows = len(rows)
+
+        # Group the batch's query weights by term, so each posting list is
+        # fetched once per batch; scores accumulate in one dense row each
+        queries: dict[int, list[tuple[int, float]]] = {}
+        for slot, row in enumerate(batch):
+            for weight, term_id in row_terms[row]:
+                queries.setdefault(term_id, []).append((slot, weight))
+        scores = [[0.0] * n_rows for _ in batch]
+        for term_id, group in queries.items():
+            entry = postings.get(term_id)
+            if entry is None:
+                continue
+            for slot, weight in group:
+                accumulator = scores[slot]
+                for other, other_weight in zip(*entry):
+                    accumulator[other] += weight * other_weight
+
+        results = []
+        for slot, row in enumerate(batch):
+            accumulator = scores[slot]
+            for other in key_rows[rows[row].key]:
+                accumulator[other] = 0.0
+            # Rows sharing no term score exactly 0.0; compress skips them in C
+            best = heapq.nlargest(
+                k, compress(range(n_rows), accumulator), key=accumulator.__getitem__
+            )
+            results.append([
+                RelatedProtocol(
+                    key=rows[other].key,
+                    protocol_number=rows[other].protocol_number,
+                    title=rows[other].title,
+                    score=round(accumulator[other], 4),
+                )
+                for other in best
+            ])
+        return results
+
+    def related(self, key: str, k: int = 5) -> list[RelatedProtocol]:
+        """
+        Get the documents most similar to a protocol.
+
+        Args:
+            key: Protocol id (e.g. "P92") or file stem of an unnumbered doc
+            k: Number of neighbours
+
+        Returns:
+            Up to k RelatedProtocol entries, most similar first
+        """
+        row = (self._matrix or self._build_matrix())[3].get(key)
+        if row is not None:
+            return self._score_batch([row], k)[0]
+        raise KeyError(f"No document for {key!r} in the related index")
+
+    def related_for(self, document: ParsedDocument, k: int = 5) -> list[RelatedProtocol]:
+        """Get the neighbours of a document (empty if it is not stored)."""
+        row = (self._matrix or self._build_matrix())[3].get(str(document.filepath))
+        return self._score_batch([row], k)[0] if row is not None else []
+
+    def related_all(self, k: int = 5) -> dict[str, list[RelatedProtocol]]:
+        """
+        Get the neighbours of every stored document in one batch.
+
+        Args:
+            k: Neighbours per document
+
+        Returns:
+            Source file path -> neighbours
+        """
+        rows = (self._matrix or self._build_matrix())[0]
+        neighbours: dict[str, list[RelatedProtocol]] = {}
+        for first in range(0, len(rows), BATCH_SIZE):
+            batch = range(first, min(first + BATCH_SIZE, len(rows)))
+            for row, similar in zip(batch, self._score_batch(batch, k)):
+                neighbours[rows[row].path] = similar
+        return neighbours
+
+    # ------------------------------------------------------------ persistence
+
+    def load(self) -> None:
+        """Load the store file, starting empty if it is stale or unreadable."""
+        self.clear()
+        if self.path is None or not self.path.exists():
+            return
+
+        payload = load_versioned(self.path, RELATED_VERSION)
+        if payload is None:
+            self._dirty = True
+            return
+
+        self.records = payload["records"]
+        self.vocabulary = payload["vocabulary"]
+        self.document_frequency = payload["document_frequency"]
+
+    def save(self) -> bool:
+        """
+        Write the store to disk if anything changed.
+
+        Returns:
+            True if the store file was written
+        """
+        if not self._dirty or self.path is None:
+            return False
+
+        payload = {
+            "records": self.records,
+            "vocabulary": self.vocabulary,
+            "document_frequency": self.document_frequency,
+        }
+        save_versioned(self.path, RELATED_VERSION, payload, level=1)
+
+        self._dirty = False
+        return True
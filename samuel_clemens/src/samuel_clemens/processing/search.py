@@ -0,0 +1,476 @@
+"""
+Search Index - Inverted full-text index over the protocol corpus.
+
+"Books are for people who wish they were somewhere else." — Mark Twain
+
+Each term maps to a posting list of (doc id, term frequency, token
+positions), stored as flat arrays so a 10k-document corpus stays compact.
+Section ids are recovered from a position by bisecting the document's
+section start positions. Queries are ranked with BM25 and may contain
+"quoted phrases", which must appear with consecutive positions.
+
+The index is persisted as one compressed pickle (like the parse cache)
+and updated incrementally: documents whose content digest is unchanged
+are skipped, changed ones are removed and re-added.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterable, Optional, TYPE_CHECKING
+
+from samuel_clemens.processing.parser import ParsedDocument, parse_protocols_by_prefix
+from samuel_clemens.utils.io import content_digest, load_versioned, save_versioned, store_path
+
+if TYPE_CHECKING:
+    from samuel_clemens.processing.cache import ParseCache
+
+
+# Bump whenever the index layout or term analysis changes
+INDEX_VERSION = 2
+
+DEFAULT_INDEX_FILENAME = "search_index.bin"
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TERM = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+_HEADING_LINE = re.compile(r"^#{1,6}\s+(.+)$")
+
+
+def analyze(text: str) -> list[str]:
+    """Split text into lowercase index terms."""
+    return _TERM.findall(text.lower())
+
+
+@dataclass
+class IndexedDocument:
+    """Per-document record kept by the index."""
+    path: str
+    title: Optional[str]
+    protocol_id: Optional[str]
+    digest: str
+    length: int  # Number of indexed tokens
+    section_titles: list[str] = field(default_factory=list)
+    section_starts: array = field(default_factory=lambda: array("I"))  # Token positions
+    terms: list[str] = field(default_factory=list)  # Distinct terms, for removal
+
+    def section_at(self, position: int) -> Optional[str]:
+        """Get the title of the section containing a token position."""
+        i = bisect_right(self.section_starts, position) - 1
+        return self.section_titles[i] if i >= 0 else None
+
+
+class _Postings:
+    """Posting list for one term: doc ids (ascending), frequencies, positions."""
+    __slots__ = ("doc_ids", "freqs", "positions", "_starts")
+
+    def __init__(self) -> None:
+        self.doc_ids = array("I")
+        self.freqs = array("I")
+        self.positions = array("I")  # Concatenated per doc, in doc_ids order
+        self._starts: Optional[array] = None  # Prefix sums of freqs, built on demand
+
+    def __getstate__(self):
+        return self.doc_ids, self.freqs, self.positions
+
+    def __setstate__(self, state) -> None:
+        self.doc_ids, self.freqs, self.positions = state
+        self._starts = None
+
+    def _start(self, index: int) -> int:
+        if self._starts is None or len(self._starts) != len(self.freqs) + 1:
+            self._starts = array("I", accumulate(self.freqs, initial=0))
+        return self._starts[index]
+
+    def find(self, doc_id: int) -> int:
+        """Get the index of a doc in this list, or -1."""
+        i = bisect_left(self.doc_ids, doc_id)
+        if i < len(self.doc_ids) and self.doc_ids[i] == doc_id:
+            return i
+        return -1
+
+    def positions_of(self, index: int) -> array:
+        """Get the token positions for the doc at a list index."""
+        start = self._start(index)
+        return self.positions[start:start + self.freqs[index]]
+
+    def remove(self, index: int) -> None:
+        start = self._start(index)
+        self._starts = None
+        del self.positions[start:start + self.freqs[index]]
+        del self.doc_ids[index]
+        del self.freqs[index]
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+    path: str
+    title: Optional[str]
+    protocol_id: Optional[str]
+    score: float
+    sections: list[str] = field(default_factory=list)  # Sections with matches
+
+
+def _parse_query(query: str) -> tuple[list[str], list[list[str]]]:
+    """Split a query into bare terms and quoted phrases."""
+    terms: list[str] = []
+    phrases: list[list[str]] = []
+    for match in _QUERY_PART.finditer(query):
+        phrase, word = match.groups()
+        if phrase is not None:
+            words = analyze(phrase)
+            if len(words) > 1:
+                phrases.append(words)
+            else:
+                terms.extend(words)
+        else:
+            terms.extend(analyze(word))
+    return terms, phrases
+
+
+class SearchIndex:
+    """
+    Persistent inverted index over parsed documents.
+
+    Usage:
+        index = SearchIndex(output_dir / "search_index.bin")
+        index.update(parse_protocols_by_prefix(folder))
+        index.save()
+        hits = index.search('"hero host" goldilocks')
+    """
+
+    def __init__(self, path: Optional[Path | str] = None):
+        self.path = store_path(path, DEFAULT_INDEX_FILENAME) if path is not None else None
+        self.clear()
+        self._dirty = False
+        if self.path is not None:
+            self.load()
+
+    def clear(self) -> None:
+        """Drop every document and posting; the next save writes the empty index."""
+        self.documents: list[Optional[IndexedDocument]] = []  # None = removed
+        self.postings: dict[str, _Postings] = {}
+        self.doc_ids: dict[str, int] = {}  # Path -> live doc id
+        self.total_length = 0
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    # ---------------------------------------------------------------- updates
+
+    def add(self, document: ParsedDocument) -> bool:
+        """
+        Index a document, replacing any older version of the same file.
+
+        Args:
+            document: Parsed document
+
+        Returns:
+            True if the index changed (False if the content is unchanged)
+        """
+        path = str(document.filepath)
+        digest = content_digest(document.content)
+
+        doc_id = self.doc_ids.get(path)
+        if doc_id is not None:
+            if self.documents[doc_id].digest == digest:
+                return False
+            self.remove(path)
+
+        doc_id = len(self.documents)
+        record = IndexedDocument(
+            path=path,
+            title=document.title,
+            protocol_id=getattr(document, "protocol_id", None),
+            digest=digest,
+            length=0,
+        )
+
+        # Collect positions per term, noting where each section starts
+        term_positions: dict[str, list[int]] = {}
+        position = 0
+        for line in document.content.split("\n"):
+            heading = _HEADING_LINE.match(line)
+            if heading:
+                record.section_titles.append(heading.group(1).strip())
+                record.section_starts.append(position)
+            for term in analyze(line):
+                term_positions.setdefault(term, []).append(position)
+                position += 1
+
+        # Doc ids only grow, so appending keeps every posting list sorted
+        for term, positions in term_positions.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.doc_ids.append(doc_id)
+            postings.freqs.append(len(positions))
+            postings.positions.extend(positions)
+
+        record.length = position
+        record.terms = list(term_positions)
+        self.documents.append(record)
+        self.doc_ids[path] = doc_id
+        self.total_length += position
+        self._dirty = True
+        return True
+
+    def remove(self, path: Path | str) -> bool:
+        """
+        Remove a document from the index.
+
+        Args:
+            path: Source file path of the document
+
+        Returns:
+            True if the document was indexed
+        """
+        doc_id = self.doc_ids.pop(str(path), None)
+        if doc_id is None:
+            return False
+
+        # Only the document's own terms can hold its postings
+        record = self.documents[doc_id]
+        for term in record.terms:
+            postings = self.postings[term]
+            postings.remove(postings.find(doc_id))
+            if not postings.doc_ids:
+                del self.postings[term]
+
+        self.total_length -= record.length
+        self.documents[doc_id] = None
+        self._dirty = True
+        return True
+
+    def update(self, documents: Iterable[ParsedDocument], prune: bool = True) -> int:
+        """
+        Bring the index up to date with a set of documents.
+
+        Args:
+            documents: Current documents of the corpus
+            prune: Remove indexed documents that are not in the set
+
+        Returns:
+            Number of documents added, replaced or removed
+        """
+        changed = 0
+        seen = set()
+        for document in documents:
+            seen.add(str(document.filepath))
+            changed += self.add(document)
+
+        if prune:
+            for path in [path for path in self.doc_ids if path not in seen]:
+                changed += self.remove(path)
+
+        # Reclaim ids once tombstones dominate, keeping postings dense
+        if len(self.documents) > 2 * max(len(self.doc_ids), 1):
+            self._compact()
+        return changed
+
+    def _compact(self) -> None:
+        """Renumber live documents to drop removed ids."""
+        remap = array("i", [-1]) * len(self.documents)
+        documents = []
+        for old_id, record in enumerate(self.documents):
+            if record is not None:
+                remap[old_id] = len(documents)
+                documents.append(record)
+
+        for postings in self.postings.values():
+            postings.doc_ids = array("I", (remap[d] for d in postings.doc_ids))
+
+        self.documents = documents
+        self.doc_ids = {record.path: i for i, record in enumerate(documents)}
+        self._dirty = True
+
+    # ---------------------------------------------------------------- queries
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """
+        Find documents matching every term and phrase of a query.
+
+        Args:
+            query: Words and "quoted phrases"
+            limit: Maximum number of hits
+
+        Returns:
+            Hits ranked by BM25 score, best first
+        """
+        terms, phrases = _parse_query(query)
+        all_terms = list(dict.fromkeys(terms + [t for p in phrases for t in p]))
+        if not all_terms:
+            return []
+
+        postings = [self.postings.get(term) for term in all_terms]
+        if any(p is None for p in postings):
+            return []
+
+        # Intersect, smallest posting list first
+        by_size = sorted(postings, key=lambda p: len(p.doc_ids))
+        candidates = set(by_size[0].doc_ids)
+        for p in by_size[1:]:
+            candidates.intersection_update(p.doc_ids)
+            if not candidates:
+                return []
+
+        lookup = dict(zip(all_terms, postings))
+        for phrase in phrases:
+            candidates = {
+                doc_id for doc_id in candidates
+                if self._phrase_start(lookup, phrase, doc_id) is not None
+            }
+
+        # BM25 over the surviving candidates
+        n_docs = len(self.doc_ids)
+        avg_length = self.total_length / n_docs if n_docs else 0.0
+        scores = dict.fromkeys(candidates, 0.0)
+        for p in postings:
+            df = len(p.doc_ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for i, doc_id in enumerate(p.doc_ids):
+                if doc_id in scores:
+                    tf = p.freqs[i]
+                    length = self.documents[doc_id].length
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            self._hit(doc_id, score, lookup, terms, phrases)
+            for doc_id, score in ranked
+        ]
+
+    def _phrase_start(
+        self,
+        lookup: dict[str, _Postings],
+        phrase: list[str],
+        doc_id: int,
+    ) -> Optional[int]:
+        """Get the first position where a phrase occurs in a doc, if any."""
+        first = lookup[phrase[0]]
+        starts = first.positions_of(first.find(doc_id))
+        following = []
+        for offset, term in enumerate(phrase[1:], 1):
+            p = lookup[term]
+            following.append((offset, set(p.positions_of(p.find(doc_id)))))
+        for start in starts:
+            if all(start + offset in positions for offset, positions in following):
+                return start
+        return None
+
+    def _hit(
+        self,
+        doc_id: int,
+        score: float,
+        lookup: dict[str, _Postings],
+        terms: list[str],
+        phrases: list[list[str]],
+    ) -> SearchHit:
+        record = self.documents[doc_id]
+        positions = []
+        for term in terms:
+            p = lookup[term]
+            positions.extend(p.positions_of(p.find(doc_id))[:3])
+        for phrase in phrases:
+            positions.append(self._phrase_start(lookup, phrase, doc_id))
+
+        sections = []
+        for position in sorted(positions):
+            title = record.section_at(position)
+            if title and title not in sections:
+                sections.append(title)
+
+        return SearchHit(
+            path=record.path,
+            title=record.title,
+            protocol_id=record.protocol_id,
+            score=score,
+            sections=sections,
+        )
+
+    # ------------------------------------------------------------ persistence
+
+    def load(self) -> None:
+        """Load the index file, starting empty if it is stale or unreadable."""
+        self.clear()
+        if self.path is None or not self.path.exists():
+            self._dirty = False
+            return
+
+        payload = load_versioned(self.path, INDEX_VERSION)
+        if payload is None:
+            return
+
+        self.documents = payload["documents"]
+        self.postings = payload["postings"]
+        self.doc_ids = {
+            record.path: i for i, record in enumerate(self.documents) if record is not None
+        }
+        self.total_length = sum(
+            record.length for record in self.documents if record is not None
+        )
+        self._dirty = False
+
+    def save(self) -> bool:
+        """
+        Write the index to disk if anything changed.
+
+        Returns:
+            True if the index file was written
+        """
+        if not self._dirty or self.path is None:
+            return False
+
+        payload = {"documents": self.documents, "postings": self.postings}
+        save_versioned(self.path, INDEX_VERSION, payload, level=1)
+
+        self._dirty = False
+        return True
+
+
+def build_search_index(
+    folder_path: Path | str,
+    index_path: Path | str,
+    cache: Optional[ParseCache] = None,
+    recursive: bool = False,
+    rebuild: bool = False,
+) -> SearchIndex:
+    """
+    Create or incrementally update the search index for a protocol folder.
+
+    Only documents whose content changed are re-indexed; files that
+    disappeared are dropped. The index is saved before returning.
+
+    Args:
+        folder_path: Folder holding the protocol files
+        index_path: Index file (or directory for the default filename)
+        cache: ParseCache to reuse unchanged parses from
+        recursive: Also scan subdirectories
+        rebuild: Discard the existing index first
+
+    Returns:
+        Up-to-date SearchIndex
+    """
+    index = SearchIndex(index_path)
+    if rebuild:
+        index.clear()
+
+    # Indexing reads only the raw content, so skip the structural extractors
+    documents = parse_protocols_by_prefix(
+        folder_path, cache=cache, fields="index", recursive=recursive
+    )
+    index.update(documents)
+    index.save()
+    return index
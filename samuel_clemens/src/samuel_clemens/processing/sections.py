@@ -8,20 +8,56 @@ Section Extraction - Parse structured sections from protocol documents.
 from __future__ import annotations
 
 import re
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, Iterator
+
+from samuel_clemens.processing.tables import TableColumn, table_columns
+from samuel_clemens.processing.tokens import TokenKind, TokenStream, as_token_stream
+
+
+_TITLE_EMOJI = re.compile(r"^([^\w\s])\s*(.+)$")
+_ATTRIBUTION = re.compile(r"[-—]\s*(.+)$")
 
 
 @dataclass
 class Section:
-    """Represents a section in a document."""
+    """
+    Represents a section in a document.
+    
+    A section is a view into its owning document: it keeps a reference to
+    the document buffer plus (start, end) character offsets, and only
+    materializes ``content`` when asked. Nested sections share the buffer
+    instead of holding copies of their text.
+    """
     title: str
     level: int  # 1 for H1, 2 for H2, etc.
-    content: str
+    source: str = field(repr=False)  # Owning document buffer
     start_line: int
     end_line: int
     emoji: Optional[str] = None
     subsections: list["Section"] = field(default_factory=list)
+    start: int = 0  # Character offsets of content within source
+    end: Optional[int] = None  # None means end of source
+    
+    @property
+    def content(self) -> str:
+        """Section text (including subsections), sliced on access."""
+        return self.source[self.start:self.end]
+    
+    @property
+    def own_content(self) -> str:
+        """Section text up to the heading of its first subsection."""
+        if not self.subsections:
+            return self.content
+        # Cut at the first subsection's heading line, counted from this
+        # section's start; the subsection's own offsets are (0, 0) when
+        # its body is empty, so they cannot locate the heading
+        source = self.source
+        cut = self.start
+        for _ in range(self.subsections[0].start_line - 1 - self.start_line):
+            cut = source.index("\n", cut) + 1
+        return source[self.start:cut]
     
     @property
     def plain_title(self) -> str:
@@ -51,6 +87,10 @@ class TableData:
     @property
     def num_rows(self) -> int:
         return len(self.rows)
+    
+    def to_columns(self) -> list[TableColumn]:
+        """Typed columns (int, float, percent, currency or string), in header order."""
+        return table_columns(self)
 
 
 @dataclass
@@ -66,16 +106,23 @@ class MetadataBlock:
     @classmethod
     def from_text(cls, text: str) -> "MetadataBlock":
         """Parse metadata from text block."""
-        metadata = cls()
-        
         # Pattern for **Field:** Value or **Field:** Value
         pattern = r"\*\*([^:*]+):\*\*\s*(.+)"
         
-        for match in re.finditer(pattern, text):
-            field_name = match.group(1).strip().lower()
-            value = match.group(2).strip()
+        return cls.from_fields(
+            (match.group(1).strip(), match.group(2).strip())
+            for match in re.finditer(pattern, text)
+        )
+    
+    @classmethod
+    def from_fields(cls, fields: Iterable[tuple[str, str]]) -> "MetadataBlock":
+        """Build metadata from (field name, value) pairs."""
+        metadata = cls()
+        
+        for name, value in fields:
+            field_name = name.lower()
             
-            metadata.raw_fields[match.group(1).strip()] = value
+            metadata.raw_fields[name] = value
             
             if "protocol" in field_name and "number" in field_name:
                 metadata.protocol_number = value
@@ -99,223 +146,239 @@ class Quote:
     line_number: int = 0
 
 
-def extract_sections(text: str) -> list[Section]:
+def _title_emoji(title: str) -> Optional[str]:
+    """Get the emoji prefix of a heading title, if any."""
+    emoji_match = _TITLE_EMOJI.match(title)
+    if emoji_match:
+        potential_emoji = emoji_match.group(1)
+        # Check if it's an emoji (simplified check)
+        if ord(potential_emoji[0]) > 127:
+            return potential_emoji
+    return None
+
+
+def extract_sections(text: str | TokenStream) -> list[Section]:
     """
     Extract all sections from markdown text.
     
+    Builds the hierarchy in a single pass over the headings, keeping a
+    stack of open sections. A heading closes every open section of the
+    same or deeper level and records its content as character offsets
+    into the document.
+    
     Args:
-        text: Markdown text
+        text: Markdown text or a pre-built TokenStream
         
     Returns:
         List of Section objects (hierarchical)
     """
-    lines = text.split("\n")
+    stream = as_token_stream(text)
     sections: list[Section] = []
-    current_sections: dict[int, Section] = {}  # level -> current section
+    open_sections: list[Section] = []  # Levels strictly increasing
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for heading in stream.of_kind(TokenKind.HEADING):
+        level = heading.number
         
-        # Check for heading
-        heading_match = re.match(r"^(#{1,6})\s+(.+)$", line)
+        # Close sections ended by this heading
+        while open_sections and open_sections[-1].level >= level:
+            _close_section(stream, open_sections.pop(), heading.line)
         
-        if heading_match:
-            level = len(heading_match.group(1))
-            title = heading_match.group(2).strip()
-            
-            # Extract emoji if present
-            emoji = None
-            emoji_match = re.match(r"^([^\w\s])\s*(.+)$", title)
-            if emoji_match:
-                potential_emoji = emoji_match.group(1)
-                # Check if it's an emoji (simplified check)
-                if ord(potential_emoji[0]) > 127:
-                    emoji = potential_emoji
-            
-            # Find section content (until next heading of same or higher level)
-            content_lines = []
-            j = i + 1
-            while j < len(lines):
-                next_line = lines[j]
-                next_heading = re.match(r"^(#{1,6})\s+", next_line)
-                if next_heading and len(next_heading.group(1)) <= level:
-                    break
-                content_lines.append(next_line)
-                j += 1
-            
-            section = Section(
-                title=title,
-                level=level,
-                content="\n".join(content_lines),
-                start_line=i + 1,  # 1-indexed
-                end_line=j,
-                emoji=emoji,
-            )
-            
-            # Add to hierarchy
-            if level == 1:
-                sections.append(section)
-            else:
-                # Find parent section
-                for parent_level in range(level - 1, 0, -1):
-                    if parent_level in current_sections:
-                        current_sections[parent_level].subsections.append(section)
-                        break
-                else:
-                    # No parent found, add as top-level
-                    sections.append(section)
-            
-            current_sections[level] = section
-            i = j
+        section = Section(
+            title=heading.text,
+            level=level,
+            source=stream.text,
+            start_line=heading.line + 1,  # 1-indexed
+            end_line=heading.line + 1,
+            emoji=_title_emoji(heading.text),
+        )
+        
+        # Nearest open shallower section is the parent
+        if open_sections:
+            open_sections[-1].subsections.append(section)
         else:
-            i += 1
+            sections.append(section)
+        
+        open_sections.append(section)
+    
+    # Whatever is still open runs to the end of the document
+    while open_sections:
+        _close_section(stream, open_sections.pop(), stream.line_count)
     
     return sections
 
 
-def extract_metadata(text: str) -> MetadataBlock:
+def _close_section(stream: TokenStream, section: Section, end_line: int) -> None:
+    """Set a section's end line and content offsets once its closing line is known."""
+    section.end_line = end_line
+    section.start, section.end = stream.line_span(section.start_line, end_line)
+
+
+def extract_metadata(text: str | TokenStream) -> MetadataBlock:
     """
     Extract metadata block from protocol document.
     
     Args:
-        text: Document text
+        text: Document text or a pre-built TokenStream
         
     Returns:
         MetadataBlock with extracted fields
     """
-    lines = text.split("\n")
-    
-    # Find metadata section (typically after title, before first major section)
-    metadata_text = ""
-    in_metadata = False
+    stream = as_token_stream(text)
+    lines = stream.lines
     
+    # Find metadata region (typically after title, before first major section)
+    start: Optional[int] = None
+    stop = len(lines)
     for i, line in enumerate(lines):
         # Skip title
         if line.startswith("# "):
-            in_metadata = True
+            if start is None:
+                start = i
             continue
         
         # Stop at first section or horizontal rule preceded by blank line
-        if in_metadata:
+        if start is not None:
             if line.startswith("## "):
+                stop = i
                 break
             if line.strip() == "---" and i > 0 and lines[i-1].strip() == "":
+                stop = i
                 break
-            metadata_text += line + "\n"
     
-    return MetadataBlock.from_text(metadata_text)
+    if start is None:
+        return MetadataBlock()
+    
+    return MetadataBlock.from_fields(
+        (token.text, token.value or "")
+        for token in stream.of_kind(TokenKind.METADATA)
+        if start < token.line < stop and not lines[token.line].startswith("# ")
+    )
+
+
+def _table_cells(line: str) -> list[str]:
+    """Split a table row into stripped cells, keeping empty inner cells."""
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|"):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split("|")]
 
 
-def extract_tables(text: str) -> list[TableData]:
+def extract_tables(text: str | TokenStream) -> list[TableData]:
     """
     Extract all tables from markdown text.
     
     Args:
-        text: Markdown text
+        text: Markdown text or a pre-built TokenStream
         
     Returns:
         List of TableData objects
     """
+    stream = as_token_stream(text)
+    lines = stream.lines
+    row_lines = stream.lines_of_kind(TokenKind.TABLE_ROW)
+    separator_lines = stream.lines_of_kind(TokenKind.TABLE_SEPARATOR)
     tables = []
-    lines = text.split("\n")
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    next_line = 0
+    for token in stream.of_kind(TokenKind.TABLE_ROW):
+        start_line = token.line
         
-        # Check for table header (contains |)
-        if "|" in line and i + 1 < len(lines) and re.match(r"^\|[-:\s|]+\|$", lines[i + 1].strip()):
-            # Found table
-            start_line = i
-            
-            # Parse header
-            headers = [cell.strip() for cell in line.split("|") if cell.strip()]
-            
-            # Skip separator
-            i += 2
-            
-            # Parse rows
-            rows = []
-            while i < len(lines) and "|" in lines[i]:
-                row = [cell.strip() for cell in lines[i].split("|") if cell.strip()]
-                if row:
-                    rows.append(row)
-                i += 1
-            
-            tables.append(TableData(
-                headers=headers,
-                rows=rows,
-                start_line=start_line + 1,
-                end_line=i,
-            ))
-        else:
+        # A table header is a row followed by a separator
+        if start_line < next_line or start_line + 1 not in separator_lines:
+            continue
+        
+        # Parse header
+        headers = _table_cells(lines[start_line])
+        
+        # Parse rows after the separator
+        rows = []
+        i = start_line + 2
+        while i in row_lines:
+            row = _table_cells(lines[i])
+            if any(row):
+                rows.append(row)
             i += 1
+        
+        tables.append(TableData(
+            headers=headers,
+            rows=rows,
+            start_line=start_line + 1,
+            end_line=i,
+        ))
+        next_line = i
     
     return tables
 
 
-def extract_quotes(text: str) -> list[Quote]:
+def extract_quotes(text: str | TokenStream) -> list[Quote]:
     """
     Extract all blockquotes from markdown text.
     
     Args:
-        text: Markdown text
+        text: Markdown text or a pre-built TokenStream
         
     Returns:
         List of Quote objects
     """
+    stream = as_token_stream(text)
+    lines = stream.lines
     quotes = []
-    lines = text.split("\n")
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    next_line = 0
+    for token in stream.of_kind(TokenKind.BLOCKQUOTE):
+        if token.line < next_line:
+            continue
         
-        if line.startswith(">"):
-            # Found quote
-            quote_lines = []
-            start_line = i
-            
-            while i < len(lines) and (lines[i].startswith(">") or lines[i].strip() == ""):
-                content = lines[i].lstrip("> ").strip()
-                if content:
-                    quote_lines.append(content)
-                i += 1
-                if lines[i - 1].strip() == "" and i < len(lines) and not lines[i].startswith(">"):
-                    break
-            
-            quote_text = " ".join(quote_lines)
-            
-            # Check for attribution
-            attribution = None
-            attr_match = re.search(r"[-—]\s*(.+)$", quote_text)
-            if attr_match:
-                attribution = attr_match.group(1).strip()
-                quote_text = quote_text[:attr_match.start()].strip()
-            
-            quotes.append(Quote(
-                text=quote_text,
-                attribution=attribution,
-                line_number=start_line + 1,
-            ))
-        else:
+        # Found quote
+        quote_lines = []
+        start_line = token.line
+        
+        i = start_line
+        while i < len(lines) and (lines[i].startswith(">") or lines[i].strip() == ""):
+            content = lines[i].lstrip("> ").strip()
+            if content:
+                quote_lines.append(content)
             i += 1
+            if lines[i - 1].strip() == "" and i < len(lines) and not lines[i].startswith(">"):
+                break
+        next_line = i
+        
+        quote_text = " ".join(quote_lines)
+        
+        # Check for attribution
+        attribution = None
+        attr_match = _ATTRIBUTION.search(quote_text)
+        if attr_match:
+            attribution = attr_match.group(1).strip()
+            quote_text = quote_text[:attr_match.start()].strip()
+        
+        quotes.append(Quote(
+            text=quote_text,
+            attribution=attribution,
+            line_number=start_line + 1,
+        ))
     
     return quotes
 
 
-def extract_conclusion(text: str) -> Optional[Section]:
+def extract_conclusion(
+    text: str | TokenStream,
+    sections: Optional[list[Section]] = None,
+) -> Optional[Section]:
     """
     Extract conclusion section from protocol document.
     
     Args:
-        text: Document text
+        text: Document text or a pre-built TokenStream
+        sections: Already extracted sections (avoids re-extraction)
         
     Returns:
         Conclusion Section if found
     """
-    sections = extract_sections(text)
+    if sections is None:
+        sections = extract_sections(text)
     
     for section in sections:
         if "CONCLUSION" in section.title.upper():
@@ -329,56 +392,56 @@ def extract_conclusion(text: str) -> Optional[Section]:
     return None
 
 
-def extract_checkmarks(text: str) -> list[str]:
+def extract_checkmarks(text: str | TokenStream) -> list[str]:
     """
     Extract all checkmark items from text.
     
     Args:
-        text: Document text
+        text: Document text or a pre-built TokenStream
         
     Returns:
         List of items with checkmarks
     """
-    pattern = r"[✅✓☑]\s*\*?\*?([^*\n]+)"
-    matches = re.findall(pattern, text)
-    return [m.strip() for m in matches]
+    stream = as_token_stream(text)
+    return [token.text for token in stream.of_kind(TokenKind.CHECKMARK)]
 
 
-def extract_protocol_references(text: str) -> list[tuple[int, str]]:
+def extract_protocol_references(text: str | TokenStream) -> list[tuple[int, str]]:
     """
     Extract references to other protocols.
     
     Args:
-        text: Document text
+        text: Document text or a pre-built TokenStream
         
     Returns:
         List of (protocol_number, description) tuples
     """
-    references = []
-    
-    # Pattern: Protocol XX: Description or PROTOCOL XX or P+number
-    patterns = [
-        r"Protocol\s+(\d+):\s*([^\n]+)",
-        r"PROTOCOL\s+(\d+):\s*([^\n]+)",
-        r"Protocol\s+(\d+)",
-        r"P(\d+)",
-    ]
+    stream = as_token_stream(text)
     
-    for pattern in patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            num = int(match.group(1))
-            desc = match.group(2).strip() if len(match.groups()) > 1 else ""
-            references.append((num, desc))
+    # Pattern: Protocol XX: Description or PROTOCOL XX or P+number.
+    # The first described mention of a number wins; bare mentions add "".
+    descriptions: dict[int, str] = {}
+    mentioned: set[int] = set()
+    for token in stream.of_kind(TokenKind.REFERENCE):
+        if token.value is not None and token.number not in descriptions:
+            descriptions[token.number] = token.value
+        mentioned.add(token.number)
     
-    # Deduplicate
-    seen = set()
-    unique = []
-    for num, desc in references:
-        if num not in seen:
-            seen.add(num)
-            unique.append((num, desc))
+    return [(num, descriptions.get(num, "")) for num in sorted(mentioned)]
+
+
+def extract_referenced_numbers(text: str | TokenStream) -> array:
+    """
+    Get the distinct protocol numbers a document references.
     
-    return sorted(unique, key=lambda x: x[0])
+    Args:
+        text: Document text or a pre-built TokenStream
+        
+    Returns:
+        Sorted array('I') of protocol numbers
+    """
+    stream = as_token_stream(text)
+    return array("I", sorted({token.number for token in stream.of_kind(TokenKind.REFERENCE)}))
 
 
 def get_section_by_emoji(sections: list[Section], emoji: str) -> Optional[Section]:
@@ -417,3 +480,20 @@ def get_all_section_titles(sections: list[Section]) -> list[str]:
         for sub in section.subsections:
             titles.append(sub.title)
     return titles
+
+
+def walk_sections(sections: list[Section]) -> Iterator[Section]:
+    """
+    Walk a section tree in document order, depth-first.
+    
+    Args:
+        sections: Top-level sections
+        
+    Yields:
+        Every section and subsection
+    """
+    pending = list(reversed(sections))
+    while pending:
+        section = pending.pop()
+        yield section
+        pending.extend(reversed(section.subsections))
@@ -0,0 +1,449 @@
+"""
+Corpus Snapshot - Columnar, memory-mappable summary of a parsed corpus.
+
+"Plan for the future because that's where you are going to spend the
+rest of your life." — Mark Twain
+
+A snapshot holds the numbers and names most commands need (counts,
+titles, status, sections, tables, references) as flat typed columns in
+one file. Opening it maps the file and casts each column to a
+memoryview: no unpickling and no per-document objects, so a corpus of
+tens of thousands of documents opens in milliseconds. Rows are built
+on demand when a command asks for one.
+
+Layout (header and directory little-endian; columns in the writer's
+native byte order, recorded in the header and checked on open; every
+column 8-byte aligned):
+
+    header     magic, version, document count, column count, source signature
+    directory  (name, typecode, offset, length) per column
+    columns    string table + per-document and variable-length columns
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from samuel_clemens.processing.cache import ParseCache
+from samuel_clemens.processing.parser import (
+    ParsedDocument,
+    ProtocolDocument,
+    _scan_protocol_entries,
+    parse_protocols_by_prefix,
+)
+
+
+# Bump whenever the column set or layout changes
+SNAPSHOT_VERSION = 1
+
+DEFAULT_SNAPSHOT_FILENAME = "corpus_snapshot.bin"
+
+_MAGIC = b"TWAINSNP"
+_HEADER = struct.Struct("<8sHBxII16s")  # magic, version, byteorder, docs, columns, signature
+_COLUMN = struct.Struct("<24sc7xQQ")  # name, typecode, offset, length (items)
+_BYTEORDER = 1 if sys.byteorder == "little" else 2
+
+NO_STRING = 0xFFFFFFFF
+NO_NUMBER = -1
+
+# status_code bits
+STATUS_OPERATIONAL = 1
+STATUS_EMERGENT = 2
+
+# Per-document columns, then variable-length columns addressed by
+# *_offsets (document i owns items offsets[i]:offsets[i + 1])
+_COLUMNS = {
+    "string_offsets": "Q",
+    "string_data": "B",
+    "kind": "B",  # 0 document, 1 protocol
+    "filepath": "I",  # String ids
+    "title": "I",
+    "category": "I",
+    "status": "I",
+    "protocol_number": "i",
+    "status_code": "B",
+    "word_count": "I",
+    "line_count": "I",
+    "emoji_count": "I",
+    "mtime_ns": "q",  # Source file stat when the snapshot was written
+    "size": "Q",
+    "section_offsets": "I",
+    "section_title": "I",
+    "section_level": "B",
+    "table_offsets": "I",
+    "table_rows": "I",
+    "table_columns": "I",
+    "reference_offsets": "I",
+    "reference_numbers": "I",
+}
+
+
+@dataclass
+class SnapshotRecord:
+    """One document's row, materialized from the snapshot columns."""
+    filepath: str
+    title: Optional[str]
+    protocol_number: Optional[int]
+    category: Optional[str]
+    status: Optional[str]
+    word_count: int
+    line_count: int
+    emoji_count: int
+    is_protocol: bool
+    is_operational: bool
+    is_emergent: bool
+    sections: list[tuple[str, int]]  # (title, level), outline order
+    tables: list[tuple[int, int]]  # (rows, columns)
+    references: list[int]
+
+    @property
+    def protocol_id(self) -> Optional[str]:
+        return f"P{self.protocol_number}" if self.protocol_number is not None else None
+
+
+def source_signature(stats: Iterable[tuple[str, int, int]]) -> bytes:
+    """
+    Hash the source files a snapshot was built from.
+
+    Args:
+        stats: (path, mtime_ns, size) per source file
+
+    Returns:
+        16-byte digest that changes when any file is added, removed or touched
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path, mtime_ns, size in sorted(stats):
+        digest.update(f"{path}\0{mtime_ns}\0{size}\n".encode("utf-8", "surrogateescape"))
+    return digest.digest()
+
+
+def _file_stat(path: Path) -> tuple[int, int]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 0, 0
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_corpus_snapshot(
+    documents: Iterable[ParsedDocument],
+    path: Path | str,
+) -> Path:
+    """
+    Write a columnar snapshot of parsed documents.
+
+    Args:
+        documents: Parsed documents (fields deferred by projection are loaded)
+        path: Snapshot file (or directory for the default filename)
+
+    Returns:
+        Path to the snapshot file
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / DEFAULT_SNAPSHOT_FILENAME
+
+    columns = {name: array(typecode) for name, typecode in _COLUMNS.items()}
+    strings: dict[str, int] = {}
+    string_data = bytearray()
+    string_offsets = columns["string_offsets"]
+    string_offsets.append(0)
+
+    def intern(text: Optional[str]) -> int:
+        if text is None:
+            return NO_STRING
+        sid = strings.get(text)
+        if sid is None:
+            sid = strings[text] = len(strings)
+            string_data.extend(text.encode("utf-8", "surrogateescape"))
+            string_offsets.append(len(string_data))
+        return sid
+
+    for name in ("section_offsets", "table_offsets", "reference_offsets"):
+        columns[name].append(0)
+
+    sources = []
+    for doc in documents:
+        is_protocol = isinstance(doc, ProtocolDocument)
+        filepath = str(doc.filepath)
+        mtime_ns, size = _file_stat(doc.filepath)
+        sources.append((filepath, mtime_ns, size))
+
+        columns["kind"].append(1 if is_protocol else 0)
+        columns["filepath"].append(intern(filepath))
+        columns["title"].append(intern(doc.title))
+        columns["word_count"].append(doc.word_count)
+        columns["line_count"].append(doc.line_count)
+        columns["emoji_count"].append(doc.emoji_count)
+        columns["mtime_ns"].append(mtime_ns)
+        columns["size"].append(size)
+
+        if is_protocol:
+            columns["category"].append(intern(doc.category))
+            columns["status"].append(intern(doc.status))
+            number = doc.protocol_number
+            columns["protocol_number"].append(NO_NUMBER if number is None else number)
+            columns["status_code"].append(
+                (STATUS_OPERATIONAL if doc.is_operational else 0)
+                | (STATUS_EMERGENT if doc.is_emergent else 0)
+            )
+            columns["reference_numbers"].extend(doc.referenced_numbers)
+        else:
+            columns["category"].append(NO_STRING)
+            columns["status"].append(NO_STRING)
+            columns["protocol_number"].append(NO_NUMBER)
+            columns["status_code"].append(0)
+
+        # Sections flattened in outline order; the level keeps the nesting
+        pending = list(reversed(doc.sections))
+        while pending:
+            section = pending.pop()
+            columns["section_title"].append(intern(section.title))
+            columns["section_level"].append(min(section.level, 255))
+            pending.extend(reversed(section.subsections))
+
+        for table in doc.tables:
+            columns["table_rows"].append(table.num_rows)
+            columns["table_columns"].append(len(table.headers))
+
+        columns["section_offsets"].append(len(columns["section_title"]))
+        columns["table_offsets"].append(len(columns["table_rows"]))
+        columns["reference_offsets"].append(len(columns["reference_numbers"]))
+
+    columns["string_data"] = array("B", bytes(string_data))
+
+    # Header and directory, then each column at an 8-byte boundary
+    offset = _HEADER.size + _COLUMN.size * len(columns)
+    directory = []
+    for name, column in columns.items():
+        offset += -offset % 8
+        directory.append((name, column, offset))
+        offset += len(column) * column.itemsize
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(
+            _MAGIC, SNAPSHOT_VERSION, _BYTEORDER,
+            len(columns["kind"]), len(columns), source_signature(sources),
+        ))
+        for name, column, column_offset in directory:
+            handle.write(_COLUMN.pack(
+                name.encode("ascii"), column.typecode.encode("ascii"), column_offset, len(column)
+            ))
+        for name, column, column_offset in directory:
+            handle.write(b"\0" * (column_offset - handle.tell()))
+            column.tofile(handle)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class CorpusSnapshot:
+    """
+    Read-only, memory-mapped view of a corpus snapshot.
+
+    Per-document columns (word_count, line_count, emoji_count,
+    protocol_number, status_code, ...) are exposed as memoryviews, so
+    aggregates like ``sum(snapshot.word_count)`` never build documents.
+
+    Column views, and slices of them, point into the mapped file and
+    should not outlive the snapshot. If a slice is still held when the
+    snapshot closes, the file stays mapped until that slice is released.
+
+    Usage:
+        with CorpusSnapshot(cache_dir) as snapshot:
+            total = sum(snapshot.word_count)
+            row = snapshot.record(snapshot.find(92))
+    """
+
+    def __init__(self, path: Path | str):
+        path = Path(path)
+        if path.is_dir():
+            path = path / DEFAULT_SNAPSHOT_FILENAME
+        self.path = path
+
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._columns = self._map_columns()
+        except Exception:
+            self._mmap.close()
+            raise
+        self._numbers: Optional[dict[int, int]] = None
+
+    def _map_columns(self) -> dict[str, memoryview]:
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Not a corpus snapshot: {self.path}")
+        magic, version, byteorder, count, n_columns, signature = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a corpus snapshot: {self.path}")
+        if version != SNAPSHOT_VERSION or byteorder != _BYTEORDER:
+            raise ValueError(f"Incompatible corpus snapshot (version {version}): {self.path}")
+        self.signature = signature
+        self._count = count
+
+        view = memoryview(self._mmap)
+        columns = {}
+        for i in range(n_columns):
+            name, typecode, offset, length = _COLUMN.unpack_from(
+                self._mmap, _HEADER.size + i * _COLUMN.size
+            )
+            typecode = typecode.decode("ascii")
+            size = array(typecode).itemsize * length
+            columns[name.rstrip(b"\0").decode("ascii")] = view[offset:offset + size].cast(typecode)
+        return columns
+
+    def __getattr__(self, name: str) -> memoryview:
+        # Columns read like attributes: snapshot.word_count, snapshot.status_code, ...
+        columns = self.__dict__.get("_columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "CorpusSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the column views and unmap the file."""
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a slice of a column; the map is freed
+            # once the last such slice is released
+            pass
+
+    # ---------------------------------------------------------------- access
+
+    def string(self, sid: int) -> Optional[str]:
+        """Look up a string id (None for NO_STRING)."""
+        if sid == NO_STRING:
+            return None
+        offsets = self._columns["string_offsets"]
+        data = self._columns["string_data"]
+        return bytes(data[offsets[sid]:offsets[sid + 1]]).decode("utf-8", "surrogateescape")
+
+    def _span(self, name: str, i: int) -> slice:
+        offsets = self._columns[name]
+        return slice(offsets[i], offsets[i + 1])
+
+    def sections(self, i: int) -> list[tuple[str, int]]:
+        """(title, level) of document i's sections, in outline order."""
+        span = self._span("section_offsets", i)
+        titles = self._columns["section_title"][span]
+        levels = self._columns["section_level"][span]
+        return [(self.string(sid), level) for sid, level in zip(titles, levels)]
+
+    def tables(self, i: int) -> list[tuple[int, int]]:
+        """(rows, columns) of document i's tables."""
+        span = self._span("table_offsets", i)
+        return list(zip(self._columns["table_rows"][span], self._columns["table_columns"][span]))
+
+    def references(self, i: int) -> list[int]:
+        """Protocol numbers document i references (sorted, distinct)."""
+        return self._columns["reference_numbers"][self._span("reference_offsets", i)].tolist()
+
+    def find(self, protocol_number: int) -> Optional[int]:
+        """Row of the first document with a protocol number, or None."""
+        if self._numbers is None:
+            self._numbers = {}
+            for i, number in enumerate(self._columns["protocol_number"]):
+                if number != NO_NUMBER:
+                    self._numbers.setdefault(number, i)
+        return self._numbers.get(protocol_number)
+
+    def record(self, i: int) -> SnapshotRecord:
+        """
+        Materialize one document's row.
+
+        Args:
+            i: Row index (0 <= i < len(snapshot))
+
+        Returns:
+            SnapshotRecord
+        """
+        if not 0 <= i < self._count:
+            raise IndexError(f"Snapshot row {i} out of range")
+        c = self._columns
+        number = c["protocol_number"][i]
+        code = c["status_code"][i]
+        return SnapshotRecord(
+            filepath=self.string(c["filepath"][i]),
+            title=self.string(c["title"][i]),
+            protocol_number=None if number == NO_NUMBER else number,
+            category=self.string(c["category"][i]),
+            status=self.string(c["status"][i]),
+            word_count=c["word_count"][i],
+            line_count=c["line_count"][i],
+            emoji_count=c["emoji_count"][i],
+            is_protocol=bool(c["kind"][i]),
+            is_operational=bool(code & STATUS_OPERATIONAL),
+            is_emergent=bool(code & STATUS_EMERGENT),
+            sections=self.sections(i),
+            tables=self.tables(i),
+            references=self.references(i),
+        )
+
+
+def load_corpus_snapshot(
+    folder_path: Path | str,
+    snapshot_path: Path | str,
+    cache: Optional[ParseCache] = None,
+    recursive: bool = False,
+) -> CorpusSnapshot:
+    """
+    Open the snapshot of a protocol folder, rewriting it only when stale.
+
+    Freshness is checked from a directory scan alone (paths, mtimes and
+    sizes against the signature in the header), so an up-to-date
+    snapshot opens without parsing anything.
+
+    Args:
+        folder_path: Folder holding the protocol files
+        snapshot_path: Snapshot file (or directory for the default filename)
+        cache: ParseCache to reuse unchanged parses from on a rewrite
+        recursive: Also scan subdirectories
+
+    Returns:
+        Open CorpusSnapshot (close it, or use it as a context manager)
+    """
+    snapshot_path = Path(snapshot_path)
+    if snapshot_path.is_dir():
+        snapshot_path = snapshot_path / DEFAULT_SNAPSHOT_FILENAME
+
+    sources = []
+    for entry in _scan_protocol_entries(folder_path, recursive=recursive):
+        stat = entry.stat()
+        sources.append((str(Path(entry.path)), stat.st_mtime_ns, stat.st_size))
+    signature = source_signature(sources)
+
+    if snapshot_path.exists():
+        try:
+            snapshot = CorpusSnapshot(snapshot_path)
+        except (OSError, ValueError):
+            snapshot = None
+        if snapshot is not None:
+            if snapshot.signature == signature:
+                return snapshot
+            snapshot.close()
+
+    documents = parse_protocols_by_prefix(folder_path, cache=cache, recursive=recursive)
+    write_corpus_snapshot(documents, snapshot_path)
+    return CorpusSnapshot(snapshot_path)
@@ -0,0 +1,190 @@
+"""
+Corpus Stats - One-pass, mergeable aggregates behind the folder reports.
+
+"Figures often beguile me, particularly when I have the arranging of them
+myself." — Mark Twain
+
+The summary, emoji, structure and index reports all draw on the same
+per-document numbers. CorpusStats collects them in a single walk over the
+corpus; partial stats built over separate chunks (e.g. in worker
+processes) merge into the same result as one walk over the whole list,
+as long as they are merged in chunk order.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from samuel_clemens.processing.parser import ParsedDocument, ProtocolDocument
+
+
+@dataclass
+class DocumentStats:
+    """The per-document numbers the reports need."""
+    filename: str
+    title: Optional[str]
+    word_count: int
+    line_count: int
+    emoji_count: int
+    is_protocol: bool = False
+    protocol_number: Optional[int] = None
+    protocol_id: Optional[str] = None
+    category: Optional[str] = None
+    is_operational: bool = False
+    is_emergent: bool = False
+    referenced_numbers: array = field(default_factory=lambda: array("I"))
+
+
+@dataclass
+class EmojiTally:
+    """Corpus-wide usage of one emoji."""
+    char: str
+    name: str
+    category: str
+    count: int = 0
+    documents: set[str] = field(default_factory=set)  # Filenames using it
+
+
+@dataclass
+class CorpusStats:
+    """
+    Aggregated statistics of a document corpus.
+
+    Usage:
+        stats = CorpusStats.from_documents(protocols)
+
+        # Or map-reduce style over chunks
+        stats = CorpusStats.combine(CorpusStats.from_documents(c) for c in chunks)
+    """
+    documents: list[DocumentStats] = field(default_factory=list)
+    total_words: int = 0
+    total_lines: int = 0
+    total_emojis: int = 0
+    emojis: dict[str, EmojiTally] = field(default_factory=dict)
+    section_titles: dict[str, int] = field(default_factory=dict)  # Normalized title -> documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[ParsedDocument]) -> "CorpusStats":
+        """
+        Collect stats in one pass over the documents.
+
+        Args:
+            documents: Parsed documents
+
+        Returns:
+            CorpusStats
+        """
+        stats = cls()
+        for doc in documents:
+            stats.add(doc)
+        return stats
+
+    @classmethod
+    def combine(cls, parts: Iterable["CorpusStats"]) -> "CorpusStats":
+        """
+        Merge partial stats, in order, into a new CorpusStats.
+
+        Args:
+            parts: Stats of consecutive chunks of the corpus
+
+        Returns:
+            CorpusStats
+        """
+        stats = cls()
+        for part in parts:
+            stats.merge(part)
+        return stats
+
+    def add(self, doc: ParsedDocument) -> None:
+        """Fold one document into the stats."""
+        row = DocumentStats(
+            filename=doc.filename,
+            title=doc.title,
+            word_count=doc.word_count,
+            line_count=doc.line_count,
+            emoji_count=doc.emoji_count,
+        )
+        if isinstance(doc, ProtocolDocument):
+            row.is_protocol = True
+            row.protocol_number = doc.protocol_number
+            row.protocol_id = doc.protocol_id
+            row.category = doc.category
+            row.is_operational = doc.is_operational
+            row.is_emergent = doc.is_emergent
+            row.referenced_numbers = doc.referenced_numbers
+        self.documents.append(row)
+
+        self.total_words += doc.word_count
+        self.total_lines += doc.line_count
+        self.total_emojis += doc.emoji_count
+
+        for emoji in doc.emojis:
+            tally = self.emojis.get(emoji.char)
+            if tally is None:
+                tally = self.emojis[emoji.char] = EmojiTally(
+                    char=emoji.char, name=emoji.name, category=emoji.category
+                )
+            tally.count += emoji.count
+            tally.documents.add(doc.filename)
+
+        for section in doc.sections:
+            title = section.plain_title.upper()
+            self.section_titles[title] = self.section_titles.get(title, 0) + 1
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        """
+        Fold another chunk's stats into these (other comes after self).
+
+        Args:
+            other: Stats of the following chunk
+
+        Returns:
+            self
+        """
+        self.documents.extend(other.documents)
+        self.total_words += other.total_words
+        self.total_lines += other.total_lines
+        self.total_emojis += other.total_emojis
+
+        for char, theirs in other.emojis.items():
+            tally = self.emojis.get(char)
+            if tally is None:
+                tally = self.emojis[char] = EmojiTally(
+                    char=char, name=theirs.name, category=theirs.category
+                )
+            tally.count += theirs.count
+            tally.documents |= theirs.documents
+
+        for title, count in other.section_titles.items():
+            self.section_titles[title] = self.section_titles.get(title, 0) + count
+        return self
+
+    @property
+    def protocols(self) -> list[DocumentStats]:
+        """Rows of the protocol documents, in corpus order."""
+        return [row for row in self.documents if row.is_protocol]
+
+    @property
+    def total_emoji_uses(self) -> int:
+        """Sum of all emoji occurrences (by emoji tally)."""
+        return sum(tally.count for tally in self.emojis.values())
+
+    def top_emojis(self, limit: Optional[int] = None) -> list[EmojiTally]:
+        """Emojis by descending use (first seen wins ties)."""
+        return sorted(self.emojis.values(), key=lambda t: -t.count)[:limit]
+
+    def emoji_categories(self) -> dict[str, int]:
+        """Emoji uses per category, by descending use."""
+        counts: dict[str, int] = {}
+        for tally in self.emojis.values():
+            counts[tally.category] = counts.get(tally.category, 0) + tally.count
+        return dict(sorted(counts.items(), key=lambda x: -x[1]))
+
+    def common_sections(self, limit: Optional[int] = None) -> list[tuple[str, int]]:
+        """Normalized section titles by descending use."""
+        return sorted(self.section_titles.items(), key=lambda x: -x[1])[:limit]
@@ -0,0 +1,289 @@
+"""
+Typed Tables - Columnar, type-inferred views of markdown tables.
+
+"Data is like garbage. You'd better know what you are going to do with it
+before you collect it." — Mark Twain
+
+Table cells are extracted as raw strings ("**$9.8B**", "99.999%+",
+"97,656.2"). Here each column's kind is inferred once, by matching all of
+its cells against one pattern per kind, and the column is then coerced
+in a single pass into a flat array:
+
+- int: array("q")
+- float: array("d")
+- percent: array("d") of fractions ("30%" -> 0.3)
+- currency: array("d") of dollars ("$9.8B" -> 9.8e9)
+- string: list of cleaned cells
+
+Missing cells ("", "-", "N/A") are NaN in float-backed columns and None
+in string columns; an int column with a missing cell becomes float.
+Tables from a whole corpus stack into one StackedTable by header name,
+so aggregates over hundreds of tables read a single array per column.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from samuel_clemens.processing.parser import ParsedDocument
+    from samuel_clemens.processing.sections import TableData
+
+
+INT = "int"
+FLOAT = "float"
+PERCENT = "percent"
+CURRENCY = "currency"
+STRING = "string"
+
+NUMERIC_KINDS = frozenset({INT, FLOAT, PERCENT, CURRENCY})
+
+_MISSING = frozenset({"", "-", "—", "–", "n/a", "na", "none", "tbd", "?"})
+
+_EMPHASIS = re.compile(r"^(\*\*|__|\*|_|`)(.+)\1$")
+
+# Thousands separators are accepted only in their proper places
+_NUMBER = r"[-+−]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|[-+−]?\.\d+"
+_INT_CELL = re.compile(r"[-+−]?(?:\d{1,3}(?:,\d{3})+|\d+)")
+_FLOAT_CELL = re.compile(_NUMBER)
+_PERCENT_CELL = re.compile(rf"({_NUMBER})\s*%\+?")
+_CURRENCY_CELL = re.compile(rf"([-+−]?)\$\s*({_NUMBER})\s*([KMBT]?)\+?", re.IGNORECASE)
+
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1  # Range of array("q")
+
+_SCALE = {"": 1.0, "k": 1e3, "m": 1e6, "b": 1e9, "t": 1e12}
+
+ColumnValues = Union[array, list]
+
+
+def clean_cell(cell: str) -> str:
+    """Strip whitespace and wrapping emphasis (**bold**, `code`) from a cell."""
+    cell = cell.strip()
+    match = _EMPHASIS.match(cell)
+    while match:
+        cell = match.group(2).strip()
+        match = _EMPHASIS.match(cell)
+    return cell
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "").replace("−", "-"))
+
+
+def _to_currency(cell: str) -> float:
+    sign, number, scale = _CURRENCY_CELL.fullmatch(cell).groups()
+    value = _number(number) * _SCALE[scale.lower()]
+    return -value if sign in ("-", "−") else value
+
+
+def infer_kind(cells: Iterable[str]) -> str:
+    """
+    Infer the kind of a column from its cleaned cells.
+
+    Args:
+        cells: Cleaned cell texts (missing cells are ignored)
+
+    Returns:
+        One of "int", "float", "percent", "currency", "string"
+    """
+    present = [cell for cell in cells if cell.lower() not in _MISSING]
+    if not present:
+        return STRING
+    if all(_INT_CELL.fullmatch(cell) for cell in present):
+        return INT
+    if all(_FLOAT_CELL.fullmatch(cell) for cell in present):
+        return FLOAT
+    if all(_PERCENT_CELL.fullmatch(cell) for cell in present):
+        return PERCENT
+    if all(_CURRENCY_CELL.fullmatch(cell) for cell in present):
+        return CURRENCY
+    return STRING
+
+
+def coerce_column(cells: list[str], kind: str) -> tuple[str, ColumnValues]:
+    """
+    Convert cleaned cells of a known kind into a column array.
+
+    Args:
+        cells: Cleaned cell texts
+        kind: Kind from infer_kind
+
+    Returns:
+        (kind, values); an int column becomes "float" if it has gaps, or
+        "string" if a value is outside the 64-bit range
+    """
+    missing = [cell.lower() in _MISSING for cell in cells]
+    if kind == INT:
+        values = [0 if gap else int(cell.replace(",", "").replace("−", "-"))
+                  for cell, gap in zip(cells, missing)]
+        if not all(_INT_MIN <= value <= _INT_MAX for value in values):
+            # IDs and other long digit strings fit neither array("q") nor,
+            # exactly, a float: keep them as text
+            kind = STRING
+        elif not any(missing):
+            return INT, array("q", values)
+    if kind == STRING:
+        return STRING, [None if gap else cell for cell, gap in zip(cells, missing)]
+
+    if kind in (INT, FLOAT):
+        convert = _number
+        kind = FLOAT
+    elif kind == PERCENT:
+        convert = lambda cell: _number(_PERCENT_CELL.fullmatch(cell).group(1)) / 100  # noqa: E731
+    else:
+        convert = _to_currency
+    nan = math.nan
+    return kind, array("d", [nan if gap else convert(cell) for cell, gap in zip(cells, missing)])
+
+
+@dataclass
+class TableColumn:
+    """One typed column of a table (or of stacked tables)."""
+    name: str
+    kind: str  # "int", "float", "percent", "currency" or "string"
+    values: ColumnValues  # array("q") / array("d") / list[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.kind in NUMERIC_KINDS
+
+    def present(self) -> ColumnValues:
+        """Values without the missing cells (NaN / None)."""
+        if self.kind == INT:
+            return self.values
+        if self.kind == STRING:
+            return [value for value in self.values if value is not None]
+        return array("d", [value for value in self.values if value == value])
+
+    @classmethod
+    def from_cells(cls, name: str, cells: list[str]) -> "TableColumn":
+        """Build a column, inferring its kind from its cleaned cells."""
+        kind, values = coerce_column(cells, infer_kind(cells))
+        return cls(name=name, kind=kind, values=values)
+
+
+def table_cells(table: TableData) -> list[list[str]]:
+    """Cleaned cells per column; short rows are padded with missing cells."""
+    width = len(table.headers)
+    columns: list[list[str]] = [[] for _ in range(width)]
+    for row in table.rows:
+        for i in range(width):
+            columns[i].append(clean_cell(row[i]) if i < len(row) else "")
+    return columns
+
+
+def table_columns(table: TableData) -> list[TableColumn]:
+    """
+    Typed columns of a table, in header order.
+
+    Args:
+        table: Extracted markdown table
+
+    Returns:
+        List of TableColumn
+    """
+    return [
+        TableColumn.from_cells(clean_cell(header), cells)
+        for header, cells in zip(table.headers, table_cells(table))
+    ]
+
+
+@dataclass
+class StackedTable:
+    """
+    Many tables stacked row-wise into one set of typed columns.
+
+    Columns are matched by header (case-insensitive, emphasis stripped);
+    rows of a table without some column hold missing values there.
+
+    Usage:
+        stacked = corpus_tables(documents)
+        weights = stacked["weight"].present()
+        total = math.fsum(weights)
+    """
+    columns: dict[str, TableColumn] = field(default_factory=dict)  # Folded header -> column
+    sources: list[str] = field(default_factory=list)  # Label per stacked table
+    row_sources: array = field(default_factory=lambda: array("I"))  # Index into sources, per row
+
+    def __len__(self) -> int:
+        return len(self.row_sources)
+
+    def __getitem__(self, name: str) -> TableColumn:
+        return self.columns[clean_cell(name).casefold()]
+
+    def __contains__(self, name: str) -> bool:
+        return clean_cell(name).casefold() in self.columns
+
+    def numeric_columns(self) -> list[TableColumn]:
+        """Columns whose every present cell parsed as a number."""
+        return [column for column in self.columns.values() if column.is_numeric]
+
+
+def concat_tables(
+    tables: Iterable[TableData],
+    labels: Optional[Iterable[str]] = None,
+) -> StackedTable:
+    """
+    Stack tables into one StackedTable, inferring each column's kind once.
+
+    Args:
+        tables: Extracted tables
+        labels: Source label per table (default: its position)
+
+    Returns:
+        StackedTable
+    """
+    tables = list(tables)
+    labels = [str(i) for i in range(len(tables))] if labels is None else list(labels)
+
+    names: dict[str, str] = {}  # Folded header -> first spelling seen
+    cells: dict[str, list[str]] = {}
+    stacked = StackedTable(sources=labels)
+    for t, table in enumerate(tables):
+        height = len(table.rows)
+        filled = set()
+        for header, column in zip(table.headers, table_cells(table)):
+            name = clean_cell(header)
+            key = name.casefold()
+            if key in filled:
+                continue  # Repeated header within one table: first one wins
+            filled.add(key)
+            if key not in cells:
+                names[key] = name
+                cells[key] = [""] * len(stacked.row_sources)
+            cells[key].extend(column)
+        stacked.row_sources.extend([t] * height)
+        # Columns this table lacks get missing cells
+        for key, column in cells.items():
+            if key not in filled:
+                column.extend([""] * height)
+
+    stacked.columns = {
+        key: TableColumn.from_cells(names[key], column) for key, column in cells.items()
+    }
+    return stacked
+
+
+def corpus_tables(documents: Iterable[ParsedDocument]) -> StackedTable:
+    """
+    Stack every table of a corpus, labelled "filename:line".
+
+    Args:
+        documents: Parsed documents
+
+    Returns:
+        StackedTable
+    """
+    tables, labels = [], []
+    for doc in documents:
+        for table in doc.tables:
+            tables.append(table)
+            labels.append(f"{doc.filename}:{table.start_line}")
+    return concat_tables(tables, labels)
@@ -0,0 +1,231 @@
+"""
+Tokenizer - Single-pass, line-indexed token stream for markdown documents.
+
+"Substitute 'damn' every time you're inclined to write 'very'; your editor
+will delete it and the writing will be just as it should be." — Mark Twain
+
+The document is split and scanned exactly once. Every extractor in
+``sections`` and ``emoji`` can consume the resulting TokenStream instead
+of re-splitting and re-scanning the raw text.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Collection, Iterator, Optional
+
+from samuel_clemens.processing.emoji import _iter_emojis
+
+
+class TokenKind(Enum):
+    """Kinds of tokens produced by the tokenizer."""
+    HEADING = "heading"
+    TABLE_ROW = "table_row"
+    TABLE_SEPARATOR = "table_separator"
+    BLOCKQUOTE = "blockquote"
+    METADATA = "metadata"
+    CHECKMARK = "checkmark"
+    REFERENCE = "reference"
+    EMOJI = "emoji"
+
+
+@dataclass
+class Token:
+    """A single token anchored to a document line."""
+    kind: TokenKind
+    line: int  # 0-indexed line number
+    offset: int  # Character offset into the document
+    text: str = ""  # Heading title, field name, checkmark item, emoji char
+    value: Optional[str] = None  # Metadata value or reference description
+    number: int = 0  # Heading level or referenced protocol number
+
+
+@dataclass
+class TokenStream:
+    """Line-indexed token stream for one document."""
+    text: str
+    lines: list[str]
+    line_offsets: list[int]
+    tokens: list[Token] = field(default_factory=list)
+    word_count: int = 0
+    by_kind: dict[TokenKind, list[Token]] = field(default_factory=dict)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    def of_kind(self, kind: TokenKind) -> list[Token]:
+        """Get all tokens of a kind, in document order."""
+        return self.by_kind.get(kind, [])
+
+    def lines_of_kind(self, kind: TokenKind) -> set[int]:
+        """Get the set of line numbers carrying a token of a kind."""
+        return {token.line for token in self.of_kind(kind)}
+
+    def line_span(self, start_line: int, end_line: int) -> tuple[int, int]:
+        """
+        Get the character span of lines [start_line, end_line).
+
+        The span excludes the newline after the last line, so slicing
+        the text with it equals joining those lines with newlines.
+        """
+        if start_line >= end_line or start_line >= len(self.lines):
+            return 0, 0
+        start = self.line_offsets[start_line]
+        if end_line >= len(self.lines):
+            return start, len(self.text)
+        return start, self.line_offsets[end_line] - 1
+
+    def emoji_matches(self) -> Iterator[tuple[int, str]]:
+        """Yield (offset, emoji) pairs in document order."""
+        for token in self.of_kind(TokenKind.EMOJI):
+            yield token.offset, token.text
+
+
+# Compiled once, applied per line
+_HEADING = re.compile(r"^(#{1,6})\s+(.+)$")
+_TABLE_SEPARATOR = re.compile(r"^\|[-:\s|]+\|$")
+_METADATA_FIELD = re.compile(r"\*\*([^:*]+):\*\*\s*(.+)")
+_CHECKMARK = re.compile(r"[✅✓☑]\s*\*?\*?([^*\n]+)")
+_CHECKMARK_CHARS = ("✅", "✓", "☑")
+# One scan per line: "Protocol N" (optionally followed by ": description",
+# captured by lookahead so references inside the description are still
+# found) or "PN", both anchored on word boundaries
+_REFERENCE = re.compile(
+    r"\b(?:protocol\s+(\d+)\b(?=(?::\s*([^\n]+))?)|p(\d+)\b)",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(
+    text: str,
+    kinds: Optional[Collection[TokenKind]] = None,
+    count_words: bool = True,
+) -> TokenStream:
+    """
+    Tokenize markdown text in a single pass over its lines.
+
+    Args:
+        text: Markdown text
+        kinds: Token kinds to emit (None = all kinds)
+        count_words: Whether to compute the document word count
+
+    Returns:
+        TokenStream with per-line tokens and document counts
+    """
+    wanted = set(TokenKind) if kinds is None else set(kinds)
+    want_headings = TokenKind.HEADING in wanted
+    want_tables = TokenKind.TABLE_ROW in wanted or TokenKind.TABLE_SEPARATOR in wanted
+    want_quotes = TokenKind.BLOCKQUOTE in wanted
+    want_metadata = TokenKind.METADATA in wanted
+    want_checkmarks = TokenKind.CHECKMARK in wanted
+    want_references = TokenKind.REFERENCE in wanted
+    want_emojis = TokenKind.EMOJI in wanted
+
+    lines = text.split("\n")
+    line_offsets: list[int] = []
+    tokens: list[Token] = []
+    word_count = 0
+
+    offset = 0
+    for i, line in enumerate(lines):
+        line_offsets.append(offset)
+
+        if line:
+            if count_words:
+                word_count += len(_WORD.findall(line))
+
+            if want_headings and line.startswith("#"):
+                heading = _HEADING.match(line)
+                if heading:
+                    tokens.append(Token(
+                        kind=TokenKind.HEADING,
+                        line=i,
+                        offset=offset,
+                        text=heading.group(2).strip(),
+                        number=len(heading.group(1)),
+                    ))
+
+            if want_tables and "|" in line:
+                tokens.append(Token(kind=TokenKind.TABLE_ROW, line=i, offset=offset))
+                if _TABLE_SEPARATOR.match(line.strip()):
+                    tokens.append(Token(kind=TokenKind.TABLE_SEPARATOR, line=i, offset=offset))
+
+            if want_quotes and line.startswith(">"):
+                tokens.append(Token(kind=TokenKind.BLOCKQUOTE, line=i, offset=offset))
+
+            if want_metadata and "**" in line:
+                for match in _METADATA_FIELD.finditer(line):
+                    tokens.append(Token(
+                        kind=TokenKind.METADATA,
+                        line=i,
+                        offset=offset + match.start(),
+                        text=match.group(1).strip(),
+                        value=match.group(2).strip(),
+                    ))
+
+            if want_checkmarks and any(char in line for char in _CHECKMARK_CHARS):
+                for match in _CHECKMARK.finditer(line):
+                    tokens.append(Token(
+                        kind=TokenKind.CHECKMARK,
+                        line=i,
+                        offset=offset + match.start(),
+                        text=match.group(1).strip(),
+                    ))
+
+            if want_references:
+                tokens.extend(_reference_tokens(line, i, offset))
+
+            if want_emojis and not line.isascii():
+                for col, emoji in _iter_emojis(line):
+                    tokens.append(Token(
+                        kind=TokenKind.EMOJI,
+                        line=i,
+                        offset=offset + col,
+                        text=emoji,
+                    ))
+
+        offset += len(line) + 1
+
+    by_kind: dict[TokenKind, list[Token]] = {}
+    for token in tokens:
+        by_kind.setdefault(token.kind, []).append(token)
+
+    return TokenStream(
+        text=text,
+        lines=lines,
+        line_offsets=line_offsets,
+        tokens=tokens,
+        word_count=word_count,
+        by_kind=by_kind,
+    )
+
+
+def _reference_tokens(line: str, line_number: int, offset: int) -> list[Token]:
+    """Build protocol reference tokens for one line."""
+    if "p" not in line and "P" not in line:
+        return []
+
+    # Described references carry their description; bare mentions carry None
+    tokens = []
+    for match in _REFERENCE.finditer(line):
+        named, description, short = match.groups()
+        tokens.append(Token(
+            kind=TokenKind.REFERENCE,
+            line=line_number,
+            offset=offset + match.start(),
+            value=description.strip() if description is not None else None,
+            number=int(named or short),
+        ))
+
+    return tokens
+
+
+def as_token_stream(text: str | TokenStream) -> TokenStream:
+    """Tokenize text unless it is already a TokenStream."""
+    if isinstance(text, TokenStream):
+        return text
+    return tokenize(text)
@@ -54,6 +54,11 @@ from samuel_clemens.stories.export import (
     export_to_text,
     export_anthology,
 )
+from samuel_clemens.stories.loader import (
+    decode_story,
+    iter_stories_json,
+    load_stories_json,
+)
 from samuel_clemens.stories.interactive import (
     InteractiveSession,
     run_interactive_session,
@@ -105,6 +110,10 @@ __all__ = [
     "export_to_json",
     "export_to_text",
     "export_anthology",
+    # Loader
+    "decode_story",
+    "iter_stories_json",
+    "load_stories_json",
     # Interactive
     "InteractiveSession",
     "run_interactive_session",
@@ -14,6 +14,7 @@ from typing import Optional, Union
 
 from samuel_clemens.stories.generator import GeneratedStory
 from samuel_clemens.stories.recombinator import RecombinedStory
+from samuel_clemens.utils.io import BulkWriter
 from samuel_clemens.utils.logging import story_log
 
 
@@ -296,6 +297,15 @@ def export_to_text(
     return content
 
 
+# Format -> (exporter, file extension, log icon)
+_FORMATS = {
+    "markdown": (export_to_markdown, ".md", "📝"),
+    "html": (export_to_html, ".html", "🌐"),
+    "json": (export_to_json, ".json", "📦"),
+    "text": (export_to_text, ".txt", "📄"),
+}
+
+
 def export_story(
     story: Union[GeneratedStory, RecombinedStory],
     filepath: Path,
@@ -328,16 +338,8 @@ def export_story(
         format = format_map.get(ext, "markdown")
     
     # Export
-    if format == "markdown":
-        return export_to_markdown(story, filepath)
-    elif format == "html":
-        return export_to_html(story, filepath)
-    elif format == "json":
-        return export_to_json(story, filepath)
-    elif format == "text":
-        return export_to_text(story, filepath)
-    else:
-        return export_to_markdown(story, filepath)
+    export, _, _ = _FORMATS.get(format, _FORMATS["markdown"])
+    return export(story, filepath)
 
 
 def export_anthology(
@@ -361,15 +363,11 @@ def export_anthology(
     directory = Path(directory)
     directory.mkdir(parents=True, exist_ok=True)
     
-    ext_map = {
-        "markdown": ".md",
-        "html": ".html",
-        "json": ".json",
-        "text": ".txt",
-    }
-    ext = ext_map.get(format, ".md")
+    export, ext, icon = _FORMATS.get(format, _FORMATS["markdown"])
     
-    created_files = []
+    # Render everything, then write all files in one concurrent batch
+    writer = BulkWriter()
+    story_paths = set()
     
     for i, story in enumerate(stories, 1):
         # Create safe filename
@@ -377,9 +375,7 @@ def export_anthology(
         safe_title = safe_title.replace(" ", "_")[:50]
         filename = f"{i:02d}_{safe_title}{ext}"
         
-        filepath = directory / filename
-        export_story(story, filepath, format)
-        created_files.append(filepath)
+        story_paths.add(writer.add(directory / filename, export(story)))
     
     # Create index
     if create_index:
@@ -391,8 +387,7 @@ def export_anthology(
                 safe_title = "".join(c if c.isalnum() or c in " -_" else "" for c in story.title)
                 safe_title = safe_title.replace(" ", "_")[:50]
                 index_lines.append(f"{i}. [{story.title}]({i:02d}_{safe_title}{ext})")
-            index_path.write_text("\n".join(index_lines))
-            created_files.append(index_path)
+            writer.add(index_path, "\n".join(index_lines))
         elif format == "html":
             index_html = f"""<!DOCTYPE html>
 <html><head><title>Story Anthology</title></head>
@@ -406,12 +401,17 @@ def export_anthology(
                 safe_title = safe_title.replace(" ", "_")[:50]
                 index_html += f'<li><a href="{i:02d}_{safe_title}{ext}">{story.title}</a></li>\n'
             index_html += "</ul></body></html>"
-            index_path.write_text(index_html)
-            created_files.append(index_path)
+            writer.add(index_path, index_html)
         else:
             # For json and text, skip index (or implement if needed)
             pass
-        
+    
+    created_files = writer.write().paths
+    for path in created_files:
+        if path in story_paths:
+            story_log(f"{icon} Exported story to {path}")
+    
+    if create_index:
         story_log(f"📚 Exported anthology with {len(stories)} stories to {directory}")
     
     return created_files
@@ -0,0 +1,291 @@
+"""
+Story Loader - Read exported JSON stories back into story objects.
+
+Loads files written by export_to_json / export_anthology(format="json")
+as GeneratedStory and RecombinedStory objects, so later stages can
+reuse exported stories instead of generating them again.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Annotated, Iterator, Literal, Optional, Union
+
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict  # pydantic requires it before Python 3.12
+
+from samuel_clemens.core.storyteller import Emotion
+from samuel_clemens.stories.elements import (
+    CHARACTERS,
+    SETTINGS,
+    THEMES,
+    Character,
+    ElementType,
+    Setting,
+    Theme,
+)
+from samuel_clemens.stories.generator import GeneratedStory
+from samuel_clemens.stories.recombinator import RecombinedStory
+
+
+class _CharacterRecord(TypedDict):
+    name: str
+    role: NotRequired[str]
+    traits: NotRequired[list[str]]
+
+
+class _SettingRecord(TypedDict):
+    name: str
+    atmosphere: NotRequired[str]
+
+
+class _ThemeRecord(TypedDict):
+    name: str
+
+
+class _GeneratedRecord(TypedDict):
+    type: Literal["generated"]
+    title: str
+    text: str
+    template: NotRequired[Optional[str]]
+    emotion: NotRequired[Emotion]
+    character: NotRequired[_CharacterRecord]
+    setting: NotRequired[_SettingRecord]
+    theme: NotRequired[_ThemeRecord]
+
+
+class _RecombinedRecord(TypedDict):
+    type: Literal["recombined"]
+    title: str
+    text: str
+    mashup_type: NotRequired[str]
+    source_stories: NotRequired[list[str]]
+    blended_elements: NotRequired[list[str]]
+
+
+# Built (and its validator compiled) once, at import
+_story_adapter = TypeAdapter(
+    Annotated[Union[_GeneratedRecord, _RecombinedRecord], Field(discriminator="type")]
+)
+
+_CHARACTERS = {c.name: c for c in CHARACTERS}
+_SETTINGS = {s.name: s for s in SETTINGS}
+_THEMES = {t.name: t for t in THEMES}
+
+
+def _character(record: Optional[_CharacterRecord]) -> Optional[Character]:
+    if record is None:
+        return None
+    # Catalog elements carry descriptions and tags the export leaves out
+    known = _CHARACTERS.get(record["name"])
+    if known is not None:
+        return known
+    return Character(
+        name=record["name"],
+        element_type=ElementType.CHARACTER,
+        description="",
+        role=record.get("role", "supporting"),
+        traits=record.get("traits", []),
+    )
+
+
+def _setting(record: Optional[_SettingRecord]) -> Optional[Setting]:
+    if record is None:
+        return None
+    known = _SETTINGS.get(record["name"])
+    if known is not None:
+        return known
+    return Setting(
+        name=record["name"],
+        element_type=ElementType.SETTING,
+        description="",
+        atmosphere=record.get("atmosphere", "neutral"),
+    )
+
+
+def _theme(record: Optional[_ThemeRecord]) -> Optional[Theme]:
+    if record is None:
+        return None
+    known = _THEMES.get(record["name"])
+    if known is not None:
+        return known
+    return Theme(name=record["name"], element_type=ElementType.THEME, description="")
+
+
+def decode_story(data: dict) -> Union[GeneratedStory, RecombinedStory]:
+    """
+    Validate one exported story dict and rebuild the story.
+
+    Args:
+        data: Parsed JSON object written by export_to_json
+
+    Returns:
+        GeneratedStory or RecombinedStory
+
+    Raises:
+        ValueError: If the data is not an exported story
+    """
+    record = _story_adapter.validate_python(data)
+
+    if record["type"] == "generated":
+        return GeneratedStory(
+            text=record["text"],
+            title=record["title"],
+            template_used=record.get("template"),
+            character=_character(record.get("character")),
+            setting=_setting(record.get("setting")),
+            theme=_theme(record.get("theme")),
+            emotion=record.get("emotion", Emotion.STORYTELLING),
+        )
+
+    # Only the element names are exported; their values are not recoverable
+    return RecombinedStory(
+        text=record["text"],
+        title=record["title"],
+        source_stories=record.get("source_stories", []),
+        blended_elements=dict.fromkeys(record.get("blended_elements", [])),
+        mashup_type=record.get("mashup_type", "blend"),
+    )
+
+
+def _story_files(path: Path) -> list[Path]:
+    if path.is_dir():
+        return sorted(path.glob("*.json"))
+    return [path]
+
+
+# Characters of a story array read at a time
+_READ_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _ChunkedJson:
+    """Decodes values one at a time from a text stream read in chunks."""
+
+    def __init__(self, handle, buffer: str, pos: int):
+        self.handle = handle
+        self.buffer = buffer
+        self.pos = pos
+        self.eof = False
+
+    def _read(self, size: int) -> None:
+        chunk = self.handle.read(size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character ("" at the end)."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if self.eof:
+                return ""
+            self._read(_READ_SIZE)
+
+    def value(self) -> object:
+        """Decode the next value, reading as much as it needs."""
+        if self.peek() in ("", ",", "]"):
+            raise self.error("Expecting value")
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut by the end of the buffer decodes too early
+                cut = (
+                    not self.eof
+                    and type(value) in (int, float)
+                    and _NUMBER_CHARS.issuperset(self.buffer[end:])
+                )
+                if not cut:
+                    self.pos = end
+                    return value
+            # Read at least as much again as is pending, so an item spanning
+            # many chunks is decoded a logarithmic number of times
+            self._read(max(_READ_SIZE, len(self.buffer) - self.pos))
+
+
+def _iter_json_items(filepath: Path) -> Iterator[tuple[Optional[int], object]]:
+    """
+    Yield (index, value) for each item of a JSON array file, reading it in
+    chunks, or (None, value) once for a file holding a single value.
+    """
+    with open(filepath, encoding="utf-8") as handle:
+        buffer = handle.read(_READ_SIZE)
+        start = len(buffer) - len(buffer.lstrip())
+        if buffer[start:start + 1] != "[":
+            yield None, json.loads(buffer + handle.read())
+            return
+
+        stream = _ChunkedJson(handle, buffer, start + 1)
+        if stream.peek() == "]":
+            stream.pos += 1
+        else:
+            index = 0
+            while True:
+                yield index, stream.value()
+                index += 1
+                char = stream.peek()
+                if char == "]":
+                    stream.pos += 1
+                    break
+                if char != ",":
+                    raise stream.error("Expecting ',' delimiter")
+                stream.pos += 1  # The next value() rejects a trailing comma
+        if stream.peek():
+            raise stream.error("Extra data")
+
+
+def iter_stories_json(path: Path | str) -> Iterator[Union[GeneratedStory, RecombinedStory]]:
+    """
+    Load exported stories lazily.
+
+    Accepts one story file, a file holding a JSON array of stories, or a
+    directory of story files. Arrays are read and decoded incrementally,
+    so each story is read, validated and rebuilt only when the iterator
+    reaches it.
+
+    Args:
+        path: JSON file or directory
+
+    Yields:
+        GeneratedStory or RecombinedStory
+
+    Raises:
+        ValueError: If a file does not hold exported stories
+    """
+    for filepath in _story_files(Path(path)):
+        for i, item in _iter_json_items(filepath):
+            try:
+                yield decode_story(item)
+            except ValidationError as e:
+                where = f"{filepath}[{i}]" if i is not None else str(filepath)
+                raise ValueError(f"{where}: invalid story record\n{e}") from e
+
+
+def load_stories_json(path: Path | str) -> list[Union[GeneratedStory, RecombinedStory]]:
+    """
+    Load every exported story from a file or directory.
+
+    Args:
+        path: JSON file or directory (see iter_stories_json)
+
+    Returns:
+        List of GeneratedStory / RecombinedStory
+    """
+    return list(iter_stories_json(path))
@@ -1,7 +1,8 @@
 """
 Utils module - Shared utilities for the frontier operation.
 
-Contains logging, configuration, and helper functions.
+Contains logging, configuration, bulk file writing, versioned stores and
+helper functions.
 """
 
 from samuel_clemens.utils.logging import (
@@ -16,6 +17,16 @@ from samuel_clemens.utils.config import (
     get_config,
     load_config,
 )
+from samuel_clemens.utils.io import (
+    BulkWriter,
+    WriteReport,
+    WriteResult,
+    write_files,
+    content_digest,
+    load_versioned,
+    save_versioned,
+    store_path,
+)
 
 __all__ = [
     "frontier_log",
@@ -26,4 +37,12 @@ __all__ = [
     "Config",
     "get_config",
     "load_config",
+    "BulkWriter",
+    "WriteReport",
+    "WriteResult",
+    "write_files",
+    "content_digest",
+    "load_versioned",
+    "save_versioned",
+    "store_path",
 ]
@@ -21,6 +21,7 @@ from dataclasses import dataclass
 from PIL import Image, ImageDraw, ImageFont
 
 from samuel_clemens.processing.parser import ProtocolDocument
+from samuel_clemens.processing.related import RelatedProtocol
 from samuel_clemens.stories.generator import Story
 
 # Default font paths (system dependent - fallback strategies needed)
@@ -178,6 +179,7 @@ def render_protocol_card_image(
     protocol: ProtocolDocument,
     output_path: Path | str,
     config: Optional[ImageConfig] = None,
+    related: Optional[list[RelatedProtocol]] = None,
 ) -> Path:
     """
     Render a protocol status card to PNG.
@@ -185,6 +187,7 @@ def render_protocol_card_image(
     Args:
         protocol: Protocol document
         output_path: Output file path
+        related: Protocols with similar content (from a RelatedIndex)
         
     Returns:
         Path to created image
@@ -260,6 +263,20 @@ def render_protocol_card_image(
         )
         grid_x += 200
     
+    current_y += 120
+    
+    # Similar protocols
+    if related:
+        draw.text((config.padding, current_y), "Similar", font=body_font, fill="#aaaaaa")
+        similar_lines = _wrap_text(
+            "  ·  ".join(item.key for item in related),
+            body_font,
+            config.width - config.padding * 2
+        )
+        for line in similar_lines:
+            current_y += config.font_size_body + 10
+            draw.text((config.padding, current_y), line, font=body_font, fill=config.accent_color)
+    
     # Footer Emojis
     if protocol.footer_emojis:
         emoji_str = " ".join(protocol.footer_emojis)
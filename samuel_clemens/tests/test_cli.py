@@ -110,3 +110,31 @@ class TestCLI:
         result = runner.invoke(cli, ["interact", "nonexistent"])
         assert result.exit_code == 0
         assert "not found" in result.output
+
+    def test_search_command(self, runner: CliRunner, tmp_path) -> None:
+        """search command should rank matching protocols and reuse its index."""
+        (tmp_path / "PROTOCOL_1.md").write_text("# PROTOCOL 1: ONE\n\n## Hosts\n\nThe Hero Host rides.")
+        (tmp_path / "PROTOCOL_2.md").write_text("# PROTOCOL 2: TWO\n\nNo match here.")
+        result = runner.invoke(cli, ["search", '"hero host"', "--folder", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "P1" in result.output
+        assert "P2" not in result.output
+        assert (tmp_path / ".twain_cache" / "search_index.bin").exists()
+
+        result = runner.invoke(cli, ["search", "goldilocks", "-f", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "No protocols match" in result.output
+
+    def test_corpus_command(self, runner: CliRunner, tmp_path) -> None:
+        """corpus command should summarize the snapshot and show one protocol."""
+        (tmp_path / "PROTOCOL_1.md").write_text("# PROTOCOL 1: ONE\n\nSee Protocol 2.")
+        (tmp_path / "PROTOCOL_2.md").write_text("# PROTOCOL 2: TWO\n\nStandalone.")
+        result = runner.invoke(cli, ["corpus", "--folder", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "Documents" in result.output
+        assert (tmp_path / ".twain_cache" / "corpus_snapshot.bin").exists()
+
+        result = runner.invoke(cli, ["corpus", "-f", str(tmp_path), "-p", "1"])
+        assert result.exit_code == 0
+        assert "PROTOCOL 1: ONE" in result.output
+        assert "P2" in result.output
@@ -264,3 +264,139 @@ class TestExportAnthology:
             files = list(Path(tmpdir).glob("*.html"))
             # 2 stories + 1 index
             assert len(files) == 3
+
+
+class TestLoadStoriesJSON:
+    """Tests for loading exported JSON stories."""
+
+    def test_round_trip_generated(self, sample_story: GeneratedStory) -> None:
+        """Should rebuild a generated story with its catalog elements."""
+        from samuel_clemens.stories.loader import decode_story
+        
+        loaded = decode_story(json.loads(export_to_json(sample_story)))
+        assert isinstance(loaded, GeneratedStory)
+        assert loaded.title == sample_story.title
+        assert loaded.text == sample_story.text
+        assert loaded.emotion == sample_story.emotion
+        assert loaded.template_used == sample_story.template_used
+        assert loaded.character == sample_story.character
+
+    def test_load_anthology_directory(self, sample_recombined: RecombinedStory) -> None:
+        """Should lazily load every story file in a directory."""
+        from samuel_clemens.stories.loader import iter_stories_json, load_stories_json
+        
+        stories = StoryGenerator().generate_batch(2) + [sample_recombined]
+        with TemporaryDirectory() as tmpdir:
+            export_anthology(stories, Path(tmpdir), format="json")
+            loaded = load_stories_json(tmpdir)
+            assert [s.title for s in loaded] == [s.title for s in stories]
+            assert isinstance(loaded[2], RecombinedStory)
+            assert loaded[2].source_stories == sample_recombined.source_stories
+            
+            (Path(tmpdir) / "99_broken.json").write_text('{"type": "generated"}')
+            lazy = iter_stories_json(tmpdir)
+            assert next(lazy).title == stories[0].title
+            with pytest.raises(ValueError):
+                list(lazy)
+
+    def test_array_streams_lazily(self, monkeypatch) -> None:
+        """Should yield array items before the rest of the file is read."""
+        from samuel_clemens.stories import loader
+        
+        monkeypatch.setattr(loader, "_READ_SIZE", 64)
+        stories = StoryGenerator().generate_batch(3)
+        items = ",\n".join(export_to_json(s) for s in stories)
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "stories.json"
+            # Truncated after the third story: only reaching the end fails
+            path.write_text(f"[\n{items},\n{{\"type\": ", encoding="utf-8")
+            lazy = loader.iter_stories_json(path)
+            assert [next(lazy).title for _ in range(3)] == [s.title for s in stories]
+            with pytest.raises(ValueError):
+                next(lazy)
+
+    def test_array_parsing_matches_json(self, monkeypatch) -> None:
+        """Should accept any valid array layout and reject what json rejects."""
+        from samuel_clemens.stories import loader
+        
+        monkeypatch.setattr(loader, "_READ_SIZE", 64)
+        big = {"text": "frontier " * 2000}  # Spans hundreds of chunks
+        valid = [
+            '[{"a": 1}' + " " * 100 + ', {"b": 2}]',
+            "[1" + " " * 100 + "]",
+            "[ 12345678901234567890.5e3 ,\n -0.25 ]",
+            json.dumps([big, 7]),
+            " [ ] ",
+        ]
+        invalid = ["[1, 2,]", "[,,1]", "[1 2]", "[1] x", "[1,"]
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "items.json"
+            for text in valid:
+                path.write_text(text, encoding="utf-8")
+                assert [item for _, item in loader._iter_json_items(path)] == json.loads(text)
+            for text in invalid:
+                path.write_text(text, encoding="utf-8")
+                with pytest.raises(json.JSONDecodeError):
+                    list(loader._iter_json_items(path))
+
+
+class TestBulkWriter:
+    """Tests for the shared bulk file writer."""
+
+    def test_writes_batch(self) -> None:
+        """Should create directories once and write every file atomically."""
+        from samuel_clemens.utils import BulkWriter
+
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            writer = BulkWriter(workers=4)
+            for i in range(20):
+                writer.add(root / f"part_{i % 3}" / f"{i:02d}.txt", f"file {i}")
+            writer.add(root / "part_0" / "00.txt", b"last data wins")
+            report = writer.write()
+
+            assert len(report) == 20
+            assert len(writer) == 0
+            assert report.directories == 3
+            assert report.paths[0] == root / "part_0" / "00.txt"
+            assert (root / "part_0" / "00.txt").read_bytes() == b"last data wins"
+            assert (root / "part_1" / "19.txt").read_text(encoding="utf-8") == "file 19"
+            assert report.total_bytes == sum(p.stat().st_size for p in report.paths)
+            assert all(r.seconds >= 0 for r in report.slowest(3))
+            assert not list(root.rglob("*.tmp"))
+
+    def test_concurrent_writers_of_one_path(self) -> None:
+        """Should not share a temporary file between writers of the same path."""
+        from concurrent.futures import ThreadPoolExecutor
+        from samuel_clemens.utils import write_files
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "shared.txt"
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                reports = list(pool.map(
+                    lambda i: write_files([(path, f"writer {i}" * 1000)], workers=1), range(32)
+                ))
+
+            assert all(report.paths == [path] for report in reports)
+            assert path.read_text(encoding="utf-8").startswith("writer ")
+            assert [p.name for p in Path(tmpdir).iterdir()] == ["shared.txt"]
+
+    def test_anthology_and_frames_use_writer(self, monkeypatch) -> None:
+        """Should return every written path, in order, and log each story."""
+        from samuel_clemens.animation import save_animation_frames
+        from samuel_clemens.animation.cycles import generate_breathing_animation
+        from samuel_clemens.stories import export as export_module
+
+        messages = []
+        monkeypatch.setattr(export_module, "story_log", messages.append)
+        with TemporaryDirectory() as tmpdir:
+            created = export_anthology(StoryGenerator().generate_batch(3), Path(tmpdir) / "a")
+            assert [p.name for p in created][-1] == "index.md"
+            assert all(p.exists() for p in created)
+            assert messages[:3] == [f"📝 Exported story to {p}" for p in created[:3]]
+            assert messages[3].startswith("📚 Exported anthology with 3 stories")
+
+            sequence = generate_breathing_animation()
+            frames = save_animation_frames(sequence, Path(tmpdir) / "frames")
+            assert len(frames) == len(sequence.frames) + 1
+            assert frames[-1].name == "animation.json"
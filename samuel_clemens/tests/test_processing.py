@@ -10,17 +10,27 @@ import shutil
 from samuel_clemens.processing import (
     # Parser
     parse_file,
+    parse_folder,
     parse_protocol,
+    iter_parse_folder,
+    parse_protocols_by_prefix,
+    ParseCache,
     ParsedDocument,
     ProtocolDocument,
     # Sections
     extract_sections,
     extract_metadata,
     extract_tables,
+    # Tokens
+    TokenKind,
+    tokenize,
     # Emoji
     extract_emojis,
     analyze_emoji_usage,
     emoji_to_text,
+    replace_emojis_with_text,
+    strip_emojis,
+    iter_strip_emojis,
     # Obsidian
     WikiLink,
     ObsidianPage,
@@ -34,6 +44,13 @@ from samuel_clemens.processing import (
 )
 
 
+def _write_protocols(folder, bodies):
+    """Write PROTOCOL_<n>.md files from a {number: body} dict and parse the folder."""
+    for number, body in bodies.items():
+        (folder / f"PROTOCOL_{number}.md").write_text(f"# PROTOCOL {number}: DOC\n\n{body}")
+    return parse_protocols_by_prefix(folder)
+
+
 class TestEmojiProcessing:
     """Test emoji extraction and analysis."""
     
@@ -52,6 +69,15 @@ class TestEmojiProcessing:
         assert len(emojis) == 1  # One unique emoji
         assert emojis[0].count == 3  # Appears 3 times
     
+    def test_extract_emojis_multi_codepoint(self):
+        text = "Careful ⚠️ here, plain ⚠ there ─ and 🧭"
+        emojis = {e.char: e for e in extract_emojis(text)}
+        assert emojis["⚠️"].name == "warning"
+        assert emojis["⚠️"].positions == [text.index("⚠️")]
+        assert emojis["⚠"].category == "other"
+        assert "─" in emojis  # Symbol, Other
+        assert emojis["🧭"].positions == [len(text) - 1]
+    
     def test_analyze_emoji_usage(self):
         text = "Status: ✅ Target: 🎯 Symbol: 💎✨"
         analysis = analyze_emoji_usage(text)
@@ -59,6 +85,20 @@ class TestEmojiProcessing:
         assert analysis["unique_count"] == 4
         assert "status" in analysis["by_category"]
     
+    def test_replace_and_strip_emojis(self):
+        text = "Done ✅ and ⚠️ twice ✅"
+        assert replace_emojis_with_text(text) == "Done [checkmark] and [warning] twice [checkmark]"
+        assert replace_emojis_with_text(text, format="colon").startswith("Done :checkmark:")
+        assert strip_emojis(text) == "Done  and  twice "
+        assert strip_emojis("no emojis") == "no emojis"
+    
+    def test_iter_strip_emojis_matches_whole_text(self):
+        import io
+        
+        text = "Line ✅ one\n🎯 Line two\nPlain\n"
+        streamed = "".join(iter_strip_emojis(io.StringIO(text)))
+        assert streamed == strip_emojis(text)
+    
     def test_emoji_to_text(self):
         assert emoji_to_text("✅") == "checkmark"
         assert emoji_to_text("🎯") == "target"
@@ -96,6 +136,54 @@ References here.
         sections = extract_sections(text)
         assert len(sections) >= 1
     
+    def test_extract_sections_nested(self):
+        text = """# Title
+
+## 🎯 Parent
+
+Intro.
+
+### Child A
+
+Alpha.
+
+### Child B
+
+Beta.
+
+## Sibling
+
+End.
+"""
+        sections = extract_sections(text)
+        assert len(sections) == 1
+        root = sections[0]
+        assert [s.title for s in root.subsections] == ["🎯 Parent", "Sibling"]
+        parent = root.subsections[0]
+        assert parent.emoji == "🎯"
+        assert [s.title for s in parent.subsections] == ["Child A", "Child B"]
+        assert parent.subsections[0].content.strip() == "Alpha."
+        assert "### Child B" in parent.content
+        assert parent.end_line == 14
+    
+    def test_sections_are_views_into_document(self):
+        text = "# Title\n\n## Part\n\nBody text.\n"
+        sections = extract_sections(text)
+        part = sections[0].subsections[0]
+        assert part.source is sections[0].source
+        assert text[part.start:part.end] == part.content
+        assert part.content.strip() == "Body text."
+    
+    def test_own_content_stops_at_subsection(self):
+        # B has no body, so its offsets cannot locate its heading
+        text = "# T\n## A\nintro a\n### B\n## C\nccc\nmore\nlast line"
+        root = extract_sections(text)[0]
+        a, c = root.subsections
+        assert root.own_content == ""
+        assert a.own_content == "intro a\n"
+        assert a.subsections[0].own_content == ""
+        assert c.own_content == "ccc\nmore\nlast line"
+    
     def test_extract_metadata(self):
         text = """# Protocol 42
 
@@ -118,6 +206,101 @@ References here.
         assert len(tables) == 1
         assert tables[0].num_columns == 2
         assert tables[0].num_rows == 2
+    
+    def test_table_to_columns(self):
+        text = """
+| Method | Valuation | Weight | Score | Note |
+|--------|-----------|--------|-------|------|
+| **Demo** | $1T | 10% | 1,250 | ok |
+| Engine | **$9.8B** | 12.5% | | n/a |
+| Total | $0 | 100%+ | 7 | 3 hours |
+"""
+        table = extract_tables(text)[0]
+        assert table.rows[1] == ["Engine", "**$9.8B**", "12.5%", "", "n/a"]
+        
+        method, valuation, weight, score, note = table.to_columns()
+        assert (method.kind, method.values) == ("string", ["Demo", "Engine", "Total"])
+        assert valuation.kind == "currency"
+        assert list(valuation.values) == [1e12, 9.8e9, 0.0]
+        assert weight.kind == "percent"
+        assert list(weight.values) == [0.1, 0.125, 1.0]
+        # A gap turns an int column into a float column with NaN
+        assert score.kind == "float"
+        assert list(score.present()) == [1250.0, 7.0]
+        assert note.values == ["ok", None, "3 hours"]
+        
+        # Too long for a 64-bit int: kept as text rather than overflowing
+        ids = extract_tables("| ID |\n|---|\n| 12345678901234567890 |\n| 7 |\n| - |")[0]
+        assert ids.to_columns()[0].kind == "string"
+        assert ids.to_columns()[0].values == ["12345678901234567890", "7", None]
+    
+    def test_concat_tables(self):
+        from samuel_clemens.processing import concat_tables
+        
+        first = extract_tables("| Item | Weight |\n|---|---|\n| A | 30% |\n| B | 70% |")[0]
+        second = extract_tables("| item | **Weight** | Count |\n|---|---|---|\n| C | 50% | 3 |")[0]
+        stacked = concat_tables([first, second], labels=["one.md", "two.md"])
+        
+        assert len(stacked) == 3
+        assert list(stacked.row_sources) == [0, 0, 1]
+        assert stacked["weight"].kind == "percent"
+        assert sum(stacked["Weight"].present()) == pytest.approx(1.5)
+        assert stacked["count"].kind == "float"
+        assert list(stacked["count"].present()) == [3.0]
+        assert [c.name for c in stacked.numeric_columns()] == ["Weight", "Count"]
+
+
+class TestTokenizer:
+    """Test the single-pass tokenizer."""
+    
+    def test_tokenize_line_index(self):
+        text = "# Title\n\n> A quote\n\n| A | B |\n|---|---|\n| 1 | 2 |"
+        stream = tokenize(text)
+        assert stream.line_count == 7
+        assert [t.line for t in stream.of_kind(TokenKind.HEADING)] == [0]
+        assert [t.line for t in stream.of_kind(TokenKind.BLOCKQUOTE)] == [2]
+        assert [t.line for t in stream.of_kind(TokenKind.TABLE_SEPARATOR)] == [5]
+        assert stream.lines[stream.of_kind(TokenKind.TABLE_ROW)[0].line] == "| A | B |"
+    
+    def test_tokenize_emoji_offsets(self):
+        text = "Line one\nStatus ✅ done"
+        stream = tokenize(text)
+        emoji = stream.of_kind(TokenKind.EMOJI)[0]
+        assert emoji.line == 1
+        assert text[emoji.offset] == "✅"
+    
+    def test_extractors_accept_token_stream(self):
+        text = """# Protocol 42
+
+**Category:** Demo
+
+## Section
+
+- ✅ Done item
+See Protocol 7: Seven and P12.
+"""
+        stream = tokenize(text)
+        assert extract_metadata(stream).category == "Demo"
+        assert len(extract_sections(stream)) == len(extract_sections(text))
+        assert extract_emojis(stream)[0].positions == extract_emojis(text)[0].positions
+    
+    def test_checkmark_stays_on_its_line(self):
+        from samuel_clemens.processing import extract_checkmarks
+        
+        text = "- Tests passing ✅\n- Next item\n✅ Real item"
+        assert extract_checkmarks(text) == ["Real item"]
+    
+    def test_references_single_scan(self):
+        from samuel_clemens.processing import (
+            extract_protocol_references,
+            extract_referenced_numbers,
+        )
+        
+        text = "See Protocol 5: builds on Protocol 6 and P7.\nMP3 and P8a are not refs (P9)."
+        assert extract_protocol_references(text) == [
+            (5, "builds on Protocol 6 and P7."), (6, ""), (7, ""), (9, ""),
+        ]
+        assert list(extract_referenced_numbers(text)) == [5, 6, 7, 9]
 
 
 class TestObsidianExport:
@@ -130,6 +313,29 @@ class TestObsidianExport:
         link_with_display = WikiLink(target="Protocol_42", display="P42")
         assert str(link_with_display) == "[[Protocol_42|P42]]"
     
+    def test_entity_linker(self):
+        from samuel_clemens.processing import EntityLinker
+        
+        linker = EntityLinker(["Hero", "Hero Host", "Mark Twain", "Lewis & Clark"])
+        text = (
+            "The hero hosts met [[Mark_Twain|Mark Twain]] and Mark Twain again. "
+            "Lewis & Clark cite Protocol 7, then Hero Host and protocol 7."
+        )
+        entities = linker.find(text)
+        assert set(entities) == {"Protocol_7", "Hero", "Hero_Host", "Mark_Twain", "Lewis_&_Clark"}
+        
+        linked, links = linker.link(text, entities)
+        # Existing links are skipped; whole-word first mentions get linked once
+        assert linked == (
+            "The [[Hero|hero]] hosts met [[Mark_Twain|Mark Twain]] and [[Mark_Twain|Mark Twain]] again. "
+            "[[Lewis_&_Clark|Lewis & Clark]] cite [[Protocol_7|Protocol 7]], "
+            "then [[Hero_Host|Hero Host]] and protocol 7."
+        )
+        assert [link.target for link in links] == [
+            "Hero", "Mark_Twain", "Lewis_&_Clark", "Protocol_7", "Hero_Host",
+        ]
+        assert linker.find("Nothing here", protocol_numbers=[3]) == ["Protocol_3"]
+    
     def test_obsidian_page_creation(self):
         page = ObsidianPage(
             filename="test.md",
@@ -160,6 +366,62 @@ class TestObsidianExport:
             count = vault.export()
             assert count == 1
             assert (Path(tmpdir) / "vault" / "index.md").exists()
+    
+    def test_obsidian_vault_incremental_export(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "vault"
+            (root / "notes.md").parent.mkdir(parents=True)
+            (root / "notes.md").write_text("untracked", encoding="utf-8")
+            vault = ObsidianVault(name="TestVault", root_path=root)
+            vault.add_page(ObsidianPage(filename="index.md", title="Index", content="# Index"))
+            vault.add_page(ObsidianPage(filename="A.md", title="A", content="# A"), folder="Entities")
+            assert vault.export() == 2
+            first = (root / "index.md").read_text(encoding="utf-8")
+            
+            # Unchanged pages are not rewritten and keep their created stamp
+            assert vault.export() == 0
+            vault.pages["index.md"].content = "# Index v2"
+            vault.remove_page("Entities/A.md")
+            assert vault.export() == 1
+            second = (root / "index.md").read_text(encoding="utf-8")
+            assert "# Index v2" in second
+            assert first.splitlines()[2] == second.splitlines()[2]  # created:
+            
+            # Orphaned pages go, files the vault never wrote stay
+            assert not (root / "Entities").exists()
+            assert (root / "notes.md").exists()
+            
+            # A page edited on disk is restored
+            (root / "index.md").write_text("edited", encoding="utf-8")
+            assert ObsidianVault("TestVault", root, dict(vault.pages)).export() == 1
+            assert (root / "index.md").read_text(encoding="utf-8") == second
+    
+    def test_obsidian_vault_backlinks(self):
+        from samuel_clemens.processing import create_entity_pages
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = ObsidianVault(name="TestVault", root_path=Path(tmpdir))
+            for number, links in ((1, ["Protocol_2", "Mark_Twain"]), (2, ["Mark_Twain"])):
+                vault.add_page(ObsidianPage(
+                    filename=f"Protocol_{number}.md",
+                    title=f"P{number}",
+                    content="...",
+                    outgoing_links=[WikiLink(target) for target in links],
+                ), folder="Protocols")
+            assert vault.get_backlinks("Mark_Twain") == ["Protocols/Protocol_1.md", "Protocols/Protocol_2.md"]
+            
+            # Replacing a page replaces its links
+            vault.add_page(ObsidianPage(filename="Protocol_2.md", title="P2", content="..."), folder="Protocols")
+            assert vault.get_backlinks("Mark_Twain") == ["Protocols/Protocol_1.md"]
+            
+            # Protocol_2 has a page of its own, so only Mark_Twain gets a stub
+            assert create_entity_pages(vault) == 1
+            assert "Entities/Mark_Twain.md" in vault.pages
+            with pytest.warns(DeprecationWarning):
+                assert create_entity_pages(vault, []) == 0  # Old (vault, documents) form
+            vault.export()
+            rendered = (Path(tmpdir) / "Protocols" / "Protocol_1.md").read_text(encoding="utf-8")
+            assert rendered.endswith("## Backlinks\n\n- [[Mark_Twain]]")
 
 
 class TestPDFExport:
@@ -178,6 +440,14 @@ class TestPDFExport:
         )
         assert config.title_size == 30
         assert config.include_toc is False
+    
+    def test_clean_text(self):
+        from samuel_clemens.processing.pdf_export import _clean_text
+        
+        assert _clean_text("plain ascii") == "plain ascii"
+        assert _clean_text("a & b <i>") == "a &amp; b &lt;i&gt;"
+        # Sequences go whole; a bare base character is left alone
+        assert _clean_text("⚠️ Note 🏗️ ⚠ — ✅ & “done”") == "[!] Note  ⚠ - [OK] &amp; \"done\""
 
 
 class TestDocumentParsing:
@@ -223,8 +493,700 @@ This is a test protocol.
             assert doc.protocol_id == "P99"
             assert len(doc.checkmarks) >= 2
             assert len(doc.footer_emojis) >= 1
+            assert doc.emergent_observation is not None
+            assert "test protocol" in doc.emergent_observation.content
+            assert doc.conclusion is not None
             
             Path(f.name).unlink()
+    
+    def test_protocol_field_projection(self):
+        content = """# PROTOCOL 7: PROJECTED
+**Status:** ✅ OPERATIONAL
+
+## 🎯 EMERGENT OBSERVATION
+
+See Protocol 3 and P4.
+
+- ✅ Done
+
+💎✨
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "PROTOCOL_7.md"
+            path.write_text(content)
+            
+            full = parse_protocol(path)
+            doc = parse_protocol(path, fields="index")
+            assert doc.protocol_id == "P7"
+            assert doc.status == full.status
+            assert doc.footer_emojis == full.footer_emojis
+            assert "sections" in doc.deferred_fields
+            
+            # Skipped fields are extracted on first access, then kept
+            assert doc.protocol_references == full.protocol_references
+            assert doc.emergent_observation.content == full.emergent_observation.content
+            assert "sections" not in doc.deferred_fields
+            assert doc.word_count == full.word_count
+            assert "word_count" not in doc.deferred_fields
+            
+            card = parse_protocol(path, fields=["checkmarks", "status"])
+            assert not full.deferred_fields
+            assert card.deferred_fields == {
+                "sections", "emergent_observation", "conclusion", "tables",
+                "quotes", "emojis", "word_count", "protocol_references",
+                "referenced_numbers", "minhash",
+            }
+            assert card.checkmarks == full.checkmarks
+            
+            with pytest.raises(ValueError):
+                parse_protocol(path, fields="everything")
+            with pytest.raises(ValueError):
+                parse_protocol(path, fields=["nonsense"])
+
+    def test_parse_folder_collects_errors(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.md").write_text("# A\n\nFirst ✅")
+            (Path(tmpdir) / "b.md").write_bytes(b"# B\n\xff\xfe broken")
+            (Path(tmpdir) / "c.md").write_text("# C\n\nThird")
+            
+            errors = []
+            docs = parse_folder(tmpdir, errors=errors)
+            assert [d.title for d in docs] == ["A", "C"]
+            assert len(errors) == 1
+            assert errors[0].filepath.name == "b.md"
+            assert errors[0].error_type == "UnicodeDecodeError"
+            
+            errors = []
+            docs = parse_folder(tmpdir, errors=errors, exclude=[Path(tmpdir) / "b.md"])
+            assert [d.title for d in docs] == ["A", "C"] and errors == []
+            
+            # Without an error list, failures are still reported
+            assert [d.title for d in parse_folder(tmpdir)] == ["A", "C"]
+            assert "Warning: Failed to parse" in capsys.readouterr().out
+    
+    def test_parse_folder_parallel_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(6):
+                (Path(tmpdir) / f"PROTOCOL_{i}.md").write_text(
+                    f"# PROTOCOL {i}: TEST\n\n## Section\n\nBody ✅ {i}"
+                )
+            
+            serial = parse_folder(tmpdir, as_protocols=True)
+            parallel = parse_folder(tmpdir, as_protocols=True, workers=2)
+            assert [d.filename for d in parallel] == [d.filename for d in serial]
+            assert [d.sections[0].subsections[0].content for d in parallel] == [
+                d.sections[0].subsections[0].content for d in serial
+            ]
+            
+            streamed = iter_parse_folder(tmpdir, workers=2)
+            assert next(streamed).filename == "PROTOCOL_0.md"
+    
+    def test_protocol_scan_by_prefix(self):
+        from samuel_clemens.processing import iter_protocol_files
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "nested").mkdir()
+            (folder / "PROTOCOL_2.md").write_text("# PROTOCOL 2: TWO")
+            (folder / "NSPFRP_1.md").write_text("# PROTOCOL 1: ONE")
+            (folder / "P_notes.txt").write_text("not markdown")
+            (folder / "README.md").write_text("# Readme")
+            (folder / "nested" / "NSP_3.md").write_text("# PROTOCOL 3: THREE")
+            
+            names = [p.name for p in iter_protocol_files(folder)]
+            assert names == ["NSPFRP_1.md", "PROTOCOL_2.md"]
+            
+            recursive = [p.name for p in iter_protocol_files(folder, recursive=True)]
+            assert recursive == ["NSPFRP_1.md", "PROTOCOL_2.md", "NSP_3.md"]
+            
+            docs = parse_protocols_by_prefix(folder, recursive=True)
+            assert [d.protocol_number for d in docs] == [1, 2, 3]
+            
+            only = parse_protocols_by_prefix(folder, prefixes=["PROTOCOL_"])
+            assert [d.filename for d in only] == ["PROTOCOL_2.md"]
+
+
+
+class TestParseCache:
+    """Test the persistent parse cache."""
+    
+    def test_warm_run_reuses_documents(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text("# PROTOCOL 1: ONE\n\nBody ✅")
+            (folder / "PROTOCOL_2.md").write_text("# PROTOCOL 2: TWO\n\nBody")
+            cache_path = folder / "cache" / "parse_cache.bin"
+            
+            cold = ParseCache(cache_path)
+            first = parse_protocols_by_prefix(folder, cache=cold)
+            assert cold.misses == 2
+            assert cache_path.exists()
+            
+            warm = ParseCache(cache_path)
+            second = parse_protocols_by_prefix(folder, cache=warm)
+            assert warm.hits == 2 and warm.misses == 0
+            assert [d.title for d in second] == [d.title for d in first]
+            assert second[0].checkmarks == first[0].checkmarks
+    
+    def test_changed_file_is_reparsed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            source = folder / "PROTOCOL_1.md"
+            source.write_text("# PROTOCOL 1: ONE")
+            cache_path = folder / "parse_cache.bin"
+            parse_protocols_by_prefix(folder, cache=ParseCache(cache_path))
+            
+            source.write_text("# PROTOCOL 1: RENAMED PROTOCOL")
+            cache = ParseCache(cache_path)
+            docs = parse_protocols_by_prefix(folder, cache=cache)
+            assert cache.misses == 1
+            assert docs[0].title == "PROTOCOL 1: RENAMED PROTOCOL"
+    
+    def test_narrow_parse_is_not_served_to_full_requests(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text("# PROTOCOL 1: ONE\n\n## Part\n\nBody ✅")
+            cache_path = folder / "parse_cache.bin"
+            parse_protocols_by_prefix(folder, cache=ParseCache(cache_path), fields="index")
+            
+            cache = ParseCache(cache_path)
+            docs = parse_protocols_by_prefix(folder, cache=cache)
+            assert cache.misses == 1
+            assert docs[0].deferred_fields == set()
+            
+            # The full entry now serves any profile
+            cache = ParseCache(cache_path)
+            parse_protocols_by_prefix(folder, cache=cache, fields="index")
+            assert cache.hits == 1 and cache.misses == 0
+    
+    def test_parser_version_invalidates(self, monkeypatch):
+        from samuel_clemens.processing import cache as cache_module
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text("# PROTOCOL 1: ONE")
+            cache_path = folder / "parse_cache.bin"
+            parse_protocols_by_prefix(folder, cache=ParseCache(cache_path))
+            
+            monkeypatch.setattr(cache_module, "PARSER_VERSION", -1)
+            assert len(ParseCache(cache_path)) == 0
+    
+    def test_versioned_store(self):
+        from samuel_clemens.utils.io import load_versioned, save_versioned, store_path
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            path = store_path(folder, "store.bin")
+            assert path == folder / "store.bin"
+            assert load_versioned(path, 1) is None
+            
+            save_versioned(path, 1, {"entries": [1, 2]}, level=1)
+            assert load_versioned(path, 1)["entries"] == [1, 2]
+            assert load_versioned(path, 2) is None
+            assert [p.name for p in folder.iterdir()] == ["store.bin"]
+            
+            path.write_bytes(b"not a store")
+            assert load_versioned(path, 1) is None
+
+
+class TestSearchIndex:
+    """Test the inverted full-text index."""
+    
+    def test_ranking_and_phrases(self):
+        from samuel_clemens.processing import build_search_index
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            _write_protocols(folder, {
+                1: "## Body\n\nHero Host meets Goldilocks. Hero Host again, hero host.",
+                2: "## Body\n\nThe host was a hero. Goldilocks zone.",
+                3: "## Body\n\nNothing relevant here.",
+            })
+            index = build_search_index(folder, folder / "index.bin")
+            
+            hits = index.search("hero host")
+            assert [h.protocol_id for h in hits] == ["P1", "P2"]
+            assert hits[0].score > hits[1].score
+            assert hits[0].sections == ["Body"]
+            
+            assert [h.protocol_id for h in index.search('"hero host" goldilocks')] == ["P1"]
+            assert index.search('"host hero"') == []
+            assert index.search("missing") == []
+    
+    def test_incremental_update_and_persistence(self):
+        from samuel_clemens.processing import SearchIndex, build_search_index
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            _write_protocols(folder, {1: "alpha beta", 2: "beta gamma"})
+            build_search_index(folder, folder / "index.bin")
+            
+            loaded = SearchIndex(folder / "index.bin")
+            assert len(loaded) == 2
+            assert [h.protocol_id for h in loaded.search("beta")] == ["P1", "P2"]
+            
+            # Unchanged documents are skipped; changed and deleted ones are applied
+            _write_protocols(folder, {1: "delta only"})
+            (folder / "PROTOCOL_2.md").unlink()
+            index = build_search_index(folder, folder / "index.bin")
+            assert len(index) == 1
+            assert index.search("beta") == []
+            assert "gamma" not in index.postings and "alpha" not in index.postings
+            assert [h.protocol_id for h in index.search("delta")] == ["P1"]
+            assert index.update(parse_protocols_by_prefix(folder)) == 0
+            
+            # Clearing alone is a change worth saving
+            index.clear()
+            assert index.save()
+            assert len(SearchIndex(folder / "index.bin")) == 0
+
+
+class TestReferenceGraph:
+    """Test the protocol reference graph."""
+    
+    # 1 -> 2 -> 3 -> 1 is a cycle; 4 -> 1 and 4 -> 9 (no document)
+    bodies = {
+        1: "Builds on Protocol 2.",
+        2: "Extends P3.",
+        3: "Closes the loop with Protocol 1.",
+        4: "Uses Protocol 1 and P9.",
+    }
+    
+    def test_graph_queries(self):
+        from samuel_clemens.processing import ReferenceGraph
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph = ReferenceGraph.from_documents(_write_protocols(Path(tmpdir), self.bodies))
+            assert list(graph.nodes) == [1, 2, 3, 4, 9]
+            assert graph.edge_count == 5
+            assert graph.references(4) == [1, 9]
+            assert graph.referenced_by(1) == [3, 4]
+            assert graph.in_degree()[1] == 2
+            
+            ranks = graph.pagerank()
+            assert abs(sum(ranks.values()) - 1.0) < 1e-9
+            assert ranks[1] > ranks[4]
+            
+            assert graph.strongly_connected_components()[0] == [1, 2, 3]
+            assert graph.upstream(4) == [1, 2, 3, 9]
+            assert graph.downstream(3) == [1, 2, 4]
+            assert graph.shortest_path(4, 3) == [4, 1, 2, 3]
+            assert graph.shortest_path(9, 1) is None
+    
+    def test_graph_rebuilt_only_on_change(self):
+        from samuel_clemens.processing import load_reference_graph
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            docs = _write_protocols(folder, self.bodies)
+            first = load_reference_graph(docs, folder / "graph.bin")
+            
+            again = load_reference_graph(docs, folder / "graph.bin")
+            assert again is not first
+            assert again.signature == first.signature
+            assert again._computed  # Centrality came from disk
+            
+            (folder / "PROTOCOL_4.md").write_text("# PROTOCOL 4: DOC\n\nNow cites Protocol 3.")
+            changed = load_reference_graph(parse_protocols_by_prefix(folder), folder / "graph.bin")
+            assert changed.signature != first.signature
+            assert changed.references(4) == [3]
+
+
+class TestRelatedIndex:
+    """Test the TF-IDF related-protocols recommender."""
+    
+    bodies = {
+        1: "Steamboat pilots read the river channel at night.",
+        2: "The river pilot watched the channel and the steamboat wheel.",
+        3: "Telegraph operators tapped messages across the prairie wires.",
+    }
+    
+    def test_related_ranking(self):
+        from samuel_clemens.processing import RelatedIndex
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs = _write_protocols(Path(tmpdir), self.bodies)
+            related = RelatedIndex()
+            related.update(docs)
+            
+            similar = related.related("P1", k=2)
+            assert [item.key for item in similar][0] == "P2"
+            assert similar[0].score > 0
+            assert all(item.key != "P1" for item in similar)
+            assert set(related.related_all(k=1)) == {str(p.filepath) for p in docs}
+            batched = related.related_all(k=2)
+            assert all(batched[str(p.filepath)] == related.related_for(p, 2) for p in docs)
+            
+            exact = RelatedIndex(exact=True)
+            exact.update(docs)
+            # Small documents in a small corpus: nothing is pruned either way
+            assert exact.related("P1", k=2) == related.related("P1", k=2)
+            
+            with pytest.raises(KeyError):
+                related.related("P99")
+    
+    def test_related_incremental(self):
+        from samuel_clemens.processing import RelatedIndex
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            related = RelatedIndex(folder / "related.bin")
+            assert related.update(_write_protocols(folder, self.bodies)) == 3
+            assert related.save()
+            
+            reloaded = RelatedIndex(folder / "related.bin")
+            assert reloaded.update(parse_protocols_by_prefix(folder)) == 0
+            assert not reloaded.save()
+            
+            (folder / "PROTOCOL_3.md").write_text("# PROTOCOL 3: DOC\n\nA steamboat river channel pilot.")
+            (folder / "PROTOCOL_2.md").unlink()
+            assert reloaded.update(parse_protocols_by_prefix(folder)) == 2
+            assert reloaded.related("P1", k=1)[0].key == "P3"
+            
+            page = protocol_to_obsidian_page(
+                parse_protocol(folder / "PROTOCOL_1.md"), related=reloaded.related("P1")
+            )
+            assert "[[Protocol_3|PROTOCOL 3: DOC]]" in page.content
+            assert any(link.target == "Protocol_3" for link in page.outgoing_links)
+
+
+class TestCorpusStats:
+    """Test the one-pass corpus aggregator."""
+    
+    bodies = {
+        1: "## 🎯 EMERGENT OBSERVATION\n\nSteamboats 🚂 and rivers 🌊.",
+        2: "## 🎯 EMERGENT OBSERVATION\n\nMore rivers 🌊🌊, per Protocol 1.",
+        3: "## ✅ STATUS\n\nTelegraph wires ⚡.",
+    }
+    
+    def test_merged_chunks_match_one_pass(self):
+        from samuel_clemens.processing import CorpusStats
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs = _write_protocols(Path(tmpdir), self.bodies)
+            whole = CorpusStats.from_documents(docs)
+            merged = CorpusStats.combine(
+                CorpusStats.from_documents(chunk) for chunk in (docs[:1], docs[1:])
+            )
+            assert merged == whole
+            assert len(whole) == 3
+            assert whole.total_words == sum(d.word_count for d in docs)
+            
+            waves = whole.emojis["🌊"]
+            assert waves.count == 3
+            assert waves.documents == {"PROTOCOL_1.md", "PROTOCOL_2.md"}
+            assert whole.top_emojis(1)[0].char == "🌊"
+            assert whole.common_sections(1) == [("PROTOCOL 1: DOC", 1)]
+    
+    def test_reports_from_shared_stats(self):
+        from samuel_clemens.processing import (
+            CorpusStats,
+            export_emoji_report,
+            export_protocol_index,
+            export_structure_analysis,
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            docs = _write_protocols(folder, self.bodies)
+            stats = CorpusStats.from_documents(docs)
+            
+            for export in (export_emoji_report, export_structure_analysis, export_protocol_index):
+                direct = export(docs, folder / "direct.md").read_text()
+                shared = export(docs, folder / "shared.md", stats=stats).read_text()
+                # Only the timestamp line may differ
+                strip = lambda text: [l for l in text.splitlines() if not l.startswith("**Generated")]
+                assert strip(direct) == strip(shared)
+
+
+class TestCorpusNdjson:
+    """Test the compiled encoders and NDJSON corpus export."""
+    
+    def test_compiled_encoder(self):
+        import json
+        from samuel_clemens.processing import encode_document
+        
+        content = """# PROTOCOL 7: CODEC
+## 🎯 EMERGENT OBSERVATION
+
+See Protocol 3 and P5. 🚀
+
+| A | B |
+|---|---|
+| 1 | 2 |
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "PROTOCOL_7.md"
+            path.write_text(content, encoding="utf-8")
+            doc = parse_protocol(path, fields="index")
+            record = encode_document(doc)
+        
+        assert record["kind"] == "protocol"
+        assert record["filepath"] == str(path)
+        assert record["protocol_number"] == doc.protocol_number
+        assert record["referenced_numbers"] == list(doc.referenced_numbers)
+        assert record["parsed_at"] == doc.parsed_at.isoformat()
+        # Deferred fields are loaded; sections do not repeat the document text
+        assert len(record["sections"]) == len(doc.sections) > 0
+        assert "source" not in record["sections"][0]
+        assert record["sections"][0]["title"] == doc.sections[0].title
+        json.dumps(record)
+    
+    def test_serialize_container_fields(self):
+        from dataclasses import dataclass
+        from samuel_clemens.processing.export import _serialize_for_json
+        
+        @dataclass
+        class Typed:
+            paths: dict[str, Path]
+            tags: set[str]
+        
+        @dataclass
+        class Untyped:
+            raw: dict
+        
+        typed = _serialize_for_json(Typed({"a": Path("/x")}, {"t"}))
+        assert typed == {"paths": {"a": "/x"}, "tags": ["t"]}
+        # No encoder compiles for a bare dict of Paths: the field walk handles it
+        assert _serialize_for_json(Untyped({"p": Path("/y")})) == {"raw": {"p": "/y"}}
+    
+    def test_export_streams_gzip(self):
+        import gzip
+        import json
+        from samuel_clemens.processing import export_corpus_ndjson
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            for number in (1, 2, 3):
+                (folder / f"PROTOCOL_{number}.md").write_text(f"# PROTOCOL {number}: DOC\n\nBody 🌊.")
+            
+            docs = (parse_protocol(p) for p in sorted(folder.glob("*.md")))
+            output = export_corpus_ndjson(docs, folder / "corpus.ndjson.gz")
+            
+            with gzip.open(output, "rt", encoding="utf-8") as handle:
+                records = [json.loads(line) for line in handle]
+            assert [r["protocol_id"] for r in records] == ["P1", "P2", "P3"]
+            assert records[0]["emojis"][0]["char"] == "🌊"
+    
+    def test_load_round_trip(self):
+        from samuel_clemens.processing import (
+            encode_document,
+            export_corpus_ndjson,
+            iter_corpus_ndjson,
+            load_corpus_ndjson,
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text("# PROTOCOL 1: DOC\n\n## 🎯 EMERGENT OBSERVATION\n\nSee P2.")
+            (folder / "notes.md").write_text("# Notes\n\n## Part\n\nText.")
+            docs = [parse_protocol(folder / "PROTOCOL_1.md"), parse_file(folder / "notes.md")]
+            
+            path = export_corpus_ndjson(docs, folder / "corpus.ndjson")
+            loaded = load_corpus_ndjson(path)
+            assert [type(d) for d in loaded] == [type(d) for d in docs]
+            assert [encode_document(d) for d in loaded] == [encode_document(d) for d in docs]
+            assert loaded[0].emergent_observation.content == docs[0].emergent_observation.content
+            assert list(loaded[0].referenced_numbers) == [1, 2]
+            
+            with open(path, "a", encoding="utf-8") as handle:
+                handle.write('{"kind": "protocol"}\n')
+            lazy = iter_corpus_ndjson(path)
+            assert next(lazy).protocol_id == "P1"
+            next(lazy)
+            with pytest.raises(ValueError, match=":3:"):
+                next(lazy)
+
+
+class TestCorpusSnapshot:
+    """Test the columnar, memory-mapped corpus snapshot."""
+    
+    def test_snapshot_round_trip(self):
+        from samuel_clemens.processing import CorpusSnapshot, write_corpus_snapshot
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_3.md").write_text(
+                "# PROTOCOL 3: SNAP\n\n**Status:** ✅ OPERATIONAL\n\n"
+                "## Part 🌊\n\n### Detail\n\nSee P7.\n\n| A | B |\n|---|---|\n| 1 | 2 |\n"
+            )
+            (folder / "notes.md").write_text("# Notes\n\nPlain text.")
+            docs = [parse_protocol(folder / "PROTOCOL_3.md"), parse_file(folder / "notes.md")]
+            
+            path = write_corpus_snapshot(docs, folder)
+            with CorpusSnapshot(path) as snapshot:
+                assert len(snapshot) == 2
+                assert list(snapshot.word_count) == [d.word_count for d in docs]
+                assert snapshot.find(3) == 0
+                assert snapshot.find(99) is None
+                
+                record = snapshot.record(0)
+                assert record.protocol_id == "P3"
+                assert record.title == "PROTOCOL 3: SNAP"
+                assert record.is_operational
+                assert record.emoji_count == docs[0].emoji_count
+                assert ("Detail", 3) in record.sections
+                assert record.tables == [(1, 2)]
+                assert record.references == [3, 7]
+                
+                notes = snapshot.record(1)
+                assert not notes.is_protocol
+                assert notes.protocol_number is None
+                assert notes.references == []
+                
+                # A slice held past close keeps the file mapped instead of raising
+                counts = snapshot.word_count[0:2]
+            assert list(counts) == [d.word_count for d in docs]
+            counts.release()
+    
+    def test_snapshot_rewritten_only_when_stale(self):
+        from samuel_clemens.processing import load_corpus_snapshot
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text("# PROTOCOL 1: DOC\n\nOne two.")
+            
+            with load_corpus_snapshot(folder, folder) as snapshot:
+                assert len(snapshot) == 1
+            written = (folder / "corpus_snapshot.bin").stat().st_mtime_ns
+            
+            with load_corpus_snapshot(folder, folder) as snapshot:
+                assert snapshot.record(0).word_count == 5
+            assert (folder / "corpus_snapshot.bin").stat().st_mtime_ns == written
+            
+            (folder / "PROTOCOL_2.md").write_text("# PROTOCOL 2: DOC\n\nThree.")
+            with load_corpus_snapshot(folder, folder) as snapshot:
+                assert len(snapshot) == 2
+                assert snapshot.find(2) == 1
+
+
+class TestProtocolCatalog:
+    """Test the SQLite protocol catalog."""
+    
+    def _body(self, status, date, text):
+        return (
+            f"**Category:** Hosts\n**Status:** {status}\n"
+            f"**Discovery Date:** {date}\n\n## Body\n\n{text}\n\n### Detail\n\nNested words.\n"
+        )
+    
+    def test_faceted_query(self):
+        from samuel_clemens.processing import ProtocolCatalog
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            docs = _write_protocols(folder, {
+                1: self._body("✅ OPERATIONAL", "January 2026", "See P3."),
+                2: self._body("✅ OPERATIONAL", "March 5, 2026", "See P1 and P3."),
+                3: self._body("🚨 EMERGENT", "February 2026", "Hero host rides."),
+            })
+            
+            with ProtocolCatalog(folder) as catalog:
+                assert catalog.update(docs, batch_size=2) == 3
+                assert catalog.update(docs) == 0
+                assert len(catalog) == 3
+                
+                entries = catalog.query(
+                    category="hosts", operational=True,
+                    discovered_after="2026-01-15", order_by="cited_by",
+                )
+                assert [e.protocol_id for e in entries] == ["P2"]
+                
+                ranked = catalog.query(order_by="cited_by", descending=True)
+                assert [(e.protocol_id, e.cited_by) for e in ranked][0] == ("P3", 2)
+                assert ranked[0].reference_count == 0
+                
+                assert catalog.facets("status") == {"✅ OPERATIONAL": 2, "🚨 EMERGENT": 1}
+                assert catalog.query(text='"hero host"')[0].protocol_id == "P3"
+                
+                with pytest.raises(ValueError):
+                    catalog.query(order_by="path; DROP TABLE documents")
+    
+    def test_sections_and_pruning(self):
+        from samuel_clemens.processing import ProtocolCatalog
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            docs = _write_protocols(folder, {
+                1: self._body("✅ OPERATIONAL", "January 2026", "Goldilocks zone."),
+                2: self._body("✅ OPERATIONAL", "January 2026", "Plain."),
+            })
+            
+            with ProtocolCatalog(folder) as catalog:
+                catalog.update(docs)
+                hits = catalog.search_sections("goldilocks")
+                assert [(h.protocol_id, h.title) for h in hits] == [("P1", "Body")]
+                # A parent's text stops where its subsection starts
+                assert catalog.search_sections("nested")[0].title == "Detail"
+                assert len(catalog.search_sections("nested")) == 2
+                
+                # An empty subsection still ends its parent's text
+                (folder / "PROTOCOL_3.md").write_text(
+                    "# PROTOCOL 3: DOC\n## Intro\nalpha\n### Empty\n## Later\nomega\nmore\nlast line"
+                )
+                catalog.upsert([parse_protocol(folder / "PROTOCOL_3.md")])
+                assert [h.title for h in catalog.search_sections("omega")] == ["Later"]
+                catalog.remove(folder / "PROTOCOL_3.md")
+                
+                assert catalog.update(docs[1:]) == 1
+                assert catalog.search_sections("goldilocks") == []
+                assert [e.protocol_id for e in catalog.query()] == ["P2"]
+
+
+class TestDuplicateIndex:
+    """Test MinHash/LSH near-duplicate detection."""
+    
+    BODY = " ".join(f"word{i} river steamboat pilot" for i in range(60))
+    
+    def test_signatures_and_pairs(self):
+        from samuel_clemens.processing import LSHIndex, minhash_signature
+        
+        original = minhash_signature(self.BODY)
+        edited = minhash_signature(self.BODY.replace("word59", "changed"))
+        other = minhash_signature(" ".join(f"term{i} desert mining camp" for i in range(60)))
+        assert len(original) == 64
+        assert minhash_signature("") == minhash_signature("!!!")
+        
+        index = LSHIndex()
+        index.add("original", original)
+        index.add("edited", edited)
+        index.add("other", other)
+        assert not index.add("empty", minhash_signature(""))
+        pairs = index.pairs(0.8)
+        assert [(a, b) for a, b, _ in pairs] == [("original", "edited")]
+        assert pairs[0][2] >= 0.8
+        assert [key for key, _ in index.query(edited, 0.8)] == ["edited", "original"]
+    
+    def test_redundant_documents_are_skipped(self):
+        from samuel_clemens.processing import DuplicateIndex, export_structure_analysis
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            (folder / "PROTOCOL_1.md").write_text(f"# PROTOCOL 1: RIVER\n\n## Body\n\n{self.BODY}\n")
+            (folder / "PROTOCOL_2.md").write_text(f"# PROTOCOL 2: OTHER\n\n## Body\n\nUnrelated.\n")
+            (folder / "SNAPSHOT_PROTOCOL_1.md").write_text(f"# SNAPSHOT: RIVER\n\n## Copy\n\n{self.BODY}\n")
+            docs = [
+                parse_protocol(folder / "PROTOCOL_1.md"),
+                parse_protocol(folder / "PROTOCOL_2.md"),
+                parse_file(folder / "SNAPSHOT_PROTOCOL_1.md"),
+            ]
+            
+            duplicates = DuplicateIndex.from_documents(docs)
+            assert [(d.first, d.second) for d in duplicates.documents] == [
+                ("PROTOCOL_1.md", "SNAPSHOT_PROTOCOL_1.md")
+            ]
+            assert (duplicates.sections[0].first_section, duplicates.sections[0].second_section) == ("Body", "Copy")
+            assert duplicates.is_redundant(docs[2])
+            assert duplicates.unique(docs) == docs[:2]
+            
+            vault = export_obsidian_vault(docs, folder / "vault", duplicates=duplicates)
+            assert not any("SNAPSHOT" in name for name in vault.pages)
+            
+            report = export_structure_analysis(docs[:2], folder / "structure.md", duplicates=duplicates)
+            text = report.read_text()
+            assert "**PROTOCOL_1.md** ≈ **SNAPSHOT_PROTOCOL_1.md**" in text
+            assert "No near-duplicate documents." in export_structure_analysis(
+                docs[:2], folder / "alone.md"
+            ).read_text()
 
 
 class TestIntegration: